@@ -1,3 +1,4 @@
+from .base_client import BaseAIClient
 from .groq_api import GroqClient
 from .gitlab_api import Gitlab_api
 from .github_api import Github_api
@@ -5,6 +6,16 @@ from .hugging_client import HuggingClient
 from .ollama_client import OllamaClient
 from .token_counter_lite import TokenCounterLite
 from .gemini_client import GeminiClient
+from .hedged_client import HedgedClient
+from .latency_tracker import LatencyTracker
+from .circuit_breaker import CircuitBreaker
+from .fallback_client import FallbackClient
+from .provider_router import ProviderRouter, RouteCandidate
+from .model_cascade import ModelCascade
+from .context_window import ContextWindowExceeded
+from .platform_http import PlatformSession
 
-__all__ = ["Github_api", "Gitlab_api", "GroqClient", "HuggingClient",
-           "OllamaClient", "TokenCounterLite", "GeminiClient"]
+__all__ = ["BaseAIClient", "Github_api", "Gitlab_api", "GroqClient", "HuggingClient",
+           "OllamaClient", "TokenCounterLite", "GeminiClient", "HedgedClient", "LatencyTracker",
+           "CircuitBreaker", "FallbackClient", "ProviderRouter", "RouteCandidate",
+           "ModelCascade", "ContextWindowExceeded", "PlatformSession"]
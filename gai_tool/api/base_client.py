@@ -0,0 +1,141 @@
+"""
+Common interface shared by every AI client.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from gai_tool.api.context_window import fit_to_context_window, prompt_budget
+from gai_tool.api.token_estimator import estimate_tokens
+from gai_tool.src.utils import validate_messages
+
+# Upper bound (in seconds) for a single completion, including streamed ones.
+DEFAULT_TIMEOUT = 120.0
+# Chat formatting overhead per message (role and separators)
+TOKENS_PER_MESSAGE = 3
+
+
+def approximate_prompt_tokens(messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
+    """
+    Estimated token count of the messages for ``model``, without loading a tokenizer.
+    Good enough for budget and routing decisions.
+    """
+    return sum(estimate_tokens(str(message.get("content", "")), model) + TOKENS_PER_MESSAGE
+               for message in messages)
+
+
+class BaseAIClient(ABC):
+    """
+    Base class for the AI clients.
+
+    Subclasses provide a blocking ``get_chat_completion`` plus native async and
+    streaming primitives. The public async/streaming entry points defined here
+    validate the messages once and apply the same timeout and cancellation
+    semantics for every provider:
+
+    - ``aget_chat_completion``, ``astream_chat_completion`` and
+      ``stream_chat_completion`` raise ``TimeoutError`` when the provider does
+      not finish within ``timeout``. The blocking stream checks it as each
+      chunk arrives, the wait for a single chunk is bounded by the provider's
+      own request timeout.
+    - Cancelling the awaiting task (``asyncio.CancelledError``) propagates to
+      the underlying HTTP request, which is closed instead of left running.
+
+    Clients knowing their ``context_window`` check the prompt against it before
+    sending it, truncating the longest message or failing fast when it does not fit.
+    """
+
+    timeout: Optional[float] = DEFAULT_TIMEOUT
+    context_window: Optional[int] = None
+    max_tokens: Optional[int] = None
+
+    @abstractmethod
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        """Blocking chat completion."""
+
+    @abstractmethod
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        """Provider specific async completion, messages are already validated."""
+
+    @abstractmethod
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        """Provider specific streaming completion yielding text chunks."""
+
+    @abstractmethod
+    def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Provider specific async streaming completion yielding text chunks."""
+
+    def count_prompt_tokens(self, user_message: List[Dict[str, str]]) -> int:
+        """Number of prompt tokens of the messages for this client's model."""
+        return approximate_prompt_tokens(user_message, getattr(self, "model", None))
+
+    def fit_context_window(self, user_message: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """The messages, truncated if needed to leave room for the answer in the context window."""
+        budget = prompt_budget(self.context_window, self.max_tokens)
+        if budget is None:
+            return user_message
+        return fit_to_context_window(user_message, self.model, budget, self.count_prompt_tokens)
+
+    def get_valid_chat_completion(self,
+                                  user_message: List[Dict[str, str]],
+                                  validator: Callable[[str], object]) -> str:
+        """
+        Chat completion whose response must be accepted by ``validator``, which
+        raises on invalid responses. Clients that can pick between several
+        responses (e.g. hedging) use it to discard the ones that do not parse.
+        """
+        response = self.get_chat_completion(user_message=user_message)
+        validator(response)
+        return response
+
+    async def aget_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        """
+        Async chat completion.
+
+        Args:
+            user_message: The messages to send to the model
+
+        Returns:
+            The content of the model's response
+        """
+        validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
+
+        async with asyncio.timeout(self.timeout):
+            return await self._aget_completion(user_message)
+
+    def stream_chat_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        """
+        Blocking streaming chat completion, yields the response as it is generated.
+        The timeout applies to the whole stream, not to each chunk.
+        """
+        validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        stream = self._stream_completion(user_message)
+        try:
+            for chunk in stream:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Stream did not finish within {self.timeout} seconds")
+                yield chunk
+        finally:
+            stream.close()
+
+    async def astream_chat_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Async streaming chat completion, yields the response as it is generated.
+        The timeout applies to the whole stream, not to each chunk.
+        """
+        validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
+
+        stream = self._astream_completion(user_message)
+        try:
+            async with asyncio.timeout(self.timeout):
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            await stream.aclose()
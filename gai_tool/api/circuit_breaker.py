@@ -0,0 +1,80 @@
+"""
+Circuit breaker for the AI providers, persisted between invocations.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from gai_tool.src.utils import get_cache_dir
+
+CIRCUIT_BREAKER_FILE = "circuit_breaker.json"
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 120.0
+
+
+class CircuitBreaker:
+    """
+    Track consecutive failures per provider. Once a provider reaches
+    ``failure_threshold`` failures its circuit opens and it is skipped until the
+    cool-down expires. The next request after that is a trial: a success closes
+    the circuit again, a failure re-opens it.
+    """
+
+    def __init__(self,
+                 path: Optional[Path] = None,
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 cooldown: float = COOLDOWN_SECONDS):
+
+        self.path = path or get_cache_dir() / CIRCUIT_BREAKER_FILE
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state: Dict[str, Dict[str, float]] = self._load()
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with self.path.open("r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with self._lock, tmp_path.open("w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def open_until(self, name: str) -> float:
+        return self.state.get(name, {}).get("open_until", 0.0)
+
+    def is_open(self, name: str) -> bool:
+        return self.open_until(name) > time.time()
+
+    def record_success(self, name: str) -> None:
+        with self._lock:
+            if self.state.pop(name, None) is None:
+                return
+        self.save()
+
+    def record_failure(self, name: str, retry_after: Optional[float] = None) -> None:
+        """
+        Record a failed request. A ``retry_after`` hint from the provider opens
+        the circuit right away for at least that long.
+        """
+        with self._lock:
+            entry = self.state.setdefault(name, {"failures": 0, "open_until": 0.0})
+            entry["failures"] += 1
+
+            if retry_after is not None:
+                entry["open_until"] = time.time() + retry_after
+            elif entry["failures"] >= self.failure_threshold:
+                entry["open_until"] = time.time() + self.cooldown
+        self.save()
@@ -0,0 +1,68 @@
+"""
+Context-window preflight, run before any request leaves the machine.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from colorama import Fore, Style
+
+TRUNCATION_MARKER = "\n[... truncated to fit the model context window ...]"
+# Never let the reserved answer take more than this share of the context window
+MAX_OUTPUT_SHARE = 4
+# Give up shrinking the prompt after this many attempts
+MAX_TRUNCATION_ROUNDS = 5
+# Aim slightly below the budget, token counts do not scale exactly with characters
+TRUNCATION_MARGIN = 0.95
+
+
+class ContextWindowExceeded(ValueError):
+    """The prompt cannot be made to fit the model context window."""
+
+
+def reserved_output_tokens(context_window: int, max_output_tokens: Optional[int]) -> int:
+    """Tokens kept free in the context window for the answer."""
+    return min(max_output_tokens or 0, context_window // MAX_OUTPUT_SHARE)
+
+
+def prompt_budget(context_window: Optional[int], max_output_tokens: Optional[int]) -> Optional[int]:
+    """Largest prompt (in tokens) the model accepts, None when the window is unknown."""
+    if context_window is None:
+        return None
+    return context_window - reserved_output_tokens(context_window, max_output_tokens)
+
+
+def fit_to_context_window(messages: List[Dict[str, str]],
+                          model: str,
+                          budget: int,
+                          count_tokens: Callable[[List[Dict[str, str]]], int]) -> List[Dict[str, str]]:
+    """
+    Return ``messages`` unchanged when they fit in ``budget`` tokens, otherwise
+    a copy whose longest message (usually the diff) is truncated to fit.
+
+    Raises ContextWindowExceeded when the other messages alone do not fit.
+    """
+    tokens = count_tokens(messages)
+    if tokens <= budget:
+        return messages
+
+    print(f"{Fore.YELLOW}Prompt of {tokens} tokens exceeds the {budget} tokens available for {model}, "
+          f"truncating it...{Style.RESET_ALL}")
+
+    longest = max(range(len(messages)), key=lambda index: len(str(messages[index].get("content", ""))))
+    content = str(messages[longest].get("content", ""))
+
+    fitted = list(messages)
+    for _ in range(MAX_TRUNCATION_ROUNDS):
+        # Shrink the longest message by the share of tokens that are over budget
+        keep = int(len(content) * max(0.0, 1 - (tokens - budget) / max(tokens, 1)) * TRUNCATION_MARGIN)
+        content = content[:keep]
+        fitted[longest] = {**messages[longest], "content": content + TRUNCATION_MARKER}
+
+        tokens = count_tokens(fitted)
+        if tokens <= budget:
+            return fitted
+        if not content:
+            break
+
+    raise ContextWindowExceeded(
+        f"Prompt of {tokens} tokens does not fit the {budget} tokens available for {model}, even truncated")
@@ -0,0 +1,143 @@
+"""
+Provider fallback chain with retries and a circuit breaker.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from colorama import Fore, Style
+
+from gai_tool.api.base_client import BaseAIClient
+from gai_tool.api.circuit_breaker import CircuitBreaker
+from gai_tool.api.retry import RetryPolicy, get_retry_after, is_retryable
+
+T = TypeVar("T")
+
+
+class FallbackClient(BaseAIClient):
+    """
+    Try each provider of the chain in order, e.g. ``groq -> google -> ollama``.
+
+    Retryable errors are retried with exponential backoff and jitter, honoring
+    the ``Retry-After`` of rate limited (429) responses. A provider asking to
+    wait longer than the retry policy allows is given up on straight away.
+    Providers whose circuit is open are skipped until their cool-down expires.
+    Clients are only built when first needed, so a missing API key for a
+    provider later in the chain does not matter until it is actually used.
+    """
+
+    def __init__(self,
+                 providers: List[Tuple[str, Callable[[], BaseAIClient]]],
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+
+        self.providers = providers
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.sleep = sleep
+        self.async_sleep = async_sleep
+        self.clients: Dict[str, BaseAIClient] = {}
+        self.model = " -> ".join(name for name, _ in providers)
+        self.timeout = None
+
+    def get_client(self, name: str) -> BaseAIClient:
+        if name not in self.clients:
+            factory = dict(self.providers)[name]
+            self.clients[name] = factory()
+        return self.clients[name]
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self._complete(lambda client: client.get_chat_completion(user_message=user_message))
+
+    def get_valid_chat_completion(self,
+                                  user_message: List[Dict[str, str]],
+                                  validator: Callable[[str], object]) -> str:
+        return self._complete(lambda client: client.get_valid_chat_completion(user_message, validator))
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        # Native, so that a hedged race can cancel it while a provider is still answering
+        return await self._acomplete(lambda client: client.aget_chat_completion(user_message))
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        yield from self.get_client(self._available_providers()[0]).stream_chat_completion(user_message)
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        client = self.get_client(self._available_providers()[0])
+        async for chunk in client.astream_chat_completion(user_message):
+            yield chunk
+
+    def _available_providers(self) -> List[str]:
+        available = [name for name, _ in self.providers
+                     if self.circuit_breaker is None or not self.circuit_breaker.is_open(name)]
+        if not available:
+            raise Exception(f"All providers are cooling down after repeated failures: {self.model}")
+        return available
+
+    def _complete(self, call: Callable[[BaseAIClient], T]) -> T:
+        errors: List[str] = []
+
+        for name in self._available_providers():
+            try:
+                response = self._call_with_retries(name, call)
+            except Exception as e:
+                self._record_failure(name, e, errors)
+                continue
+
+            self._record_success(name)
+            return response
+
+        raise Exception(f"All providers failed: {'; '.join(errors)}")
+
+    async def _acomplete(self, call: Callable[[BaseAIClient], Awaitable[T]]) -> T:
+        errors: List[str] = []
+
+        for name in self._available_providers():
+            try:
+                response = await self._acall_with_retries(name, call)
+            except Exception as e:
+                self._record_failure(name, e, errors)
+                continue
+
+            self._record_success(name)
+            return response
+
+        raise Exception(f"All providers failed: {'; '.join(errors)}")
+
+    def _record_failure(self, name: str, error: Exception, errors: List[str]) -> None:
+        errors.append(f"{name}: {error}")
+        print(f"{Fore.YELLOW}{name} failed, trying the next provider...{Style.RESET_ALL}")
+
+    def _record_success(self, name: str) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success(name)
+
+    def _call_with_retries(self, name: str, call: Callable[[BaseAIClient], T]) -> T:
+        for attempt in range(self.retry_policy.max_retries + 1):
+            try:
+                return call(self.get_client(name))
+            except Exception as e:
+                self.sleep(self._retry_delay(name, e, attempt))
+
+    async def _acall_with_retries(self, name: str, call: Callable[[BaseAIClient], Awaitable[T]]) -> T:
+        for attempt in range(self.retry_policy.max_retries + 1):
+            try:
+                return await call(self.get_client(name))
+            except Exception as e:
+                await self.async_sleep(self._retry_delay(name, e, attempt))
+
+    def _retry_delay(self, name: str, error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying name after error, which is raised again when giving up."""
+        if not is_retryable(error):
+            raise error
+
+        retry_after = get_retry_after(error)
+        out_of_retries = attempt == self.retry_policy.max_retries
+        if out_of_retries or (retry_after is not None and retry_after > self.retry_policy.max_delay):
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure(name, retry_after)
+            raise error
+
+        return retry_after if retry_after is not None else self.retry_policy.backoff(attempt)
@@ -2,7 +2,8 @@
 Gemini API client implementation using LangChain.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator
+from gai_tool.api.base_client import BaseAIClient, DEFAULT_TIMEOUT
 from gai_tool.src.utils import validate_messages
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -11,7 +12,7 @@ from langchain_core.outputs import ChatResult
 import os
 
 
-class GeminiClient:
+class GeminiClient(BaseAIClient):
     """A client for interacting with Google's Gemini model via LangChain."""
 
     def __init__(
@@ -22,6 +23,8 @@ class GeminiClient:
         top_k: int = 40,
         max_output_tokens: int = 8000,
         callback_manager: Optional[CallbackManager] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        context_window: Optional[int] = None,
     ):
         """
         Initialize the Gemini client.
@@ -33,6 +36,8 @@ class GeminiClient:
             top_k: Number of tokens to consider for sampling
             max_output_tokens: Maximum number of tokens to generate
             callback_manager: Optional callback manager for logging and monitoring
+            timeout: Upper bound in seconds for each request
+            context_window: Context window of the model, prompts are truncated to fit it
         """
         self.api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
@@ -48,7 +53,12 @@ class GeminiClient:
             top_k=top_k,
             max_output_tokens=max_output_tokens,
             callback_manager=callback_manager,
+            timeout=timeout,
         )
+        self.model = model
+        self.timeout = timeout
+        self.max_tokens = max_output_tokens
+        self.context_window = context_window
 
     def get_chat_completion(
         self,
@@ -73,6 +83,7 @@ class GeminiClient:
         # messages.append(HumanMessage(content=user_message))
 
         validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
 
         try:
             response = self.llm.invoke(
@@ -82,3 +93,20 @@ class GeminiClient:
             return response.content
         except Exception as e:
             raise Exception(f"Error while communicating with Gemini: {str(e)}")
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        try:
+            response = await self.llm.ainvoke(user_message)
+            return response.content
+        except Exception as e:
+            raise Exception(f"Error while communicating with Gemini: {str(e)}")
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        for chunk in self.llm.stream(user_message):
+            if chunk.content:
+                yield chunk.content
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        async for chunk in self.llm.astream(user_message):
+            if chunk.content:
+                yield chunk.content
@@ -1,7 +1,9 @@
 import os
 import subprocess
+from typing import Any, Dict, Tuple
 from github import Github, GithubException
 
+from gai_tool.api.platform_http import use_platform_session
 from gai_tool.src import Merge_requests, ConfigManager, get_app_name
 
 
@@ -10,6 +12,7 @@ class Github_api():
         self.Merge_requests = Merge_requests().get_instance()
         self.load_config()
         self._github = None
+        self._repo = None
 
     def load_config(self):
         config_manager = ConfigManager(get_app_name())
@@ -33,12 +36,19 @@ class Github_api():
         if self._github is None:
             api_key = self.get_api_key()
             self._github = Github(api_key)
+            use_platform_session(self._github)
         return self._github
 
     @property
     def repo(self):
-        """Get the GitHub repository object."""
-        return self.github.get_repo(f"{self.repo_owner}/{self.repo_name}")
+        """
+        Get the GitHub repository object.
+        It is created lazily, without fetching the repository, since only its URL is needed
+        to list, create and edit pull requests.
+        """
+        if self._repo is None:
+            self._repo = self.github.get_repo(f"{self.repo_owner}/{self.repo_name}", lazy=True)
+        return self._repo
 
     def get_current_branch(self) -> str:
         result = subprocess.run(
@@ -47,46 +57,71 @@ class Github_api():
         )
         return result.stdout.strip()
 
-    def create_pull_request(self, title: str, body: str, target_branch: str = None) -> None:
-        source_branch = self.get_current_branch()
+    def create_pull_request(self, title: str, body: str, target_branch: str = None, source_branch: str = None) -> None:
+        source_branch = source_branch or self.get_current_branch()
 
         # Use provided target_branch or fall back to config
         target_branch_to_use = target_branch if target_branch is not None else self.target_branch
 
+        existing_pr = None
         try:
-            existing_pr = self.get_existing_pr()
-
-            if existing_pr:
-                print(f"A pull request already exists: {existing_pr.html_url}")
-                self.update_pull_request(
-                    existing_pr,
-                    title=title,
-                    body=body
-                )
-            else:
-                pr = self.repo.create_pull(
-                    title=title,
-                    body=body,
-                    head=source_branch,
-                    base=target_branch_to_use
-                )
-
-                print("Pull request created successfully.")
-                print(f"Pull request URL: {pr.html_url}")
+            existing_pr = self.get_existing_pr(source_branch)
+            self.upsert_pull_request(title, body, source_branch, target_branch_to_use, existing_pr)
 
         except GithubException as e:
-            print(f"Failed to create pull request: {e.status}")
+            print(f"Failed to {'update' if existing_pr else 'create'} pull request: {e.status}")
             print(f"Error message: {e.data}")
         except Exception as e:
             print(f"Unexpected error: {str(e)}")
 
-    def get_existing_pr(self):
+    def upsert_pull_request(self, title: str, body: str, source_branch: str, target_branch: str, existing_pr) -> None:
+        """
+        Update existing_pr if given, otherwise create a pull request from source_branch.
+        Errors are raised, so that callers handling many branches can report them.
+        """
+        if existing_pr:
+            print(f"A pull request already exists: {existing_pr.html_url}")
+            self.update_pull_request(
+                existing_pr,
+                title=title,
+                body=body
+            )
+        else:
+            pr = self.repo.create_pull(
+                title=title,
+                body=body,
+                head=source_branch,
+                base=target_branch
+            )
+
+            print("Pull request created successfully.")
+            print(f"Pull request URL: {pr.html_url}")
+
+    def get_open_prs_by_branch(self) -> Dict[Tuple[str, str], Any]:
         """
-        Get existing pull request for the current branch.
+        Get every open pull request of the repository, listed once, indexed by
+        (head branch, base branch). Pull requests from forks are left out, their
+        branches are not ours.
+        """
+        # GitHub logins are case-insensitive, the configured owner may differ in case
+        return {
+            (pr.head.ref, pr.base.ref): pr
+            for pr in self.repo.get_pulls(state='open')
+            if pr.head.label.lower() == f"{self.repo_owner}:{pr.head.ref}".lower()
+        }
+
+    @staticmethod
+    def get_title_and_body(pr) -> Tuple[str, str]:
+        return pr.title, pr.body or ""
+
+    def get_existing_pr(self, source_branch: str = None):
+        """
+        Get existing pull request for the given branch, the current one by default.
         Returns the PullRequest object if found, None otherwise.
         """
         try:
-            source_branch = self.get_current_branch()
+            if source_branch is None:
+                source_branch = self.get_current_branch()
 
             # Get open pull requests from the current branch
             pulls = self.repo.get_pulls(
@@ -107,19 +142,13 @@ class Github_api():
 
     def update_pull_request(self, pr, title: str, body: str) -> None:
         """
-        Update an existing pull request.
+        Update an existing pull request. Errors are raised, so that callers
+        handling many branches can report them.
 
         Args:
             pr: PullRequest object from PyGithub
             title: New title for the PR
             body: New body for the PR
         """
-        try:
-            pr.edit(title=title, body=body)
-            print("Pull request updated successfully.")
-
-        except GithubException as e:
-            print(f"Failed to update pull request: {e.status}")
-            print(f"Error message: {e.data}")
-        except Exception as e:
-            print(f"Unexpected error: {str(e)}")
+        pr.edit(title=title, body=body)
+        print("Pull request updated successfully.")
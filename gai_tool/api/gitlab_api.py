@@ -1,8 +1,9 @@
 import os
 import gitlab
 import subprocess
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
+from gai_tool.api.platform_http import PlatformSession
 from gai_tool.src import Merge_requests, ConfigManager, get_app_name
 
 
@@ -11,7 +12,7 @@ class Gitlab_api():
         self.load_config()
         self.Merge_requests = Merge_requests().get_instance()
         self.gl = self._initialize_gitlab_client()
-        self.project = self._get_project()
+        self._project = None
 
     def load_config(self):
         config_manager = ConfigManager(get_app_name())
@@ -24,18 +25,37 @@ class Gitlab_api():
         gitlab_domain = self.Merge_requests.get_remote_url()
         gitlab_url = f"https://{gitlab_domain}"
 
-        return gitlab.Gitlab(gitlab_url, private_token=api_key)
+        # The session already waits out rate limits, python-gitlab retrying them too would double the retries
+        return gitlab.Gitlab(gitlab_url, private_token=api_key, session=PlatformSession(), obey_rate_limit=False)
+
+    @property
+    def project(self):
+        """Lazy initialization of the GitLab project object."""
+        if self._project is None:
+            self._project = self._get_project()
+        return self._project
 
     def _get_project(self):
-        """Get the GitLab project object."""
+        """
+        Get the GitLab project object.
+        It is not fetched, its path is all the merge request endpoints need.
+        """
+        return self.gl.projects.get(self.project_path, lazy=True)
+
+    @property
+    def project_path(self) -> str:
         repo_owner = self.Merge_requests.get_repo_owner_from_remote_url()
         repo_name = self.Merge_requests.get_repo_from_remote_url()
-        project_path = f"{repo_owner}/{repo_name}"
+        return f"{repo_owner}/{repo_name}"
 
-        try:
-            return self.gl.projects.get(project_path)
-        except gitlab.exceptions.GitlabGetError as e:
-            raise ValueError(f"Failed to get project {project_path}: {e}")
+    def check_project_found(self, error: gitlab.exceptions.GitlabError) -> None:
+        """
+        The project is not fetched, a wrong path only shows as a 404 of the
+        merge request endpoints: raise a clear error for it.
+        """
+        if error.response_code == 404:
+            raise ValueError(
+                f"GitLab project {self.project_path} not found, check your token and repository access") from error
 
     def get_api_key(self) -> str:
         """Get the GitLab API key from environment variables."""
@@ -64,11 +84,12 @@ class Gitlab_api():
             Dict containing merge request data if found, None otherwise
         """
         try:
-            # Get merge requests filtered by source branch and state
+            # Only the first open merge request of the branch is needed, fetch a single page of one
             merge_requests = self.project.mergerequests.list(
                 source_branch=source_branch,
                 state='opened',
-                all=True
+                per_page=1,
+                get_all=False
             )
 
             if merge_requests:
@@ -79,36 +100,53 @@ class Gitlab_api():
             return None
 
         except gitlab.exceptions.GitlabError as e:
+            self.check_project_found(e)
             print(f"Error fetching merge requests: {e}")
             return None
 
+    @staticmethod
+    def get_title_and_description(mr: Dict[str, Any]) -> Tuple[str, str]:
+        return mr['title'], mr.get('description') or ""
+
     def update_merge_request(self, mr_iid: int, title: str, description: str) -> None:
         """
-        Update an existing merge request.
+        Update an existing merge request. Errors are raised, so that callers
+        handling many branches can report them.
 
         Args:
             mr_iid: The internal ID of the merge request
             title: New title for the merge request
             description: New description for the merge request
         """
-        try:
-            # Get the merge request by internal ID
-            mr = self.project.mergerequests.get(mr_iid)
+        # Update the merge request directly, without fetching it first
+        self.project.mergerequests.update(mr_iid, {
+            "title": title,
+            "description": description,
+            "remove_source_branch": True,
+            "squash": True
+        })
 
-            # Update the merge request
-            mr.title = title
-            mr.description = description
-            mr.remove_source_branch = True
-            mr.squash = True
-
-            mr.save()
-
-            print(f"Merge request updated successfully with internal ID: {mr_iid}")
+        print(f"Merge request updated successfully with internal ID: {mr_iid}")
 
+    def get_open_merge_requests_by_branch(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Get every open merge request of the project, listed once, indexed by
+        (source branch, target branch).
+        """
+        try:
+            return {
+                (mr.source_branch, mr.target_branch): mr._attrs
+                for mr in self.project.mergerequests.list(state='opened', iterator=True)
+            }
         except gitlab.exceptions.GitlabError as e:
-            print(f"Failed to update merge request: {e}")
-
-    def create_merge_request(self, title: str, description: str, target_branch: str = None) -> None:
+            self.check_project_found(e)
+            raise
+
+    def create_merge_request(self,
+                             title: str,
+                             description: str,
+                             target_branch: str = None,
+                             source_branch: str = None) -> None:
         """
         Create a new merge request or update existing one.
 
@@ -116,13 +154,31 @@ class Gitlab_api():
             title: Title for the merge request
             description: Description for the merge request
             target_branch: Target branch for the merge request (overrides config if provided)
+            source_branch: Source branch of the merge request, the current branch by default
         """
-        source_branch = self.get_current_branch()
+        source_branch = source_branch or self.get_current_branch()
         existing_mr = self.get_existing_merge_request(source_branch)
 
         # Use provided target_branch or fall back to config
         target_branch_to_use = target_branch if target_branch is not None else self.target_branch
 
+        try:
+            self.upsert_merge_request(title, description, source_branch, target_branch_to_use, existing_mr)
+        except gitlab.exceptions.GitlabCreateError as e:
+            print(f"Failed to create merge request: {e}")
+        except gitlab.exceptions.GitlabError as e:
+            print(f"Failed to update merge request: {e}")
+
+    def upsert_merge_request(self,
+                             title: str,
+                             description: str,
+                             source_branch: str,
+                             target_branch: str,
+                             existing_mr: Optional[Dict[str, Any]]) -> None:
+        """
+        Update existing_mr if given, otherwise create a merge request from source_branch.
+        Errors are raised, so that callers handling many branches can report them.
+        """
         if existing_mr:
             print(f"A merge request already exists: {existing_mr['web_url']}")
             self.update_merge_request(
@@ -131,25 +187,25 @@ class Gitlab_api():
                 description=description
             )
         else:
-            try:
-                # Create new merge request
-                mr_data = {
-                    "source_branch": source_branch,
-                    "target_branch": target_branch_to_use,
-                    "title": title,
-                    "description": description,
-                    "remove_source_branch": True,
-                    "squash": True
-                }
-
-                # Add assignee if configured
-                if self.assignee_id:
-                    mr_data["assignee_id"] = self.assignee_id
+            # Create new merge request
+            mr_data = {
+                "source_branch": source_branch,
+                "target_branch": target_branch,
+                "title": title,
+                "description": description,
+                "remove_source_branch": True,
+                "squash": True
+            }
+
+            # Add assignee if configured
+            if self.assignee_id:
+                mr_data["assignee_id"] = self.assignee_id
 
+            try:
                 mr = self.project.mergerequests.create(mr_data)
+            except gitlab.exceptions.GitlabError as e:
+                self.check_project_found(e)
+                raise
 
-                print(f"Merge request created successfully with internal ID: {mr.iid}")
-                print(f"URL: {mr.web_url}")
-
-            except gitlab.exceptions.GitlabCreateError as e:
-                print(f"Failed to create merge request: {e}")
+            print(f"Merge request created successfully with internal ID: {mr.iid}")
+            print(f"URL: {mr.web_url}")
@@ -1,44 +1,76 @@
 import os
-from typing import Dict, List
-from groq import Groq
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from groq import AsyncGroq, Groq
 
+from gai_tool.api.base_client import BaseAIClient, DEFAULT_TIMEOUT
 from gai_tool.src import Prompts, print_tokens
 from gai_tool.src.utils import create_system_message, validate_messages
 
 
-class GroqClient:
+class GroqClient(BaseAIClient):
     def __init__(self,
                  model: str,
                  temperature: int,
-                 max_tokens: int) -> str:
+                 max_tokens: int,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 context_window: Optional[int] = None) -> str:
 
-        self.client = Groq(api_key=self.get_api_key())
+        api_key = self.get_api_key()
+        self.client = Groq(api_key=api_key, timeout=timeout)
+        self.async_client = AsyncGroq(api_key=api_key, timeout=timeout)
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.context_window = context_window
 
-        # TODO: we disabled token counter for now
-        # self.TokenCounter = TokenCounter(
-        #     model='meta-llama/Meta-Llama-3-8B-Instruct',
-        # )
+    def _completion_params(self, user_message: List[Dict[str, str]], stream: bool) -> dict:
+        return dict(
+            messages=user_message,
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            top_p=1,
+            stream=stream,
+            stop=None,
+        )
 
     def get_chat_completion(self,
                             user_message: List[Dict[str, str]]
                             ):
 
         validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
 
         chat_completion = self.client.chat.completions.create(
-            messages=user_message,
-            model=self.model,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            top_p=1,
-            stream=False,
-            stop=None,
+            **self._completion_params(user_message, stream=False)
+        )
+        return chat_completion.choices[0].message.content
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        chat_completion = await self.async_client.chat.completions.create(
+            **self._completion_params(user_message, stream=False)
         )
         return chat_completion.choices[0].message.content
 
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._completion_params(user_message, stream=True)
+        )
+        with stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        stream = await self.async_client.chat.completions.create(
+            **self._completion_params(user_message, stream=True)
+        )
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
     def get_api_key(self):
         api_key = os.environ.get("GROQ_API_KEY")
         if api_key is None:
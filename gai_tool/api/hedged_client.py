@@ -0,0 +1,163 @@
+"""
+Hedged requests: send the same messages to two providers and keep the first good answer.
+"""
+
+import asyncio
+import re
+import time
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from gai_tool.api.base_client import BaseAIClient
+from gai_tool.api.latency_tracker import LatencyTracker
+from gai_tool.src.utils import validate_messages
+
+# Hedge delay used while there is not enough latency history for the primary
+DEFAULT_HEDGE_DELAY = 2.0
+PERCENTILE_PATTERN = re.compile(r"^p(\d{1,2}(?:\.\d+)?|100)$", re.IGNORECASE)
+
+
+def parse_hedge_delay(hedge_delay: Union[float, str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parse a hedge delay into (seconds, percentile), one of them None: a
+    non-negative number of seconds, or a percentile such as ``"p90"``.
+    """
+    if isinstance(hedge_delay, str):
+        match = PERCENTILE_PATTERN.match(hedge_delay.strip())
+        if match:
+            return None, float(match.group(1)) / 100
+    try:
+        seconds = float(hedge_delay)
+    except (TypeError, ValueError):
+        seconds = -1.0
+    if not seconds >= 0:
+        raise ValueError(f"Invalid hedge_delay {hedge_delay!r}: use a number of seconds (e.g. 1.5) "
+                         "or a latency percentile between p0 and p100 (e.g. p90)")
+    return seconds, None
+
+
+class HedgedClient(BaseAIClient):
+    """
+    Race a primary and a backup client.
+
+    The backup request is sent once the primary has not answered within
+    ``hedge_delay`` seconds, or right away if the primary fails. ``hedge_delay``
+    can be a number of seconds (0 sends both at once) or a percentile of the
+    primary's recorded latency such as ``"p90"``. The first response accepted
+    by the validator wins and the other request is cancelled.
+    """
+
+    def __init__(self,
+                 primary: BaseAIClient,
+                 backup: BaseAIClient,
+                 primary_name: str,
+                 backup_name: str,
+                 hedge_delay: Union[float, str] = "p90",
+                 latency_tracker: Optional[LatencyTracker] = None):
+
+        self.primary = primary
+        self.backup = backup
+        self.primary_name = primary_name
+        self.backup_name = backup_name
+        self.hedge_delay = hedge_delay
+        # Validated once, a bad config value fails before any request is sent
+        self.hedge_seconds, self.hedge_percentile = parse_hedge_delay(hedge_delay)
+        self.latency_tracker = latency_tracker
+        self.timeout = max(primary.timeout or 0, backup.timeout or 0) or None
+
+    def resolve_hedge_delay(self) -> float:
+        """Seconds to wait for the primary before sending the backup request."""
+        if self.hedge_percentile is not None:
+            percentile = None
+            if self.latency_tracker is not None:
+                percentile = self.latency_tracker.percentile(self.primary_name, self.hedge_percentile)
+            return percentile if percentile is not None else DEFAULT_HEDGE_DELAY
+
+        return self.hedge_seconds
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self.get_valid_chat_completion(user_message, validator=None)
+
+    def get_valid_chat_completion(self,
+                                  user_message: List[Dict[str, str]],
+                                  validator: Optional[Callable[[str], object]]) -> str:
+        validate_messages(messages=user_message)
+
+        return asyncio.run(self._race(user_message, validator))
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return await self._race(user_message, validator=None)
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        # A stream cannot be validated before it is consumed, so only the primary streams
+        yield from self.primary.stream_chat_completion(user_message)
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        async for chunk in self.primary.astream_chat_completion(user_message):
+            yield chunk
+
+    async def _timed_completion(self, name: str, client: BaseAIClient, user_message: List[Dict[str, str]]) -> str:
+        start = time.monotonic()
+        try:
+            response = await client.aget_chat_completion(user_message)
+        except Exception as e:
+            # A ValueError is a configuration error or an unparsable answer, not a provider failure
+            if self.latency_tracker is not None and not isinstance(e, ValueError):
+                self.latency_tracker.record_failure(name)
+            raise
+
+        if self.latency_tracker is not None:
+            self.latency_tracker.record(name, time.monotonic() - start)
+        return response
+
+    async def _race(self,
+                    user_message: List[Dict[str, str]],
+                    validator: Optional[Callable[[str], object]]) -> str:
+        tasks: Dict[asyncio.Task, str] = {}
+        errors: List[str] = []
+
+        def launch(name: str, client: BaseAIClient) -> asyncio.Task:
+            task = asyncio.create_task(self._timed_completion(name, client, user_message))
+            tasks[task] = name
+            return task
+
+        primary_start = time.monotonic()
+        primary = launch(self.primary_name, self.primary)
+        hedge_delay = self.resolve_hedge_delay()
+        backup_launched = False
+
+        if hedge_delay <= 0:
+            launch(self.backup_name, self.backup)
+            backup_launched = True
+
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=None if backup_launched else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    name = tasks.pop(task)
+                    try:
+                        response = task.result()
+                        if validator is not None:
+                            validator(response)
+                        return response
+                    except Exception as e:
+                        errors.append(f"{name}: {e}")
+
+                # Primary is slow or already failed: send the hedge
+                if not backup_launched:
+                    launch(self.backup_name, self.backup)
+                    backup_launched = True
+        finally:
+            if primary in tasks and backup_launched and self.latency_tracker is not None:
+                # Censored sample: the primary lost the race, so it would have taken at least
+                # this long. Leaving it out would only keep its fast answers and bias the
+                # percentile hedge delay low.
+                self.latency_tracker.record(self.primary_name, max(time.monotonic() - primary_start, hedge_delay))
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        raise Exception(f"All hedged requests failed: {'; '.join(errors)}")
@@ -1,24 +1,35 @@
 import os
-from typing import Dict, List
-from huggingface_hub import InferenceClient
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from huggingface_hub import AsyncInferenceClient, InferenceClient
 
+from gai_tool.api.base_client import BaseAIClient, DEFAULT_TIMEOUT
 from gai_tool.src import print_tokens
 from gai_tool.api.token_counter_lite import TokenCounterLite
 from gai_tool.src.utils import get_api_huggingface_key, validate_messages
 
 
-class HuggingClient:
+class HuggingClient(BaseAIClient):
     def __init__(self,
                  model: str,
                  temperature: int,
-                 max_tokens: int) -> str:
+                 max_tokens: int,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 context_window: Optional[int] = None) -> str:
 
+        api_key = get_api_huggingface_key()
         self.client = InferenceClient(
-            api_key=get_api_huggingface_key(),
+            api_key=api_key,
+            timeout=timeout,
+        )
+        self.async_client = AsyncInferenceClient(
+            api_key=api_key,
+            timeout=timeout,
         )
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.context_window = context_window
 
         self.TokenCounter = TokenCounterLite(
             model=self.model,
@@ -27,16 +38,24 @@ class HuggingClient:
     def run(self):
         print("Huggingface client running")
 
+    def count_prompt_tokens(self, user_message: List[Dict[str, str]]) -> int:
+        return self.TokenCounter.count_tokens(user_message)
+
+    def _remaining_tokens(self, user_message: List[Dict[str, str]]) -> int:
+        tokens = self.TokenCounter.count_tokens(user_message)
+        remaining_tokens = self.TokenCounter.adjust_max_tokens(user_message, self.max_tokens, message_tokens=tokens)
+
+        print_tokens(tokens, remaining_tokens)
+        return remaining_tokens
+
     def get_chat_completion(self,
                             user_message: List[Dict[str, str]]
                             ):
 
         validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
 
-        tokens = self.TokenCounter.count_tokens(user_message)
-        remaining_tokens = self.TokenCounter.adjust_max_tokens(user_message, self.max_tokens)
-
-        print_tokens(tokens, remaining_tokens)
+        remaining_tokens = self._remaining_tokens(user_message)
 
         response = self.client.chat.completions.create(
             messages=user_message,
@@ -46,3 +65,43 @@ class HuggingClient:
             stream=False,
         )
         return response.choices[0].message.content
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        remaining_tokens = self._remaining_tokens(user_message)
+
+        response = await self.async_client.chat.completions.create(
+            messages=user_message,
+            model=self.model,
+            max_tokens=remaining_tokens,
+            temperature=self.temperature,
+            stream=False,
+        )
+        return response.choices[0].message.content
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        remaining_tokens = self._remaining_tokens(user_message)
+
+        stream = self.client.chat.completions.create(
+            messages=user_message,
+            model=self.model,
+            max_tokens=remaining_tokens,
+            temperature=self.temperature,
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        remaining_tokens = self._remaining_tokens(user_message)
+
+        stream = await self.async_client.chat.completions.create(
+            messages=user_message,
+            model=self.model,
+            max_tokens=remaining_tokens,
+            temperature=self.temperature,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,139 @@
+"""
+Local latency history of the AI providers.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from gai_tool.src.utils import get_cache_dir
+
+LATENCY_FILE = "latency.json"
+MAX_SAMPLES = 50
+MIN_SAMPLES = 5
+# Weight of the newest sample in the moving averages, high enough to follow
+# providers whose speed changes throughout the day
+EWMA_ALPHA = 0.3
+
+
+class LatencyTracker:
+    """
+    Keep response latencies (in seconds), prompt sizes and failure rates per
+    provider key, e.g. ``"groq:llama-3.3-70b-versatile"``, persisted under the
+    cache folder.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_samples: int = MAX_SAMPLES):
+        self.path = path or get_cache_dir() / LATENCY_FILE
+        self.max_samples = max_samples
+        self.history: Dict[str, Dict] = self._load()
+        # Requests may be recorded from several threads, e.g. when syncing many branches
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with self.path.open("r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict):
+            return {}
+        return data
+
+    def save(self) -> None:
+        """Write the history atomically so concurrent runs never see a partial file."""
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with self._lock, tmp_path.open("w") as f:
+                json.dump(self.history, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The history is only an optimization, never fail the command because of it
+            tmp_path.unlink(missing_ok=True)
+
+    def _entry(self, key: str) -> Dict:
+        entry = self.history.setdefault(key, {})
+        entry.setdefault("samples", [])
+        entry.setdefault("failure_rate", 0.0)
+        return entry
+
+    def _latencies(self, key: str) -> List[float]:
+        return [seconds for seconds, _ in self.history.get(key, {}).get("samples", [])]
+
+    def record(self, key: str, seconds: float, prompt_tokens: Optional[int] = None) -> None:
+        with self._lock:
+            entry = self._entry(key)
+
+            entry["samples"].append([round(seconds, 3), prompt_tokens])
+            del entry["samples"][:-self.max_samples]
+
+            previous = entry.get("ewma")
+            entry["ewma"] = seconds if previous is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+            entry["failure_rate"] = (1 - EWMA_ALPHA) * entry["failure_rate"]
+            entry["updated"] = time.time()
+        self.save()
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            entry = self._entry(key)
+            entry["failure_rate"] = EWMA_ALPHA + (1 - EWMA_ALPHA) * entry["failure_rate"]
+            entry["updated"] = time.time()
+        self.save()
+
+    def has_history(self, key: str) -> bool:
+        return len(self._latencies(key)) > 0
+
+    def ewma(self, key: str) -> Optional[float]:
+        return self.history.get(key, {}).get("ewma")
+
+    def failure_rate(self, key: str) -> float:
+        return self.history.get(key, {}).get("failure_rate", 0.0)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """
+        Get the ``q`` percentile (0-1) of the recorded latencies for ``key``.
+        Returns None while there are too few samples to be meaningful.
+        """
+        samples = sorted(self._latencies(key))
+        if len(samples) < MIN_SAMPLES:
+            return None
+
+        index = min(len(samples) - 1, math.ceil(q * len(samples)) - 1)
+        return samples[max(index, 0)]
+
+    def p95(self, key: str) -> Optional[float]:
+        return self.percentile(key, 0.95)
+
+    def expected_latency(self, key: str, prompt_tokens: int) -> Optional[float]:
+        """
+        Expected time-to-answer for a prompt of ``prompt_tokens`` tokens.
+
+        Fits ``latency = base + per_token * tokens`` on the recent samples when
+        they cover different prompt sizes, otherwise uses the EWMA latency.
+        Failures are accounted for as the extra attempts they cost on average.
+        Returns None when there is no history for ``key``.
+        """
+        if not self.has_history(key):
+            return None
+
+        latencies = self._latencies(key)
+        expected = self.ewma(key)
+        if expected is None:
+            expected = sum(latencies) / len(latencies)
+
+        pairs = [(tokens, seconds) for seconds, tokens in self.history[key]["samples"] if tokens is not None]
+        if len(pairs) >= MIN_SAMPLES:
+            mean_tokens = sum(t for t, _ in pairs) / len(pairs)
+            mean_seconds = sum(s for _, s in pairs) / len(pairs)
+            variance = sum((t - mean_tokens) ** 2 for t, _ in pairs)
+            if variance > 0:
+                per_token = max(0.0, sum((t - mean_tokens) * (s - mean_seconds) for t, s in pairs) / variance)
+                base = max(0.0, mean_seconds - per_token * mean_tokens)
+                expected = base + per_token * prompt_tokens
+
+        return expected / max(1.0 - self.failure_rate(key), 0.05)
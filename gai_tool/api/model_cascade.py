@@ -0,0 +1,96 @@
+"""
+Prompt-size based model cascade: the smallest model that fits goes first.
+"""
+
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from colorama import Fore, Style
+
+from gai_tool.api.base_client import BaseAIClient, approximate_prompt_tokens
+from gai_tool.api.context_window import prompt_budget
+from gai_tool.src.myconfig import Models
+from gai_tool.src.utils import validate_messages
+
+
+class ModelCascade(BaseAIClient):
+    """
+    Pick the smallest model whose ``max_prompt_tokens`` and context window cover
+    the prompt, and escalate to the next bigger model when its answer is rejected by the
+    validator (e.g. it does not parse as a list of choices).
+
+    ``models`` must be ordered from smallest to largest.
+    """
+
+    def __init__(self,
+                 models: List[Models],
+                 factory: Callable[[Models], BaseAIClient],
+                 token_counter: Optional[Callable[[List[Dict[str, str]]], int]] = None):
+
+        if not models:
+            raise ValueError("The model cascade needs at least one model")
+
+        self.models = models
+        self.factory = factory
+        # Models of a cascade usually share a tokenizer family, estimate with the first one
+        self.token_counter = token_counter or partial(approximate_prompt_tokens, model=models[0].model_name)
+        self.clients: Dict[str, BaseAIClient] = {}
+        self.model = models[-1].model_name
+        self.timeout = None
+
+    def get_client(self, model: Models) -> BaseAIClient:
+        if model.model_name not in self.clients:
+            self.clients[model.model_name] = self.factory(model)
+        return self.clients[model.model_name]
+
+    def select(self, prompt_tokens: int) -> int:
+        """Index of the smallest model able to handle ``prompt_tokens``."""
+        for index, model in enumerate(self.models):
+            budget = prompt_budget(model.context_window, model.max_tokens)
+            if budget is not None and prompt_tokens > budget:
+                continue
+            if model.max_prompt_tokens is None or prompt_tokens <= model.max_prompt_tokens:
+                return index
+        return len(self.models) - 1
+
+    def count_prompt_tokens(self, user_message: List[Dict[str, str]]) -> int:
+        return self.token_counter(user_message)
+
+    def _selected_client(self, user_message: List[Dict[str, str]]) -> BaseAIClient:
+        model = self.models[self.select(self.count_prompt_tokens(user_message))]
+        print(f"{Fore.CYAN}Using model {model.model_name}{Style.RESET_ALL}")
+        return self.get_client(model)
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        validate_messages(messages=user_message)
+
+        return self._selected_client(user_message).get_chat_completion(user_message=user_message)
+
+    def get_valid_chat_completion(self,
+                                  user_message: List[Dict[str, str]],
+                                  validator: Callable[[str], object]) -> str:
+        validate_messages(messages=user_message)
+
+        start = self.select(self.count_prompt_tokens(user_message))
+        for index in range(start, len(self.models)):
+            model = self.models[index]
+            print(f"{Fore.CYAN}Using model {model.model_name}{Style.RESET_ALL}")
+
+            response = self.get_client(model).get_chat_completion(user_message=user_message)
+            try:
+                validator(response)
+                return response
+            except ValueError:
+                if index == len(self.models) - 1:
+                    raise
+                print(f"{Fore.YELLOW}Unusable answer from {model.model_name}, escalating...{Style.RESET_ALL}")
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return await self._selected_client(user_message).aget_chat_completion(user_message)
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        yield from self._selected_client(user_message).stream_chat_completion(user_message)
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        async for chunk in self._selected_client(user_message).astream_chat_completion(user_message):
+            yield chunk
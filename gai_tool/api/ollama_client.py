@@ -1,27 +1,35 @@
 import os
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 from langchain_ollama import ChatOllama
 
+from gai_tool.api.base_client import BaseAIClient, DEFAULT_TIMEOUT
 from gai_tool.src import Prompts, print_tokens
 from gai_tool.src.utils import create_system_message, get_api_huggingface_key, validate_messages
 
 
-class OllamaClient:
+class OllamaClient(BaseAIClient):
     def __init__(self,
                  model: str,
                  temperature: int,
-                 max_tokens: int) -> str:
+                 max_tokens: int,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 context_window: Optional[int] = None) -> str:
 
         self.client = ChatOllama(
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            stream=False
+            # Without it Ollama silently drops the start of prompts longer than its default window
+            num_ctx=context_window,
+            stream=False,
+            client_kwargs={"timeout": timeout},
         )
 
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.context_window = context_window
 
     # Invoke the ollama client
     def get_chat_completion(self,
@@ -29,6 +37,21 @@ class OllamaClient:
                             ):
 
         validate_messages(messages=user_message)
+        user_message = self.fit_context_window(user_message)
 
         ai_response = self.client.invoke(user_message)
         return ai_response.content
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        ai_response = await self.client.ainvoke(user_message)
+        return ai_response.content
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        for chunk in self.client.stream(user_message):
+            if chunk.content:
+                yield chunk.content
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        async for chunk in self.client.astream(user_message):
+            if chunk.content:
+                yield chunk.content
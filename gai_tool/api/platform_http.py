@@ -0,0 +1,284 @@
+"""
+HTTP layer shared by the GitHub and GitLab clients: rate-limit aware retries
+and conditional GET requests.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from colorama import Fore, Style
+from requests.adapters import HTTPAdapter
+
+from gai_tool.api.retry import RetryPolicy, parse_retry_after
+from gai_tool.src.utils import get_cache_dir
+
+HTTP_CACHE_FOLDER = "http"
+# Rate limits are waited out for up to a minute, longer waits fail straight away
+PLATFORM_RETRY_POLICY = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=60.0)
+# Server errors are only retried for requests that are safe to send twice
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+SERVER_ERROR_STATUS_CODES = {500, 502, 503, 504}
+# Headers identifying the caller, responses are cached per token
+AUTH_HEADERS = ("Authorization", "PRIVATE-TOKEN", "JOB-TOKEN")
+# Headers of a cached response needed to read it again, the others come from the 304 answer
+CACHED_HEADERS = ("Content-Type", "Link")
+# Cached responses hold private repository data: they expire, and the least
+# recently used ones are evicted beyond the maximum number of entries
+ETAG_CACHE_MAX_AGE = 7 * 24 * 3600
+ETAG_CACHE_MAX_ENTRIES = 500
+
+
+def get_header(headers, *names: str) -> Optional[str]:
+    """First header present among ``names``, GitHub and GitLab prefix them differently."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class EtagCache:
+    """
+    GET responses stored by URL, media type and credentials, along with their ETag, under the
+    cache folder. A ``304 Not Modified`` answer to a conditional request is not
+    counted against the GitHub rate limit, so repeated lookups become free.
+
+    Entries are only readable by the user, expire after max_age seconds, and
+    the least recently used ones are evicted beyond max_entries.
+    """
+
+    def __init__(self,
+                 root: Optional[Path] = None,
+                 max_age: float = ETAG_CACHE_MAX_AGE,
+                 max_entries: int = ETAG_CACHE_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.time):
+        self._root = root
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: Dict[str, Dict] = {}
+
+    @property
+    def root(self) -> Path:
+        """Cache folder, only resolved once a response is looked up."""
+        if self._root is None:
+            self._root = get_cache_dir() / HTTP_CACHE_FOLDER
+        return self._root
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        # The same URL answers differently per Accept header, e.g. a diff instead of JSON
+        credentials = "|".join(request.headers.get(name, "") for name in AUTH_HEADERS)
+        accept = request.headers.get("Accept", "")
+        return hashlib.sha256(f"{request.url}|{accept}|{credentials}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self.root / f"{key}.json"
+        if key not in self.entries:
+            try:
+                with path.open("r") as f:
+                    self.entries[key] = json.load(f)
+            except (OSError, ValueError):
+                return None
+
+        if self.clock() - self.entries[key].get("stored", 0) > self.max_age:
+            del self.entries[key]
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            # The modification time orders the entries for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return self.entries[key]
+
+    def put(self, key: str, response: requests.Response) -> None:
+        entry = {
+            "etag": response.headers["ETag"],
+            "stored": self.clock(),
+            "headers": {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+        self.entries[key] = entry
+
+        path = self.root / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.root.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+            self.evict()
+        except OSError:
+            # The cache is only an optimization, keep it in memory
+            tmp_path.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries beyond max_entries."""
+        paths = []
+        for path in self.root.glob("*.json"):
+            try:
+                paths.append((path.stat().st_mtime, path))
+            except OSError:
+                pass
+
+        paths.sort()
+        for _, path in paths[:max(0, len(paths) - self.max_entries)]:
+            self.entries.pop(path.stem, None)
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def to_response(entry: Dict, not_modified: requests.Response) -> requests.Response:
+        """Rebuild the cached response, with the fresh headers of the 304 answer."""
+        response = requests.Response()
+        response.status_code = 200
+        response.headers.update(entry["headers"])
+        response.headers.update(not_modified.headers)
+        response._content = base64.b64decode(entry["body"])
+        response.encoding = not_modified.encoding or requests.utils.get_encoding_from_headers(response.headers)
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.reason = "OK"
+        response.elapsed = not_modified.elapsed
+        return response
+
+
+class PlatformSession(requests.Session):
+    """
+    ``requests`` session for the git platform APIs.
+
+    - Rate limited answers (429, or 403 with an exhausted quota) are retried
+      after ``Retry-After`` or the ``X-RateLimit-Reset``/``RateLimit-Reset``
+      time, and server errors of idempotent requests with exponential backoff.
+      Waits longer than the retry policy allows are not attempted.
+    - Once a host reports its quota exhausted, the next request waits for the
+      reset instead of being rejected.
+    - GET responses carrying an ETag are cached and revalidated with
+      ``If-None-Match``.
+    """
+
+    def __init__(self,
+                 retry_policy: RetryPolicy = PLATFORM_RETRY_POLICY,
+                 etag_cache: Optional[EtagCache] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.time):
+        super().__init__()
+        self.retry_policy = retry_policy
+        self.etag_cache = etag_cache if etag_cache is not None else EtagCache()
+        self.sleep = sleep
+        self.clock = clock
+        # Time at which the quota of each exhausted host resets
+        self.quota_resets: Dict[str, float] = {}
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        host = urlsplit(request.url).netloc
+
+        cache_key = cached = None
+        # Requests that are already conditional are left to their caller
+        if request.method == "GET" and not kwargs.get("stream") and "If-None-Match" not in request.headers:
+            cache_key = self.etag_cache.key(request)
+            cached = self.etag_cache.get(cache_key)
+            if cached is not None:
+                request.headers["If-None-Match"] = cached["etag"]
+
+        for attempt in range(self.retry_policy.max_retries + 1):
+            self._wait_for_quota(host)
+            response = super().send(request, **kwargs)
+            self._record_quota(host, response)
+
+            delay = self._retry_delay(request, response, attempt)
+            if delay is None or attempt == self.retry_policy.max_retries or delay > self.retry_policy.max_delay:
+                break
+            response.close()
+            self.sleep(delay)
+
+        if cached is not None and response.status_code == 304:
+            return self.etag_cache.to_response(cached, response)
+        if cache_key is not None and response.status_code == 200 and "ETag" in response.headers:
+            self.etag_cache.put(cache_key, response)
+        return response
+
+    def _wait_for_quota(self, host: str) -> None:
+        wait = self.quota_resets.get(host, 0) - self.clock()
+        if 0 < wait <= self.retry_policy.max_delay:
+            self.sleep(wait)
+        self.quota_resets.pop(host, None)
+
+    def _record_quota(self, host: str, response: requests.Response) -> None:
+        remaining = get_header(response.headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = get_header(response.headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if remaining == "0" and reset is not None:
+            try:
+                self.quota_resets[host] = float(reset)
+            except ValueError:
+                pass
+
+    def _retry_delay(self,
+                     request: requests.PreparedRequest,
+                     response: requests.Response,
+                     attempt: int) -> Optional[float]:
+        """Seconds to wait before sending ``request`` again, None when it should not be retried."""
+        host = urlsplit(request.url).netloc
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        quota_reset = self.quota_resets.get(host)
+
+        # GitHub answers 403 instead of 429 to secondary and exhausted rate limits
+        rate_limited = response.status_code == 429 or (
+            response.status_code == 403 and (retry_after is not None or quota_reset is not None))
+
+        if rate_limited:
+            if retry_after is not None:
+                return retry_after
+            if quota_reset is not None:
+                # Waited for here, not again before the next attempt
+                del self.quota_resets[host]
+                return max(0.0, quota_reset - self.clock())
+            return self.retry_policy.backoff(attempt)
+
+        if response.status_code in SERVER_ERROR_STATUS_CODES and request.method in IDEMPOTENT_METHODS:
+            return retry_after if retry_after is not None else self.retry_policy.backoff(attempt)
+
+        return None
+
+
+def use_platform_session(github, session_factory: Callable[[], requests.Session] = PlatformSession) -> bool:
+    """
+    Make a PyGithub client send its requests through a ``PlatformSession``.
+
+    PyGithub has no public way to supply a session, and its class-level
+    ``Requester.injectConnectionClasses`` disables connection reuse for every
+    client. Instead the connection class of this client's requester is
+    replaced, which relies on PyGithub internals: the supported versions are
+    pinned in pyproject.toml. Returns False with a warning, leaving PyGithub's
+    own retries in place, when its internals do not look as expected.
+    """
+    from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+
+    requester = getattr(github, "_Github__requester", None)
+    connection_class = getattr(requester, "_Requester__connectionClass", None)
+    if connection_class not in (HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass):
+        print(f"{Fore.YELLOW}Unsupported PyGithub version, GitHub requests are sent without "
+              f"rate limit handling and response caching.{Style.RESET_ALL}")
+        return False
+
+    class PlatformConnection(connection_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            session = session_factory()
+            session.auth = self.session.auth
+            # Retries are handled by the session, not by urllib3
+            session.mount(f"{self.protocol}://",
+                          HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size))
+            self.session.close()
+            self.session = session
+
+    requester._Requester__connectionClass = PlatformConnection
+    return True
@@ -0,0 +1,207 @@
+"""
+Latency-aware routing between the AI providers (``interface: auto``).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import requests
+from colorama import Fore, Style
+
+from gai_tool.api.base_client import BaseAIClient, approximate_prompt_tokens
+from gai_tool.api.latency_tracker import LatencyTracker
+from gai_tool.src.utils import validate_messages
+
+T = TypeVar("T")
+
+PROBE_TIMEOUT = 2.0
+
+# Environment variables holding the credentials of each interface
+API_KEY_ENV: Dict[str, List[str]] = {
+    "huggingface": ["HUGGINGFACE_API_TOKEN"],
+    "groq": ["GROQ_API_KEY"],
+    "google": ["GEMINI_API_KEY", "GOOGLE_API_KEY"],
+    "ollama": [],
+}
+
+# Cheap reachability checks, any HTTP answer (even 401/404) means the API is up
+HEALTH_CHECKS: Dict[str, Callable[[], tuple]] = {
+    "ollama": lambda: ("GET", f"{os.environ.get('OLLAMA_HOST', 'http://localhost:11434').rstrip('/')}/api/tags"),
+    "groq": lambda: ("HEAD", "https://api.groq.com"),
+    "huggingface": lambda: ("HEAD", "https://router.huggingface.co"),
+    "google": lambda: ("HEAD", "https://generativelanguage.googleapis.com"),
+}
+
+# Generation cost assumed for providers without history, in seconds per 1k prompt tokens
+PRIOR_SECONDS_PER_KTOKEN: Dict[str, float] = {
+    "ollama": 2.0,
+    "groq": 0.3,
+    "huggingface": 1.0,
+    "google": 0.5,
+}
+
+
+def is_configured(interface: str) -> bool:
+    """Whether the credentials needed by ``interface`` are set."""
+    env_vars = API_KEY_ENV.get(interface, [])
+    return not env_vars or any(os.environ.get(env_var) for env_var in env_vars)
+
+
+def probe_provider(interface: str) -> Optional[float]:
+    """
+    Round trip time (in seconds) of the interface health check, None if unreachable.
+    """
+    method, url = HEALTH_CHECKS[interface]()
+    start = time.monotonic()
+    try:
+        requests.request(method, url, timeout=PROBE_TIMEOUT)
+    except requests.RequestException:
+        return None
+    return time.monotonic() - start
+
+
+def probe_providers(interfaces: List[str]) -> Dict[str, Optional[float]]:
+    """Probe the interfaces concurrently."""
+    with ThreadPoolExecutor(max_workers=max(len(interfaces), 1)) as executor:
+        return dict(zip(interfaces, executor.map(probe_provider, interfaces)))
+
+
+@dataclass
+class RouteCandidate:
+    interface: str
+    model: str
+    factory: Callable[[], BaseAIClient]
+
+    @property
+    def key(self) -> str:
+        return f"{self.interface}:{self.model}"
+
+
+class ProviderRouter(BaseAIClient):
+    """
+    Send each request to the candidate with the lowest expected time-to-answer
+    for the prompt size, based on the recorded latency history. Candidates with
+    no history yet are estimated from a health probe plus a per-provider prior.
+    When the chosen provider fails, the next best one is used.
+    """
+
+    def __init__(self,
+                 candidates: List[RouteCandidate],
+                 latency_tracker: LatencyTracker,
+                 probe: Callable[[List[str]], Dict[str, Optional[float]]] = probe_providers):
+
+        self.candidates = candidates
+        self.latency_tracker = latency_tracker
+        self.probe = probe
+        self.probes: Dict[str, Optional[float]] = {}
+        self.clients: Dict[str, BaseAIClient] = {}
+        self.model = "auto"
+        self.timeout = None
+        self.last_choice: Optional[str] = None
+
+    def get_client(self, candidate: RouteCandidate) -> BaseAIClient:
+        if candidate.key not in self.clients:
+            self.clients[candidate.key] = candidate.factory()
+        return self.clients[candidate.key]
+
+    def estimate(self, candidate: RouteCandidate, prompt_tokens: int) -> Optional[float]:
+        """Expected seconds to answer, None when the provider is unreachable."""
+        expected = self.latency_tracker.expected_latency(candidate.key, prompt_tokens)
+        if expected is not None:
+            return expected
+
+        round_trip = self.probes.get(candidate.interface)
+        if round_trip is None:
+            return None
+        return round_trip + PRIOR_SECONDS_PER_KTOKEN.get(candidate.interface, 1.0) * prompt_tokens / 1000
+
+    def rank(self, prompt_tokens: int) -> List[RouteCandidate]:
+        """Reachable candidates, fastest expected first."""
+        unprobed = sorted({c.interface for c in self.candidates
+                           if not self.latency_tracker.has_history(c.key) and c.interface not in self.probes})
+        if unprobed:
+            self.probes.update(self.probe(unprobed))
+
+        estimates = [(self.estimate(candidate, prompt_tokens), index, candidate)
+                     for index, candidate in enumerate(self.candidates)]
+        return [candidate for expected, _, candidate in sorted(e for e in estimates if e[0] is not None)]
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self._route(user_message, lambda client: client.get_chat_completion(user_message=user_message))
+
+    def get_valid_chat_completion(self,
+                                  user_message: List[Dict[str, str]],
+                                  validator: Callable[[str], object]) -> str:
+        return self._route(user_message, lambda client: client.get_valid_chat_completion(user_message, validator))
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        # Native, so that a hedged race can cancel it while a provider is still answering
+        return await self._aroute(user_message, lambda client: client.aget_chat_completion(user_message))
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        candidate = self._ranked_or_raise(approximate_prompt_tokens(user_message))[0]
+        yield from self.get_client(candidate).stream_chat_completion(user_message)
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        candidate = self._ranked_or_raise(approximate_prompt_tokens(user_message))[0]
+        async for chunk in self.get_client(candidate).astream_chat_completion(user_message):
+            yield chunk
+
+    def _ranked_or_raise(self, prompt_tokens: int) -> List[RouteCandidate]:
+        ranked = self.rank(prompt_tokens)
+        if not ranked:
+            interfaces = ", ".join(c.interface for c in self.candidates) or "none configured"
+            raise Exception(f"No AI interface is reachable ({interfaces})")
+        return ranked
+
+    def _route(self, user_message: List[Dict[str, str]], call: Callable[[BaseAIClient], T]) -> T:
+        validate_messages(messages=user_message)
+
+        prompt_tokens = approximate_prompt_tokens(user_message)
+        errors: List[str] = []
+
+        for candidate in self._ranked_or_raise(prompt_tokens):
+            self._announce(candidate)
+            start = time.monotonic()
+            try:
+                response = call(self.get_client(candidate))
+            except Exception as e:
+                self._record_failure(candidate, e, errors)
+                continue
+
+            self.latency_tracker.record(candidate.key, time.monotonic() - start, prompt_tokens)
+            return response
+
+        raise Exception(f"All routed providers failed: {'; '.join(errors)}")
+
+    async def _aroute(self, user_message: List[Dict[str, str]], call: Callable[[BaseAIClient], Awaitable[T]]) -> T:
+        prompt_tokens = approximate_prompt_tokens(user_message)
+        errors: List[str] = []
+
+        for candidate in self._ranked_or_raise(prompt_tokens):
+            self._announce(candidate)
+            start = time.monotonic()
+            try:
+                response = await call(self.get_client(candidate))
+            except Exception as e:
+                self._record_failure(candidate, e, errors)
+                continue
+
+            self.latency_tracker.record(candidate.key, time.monotonic() - start, prompt_tokens)
+            return response
+
+        raise Exception(f"All routed providers failed: {'; '.join(errors)}")
+
+    def _announce(self, candidate: RouteCandidate) -> None:
+        if candidate.key != self.last_choice:
+            print(f"{Fore.CYAN}Routing to {candidate.interface} ({candidate.model}){Style.RESET_ALL}")
+            self.last_choice = candidate.key
+
+    def _record_failure(self, candidate: RouteCandidate, error: Exception, errors: List[str]) -> None:
+        # A ValueError is a configuration error or an unparsable answer, not a provider slowdown
+        if not isinstance(error, ValueError):
+            self.latency_tracker.record_failure(candidate.key)
+        errors.append(f"{candidate.interface}: {error}")
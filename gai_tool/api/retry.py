@@ -0,0 +1,95 @@
+"""
+Retry helpers shared by the clients talking to remote APIs.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter for the given (0 based) retry attempt.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def iter_error_chain(error: BaseException) -> Iterator[BaseException]:
+    """
+    Iterate over an exception and the exceptions it was raised from, since some
+    clients wrap the provider error in a generic one.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """
+    Get the HTTP status code of a provider error, if any.
+    """
+    for err in iter_error_chain(error):
+        for value in (getattr(err, "status_code", None),
+                      getattr(getattr(err, "response", None), "status_code", None),
+                      getattr(err, "code", None)):
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Get the number of seconds the provider asked us to wait before retrying.
+    """
+    for err in iter_error_chain(error):
+        headers = getattr(getattr(err, "response", None), "headers", None)
+        if headers is not None:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            if retry_after is not None:
+                return retry_after
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed request may succeed if sent again.
+
+    Configuration errors (``ValueError``, e.g. a missing API key) and client
+    errors such as 400 or 401 are not retried, network errors and rate limits are.
+    """
+    if isinstance(error, ValueError):
+        return False
+
+    status_code = get_status_code(error)
+    return status_code is None or status_code in RETRYABLE_STATUS_CODES
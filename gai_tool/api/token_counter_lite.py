@@ -1,90 +1,218 @@
-from gai_tool.src.utils import get_api_huggingface_key
+from gai_tool.src.utils import get_api_huggingface_key, get_cache_dir
 from tokenizers import Tokenizer
-from huggingface_hub import hf_hub_download
+from huggingface_hub import hf_hub_download, try_to_load_from_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Optional
+from collections import OrderedDict
+import hashlib
 import logging
 import os
+import shutil
+import threading
+import time
 
 # Set logging level to reduce noise
 logging.getLogger("tokenizers").setLevel(logging.ERROR)
 
+TOKENIZER_FILE = "tokenizer.json"
+TOKENIZERS_FOLDER = "tokenizers"
+# Age after which a stored tokenizer is refreshed in the background
+TOKENIZER_REFRESH_AFTER = 7 * 24 * 60 * 60
+
+# Number of distinct message values whose token count is memoized
+TOKEN_COUNT_CACHE_SIZE = 256
+
+# Tokenizers are loaded off the main thread so that parsing them overlaps with git work
+_tokenizer_loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gai-tokenizer")
+
+
+def is_hf_offline() -> bool:
+    return os.environ.get("HF_HUB_OFFLINE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class TokenizerStore:
+    """
+    Offline-first local store of ``tokenizer.json`` files keyed by model id and revision.
+
+    A stored tokenizer is loaded straight from disk, without the revalidation
+    round trip ``hf_hub_download`` does, and refreshed on a background thread
+    once it is older than ``refresh_after`` seconds. The network is only waited
+    for the very first time a model is used, and never when ``HF_HUB_OFFLINE`` is set.
+    """
+
+    def __init__(self, root: Optional[Path] = None, refresh_after: float = TOKENIZER_REFRESH_AFTER):
+        self.root = root or get_cache_dir() / TOKENIZERS_FOLDER
+        self.refresh_after = refresh_after
+
+    def path_for(self, model: str, revision: str) -> Path:
+        return self.root / model.replace("/", "--") / revision / TOKENIZER_FILE
+
+    def get_path(self, model: str, revision: str = "main") -> Path:
+        """Local path of the model's tokenizer.json, downloading it only if there is no local copy."""
+        stored_path = self.path_for(model, revision)
+
+        if stored_path.exists():
+            is_stale = time.time() - stored_path.stat().st_mtime > self.refresh_after
+            if is_stale and not is_hf_offline():
+                self.refresh_in_background(model, revision)
+            return stored_path
+
+        # Reuse a copy from the Hugging Face cache without revalidating it
+        cached_path = try_to_load_from_cache(repo_id=model, filename=TOKENIZER_FILE, revision=revision)
+        if isinstance(cached_path, str):
+            return self._store(cached_path, stored_path)
+
+        if is_hf_offline():
+            raise ValueError(f"Tokenizer for {model} is not available offline (HF_HUB_OFFLINE is set)")
+
+        return self._store(self.download(model, revision), stored_path)
+
+    def refresh_in_background(self, model: str, revision: str = "main") -> threading.Thread:
+        def refresh():
+            try:
+                self._store(self.download(model, revision), self.path_for(model, revision))
+            except Exception:
+                # Keep using the stored copy, the next run will try again
+                pass
+
+        thread = threading.Thread(target=refresh, daemon=True)
+        thread.start()
+        return thread
+
+    def download(self, model: str, revision: str = "main") -> str:
+        """Download tokenizer.json from the HuggingFace Hub."""
+        try:
+            # Attempt to load token from environment variable
+            hf_token = get_api_huggingface_key()
+
+            return hf_hub_download(
+                repo_id=model,
+                filename=TOKENIZER_FILE,
+                revision=revision,
+                token=hf_token if hf_token else None
+            )
+
+        except Exception as e:
+            # Fallback: try without authentication
+            try:
+                return hf_hub_download(
+                    repo_id=model,
+                    filename=TOKENIZER_FILE,
+                    revision=revision
+                )
+            except Exception as fallback_e:
+                raise ValueError(
+                    f"Failed to load tokenizer for {model}: {str(e)} | Fallback error: {str(fallback_e)}")
+
+    def _store(self, source_path: str, stored_path: Path) -> Path:
+        """Copy the tokenizer into the store atomically, falling back to the source path."""
+        try:
+            stored_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = stored_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, stored_path)
+            return stored_path
+        except OSError:
+            return Path(source_path)
+
 
 class TokenCounterLite:
     """
     Lightweight token counter using the standalone tokenizers library.
     This avoids the PyTorch/TensorFlow warning from transformers.
+    The tokenizer is loaded in the background as soon as the counter is created.
     """
 
-    def __init__(self, model: str):
+    def __init__(self, model: str, revision: str = "main", store: Optional[TokenizerStore] = None):
         """
         Initialize token counter with specified model using tokenizers library.
 
         Parameters:
         - model: The name or path of the model.
+        - revision: The model revision the tokenizer belongs to.
+        - store: Local tokenizer store, defaults to the one in the cache folder.
         """
         self.tokens_per_message = 3  # Every message follows {role/name, content}
         self.model = model
-        self.tokenizer = self._load_tokenizer()
+        self.revision = revision
+        self.store = store or TokenizerStore()
+        self.cache_size = TOKEN_COUNT_CACHE_SIZE
+        self._token_counts: OrderedDict[str, int] = OrderedDict()
+        self._token_counts_lock = threading.Lock()
+        self._tokenizer_future: Future = _tokenizer_loader.submit(self._load_tokenizer)
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        """The tokenizer, blocking only if it is still being loaded in the background."""
+        return self._tokenizer_future.result()
 
     def _load_tokenizer(self) -> Tokenizer:
-        """Load tokenizer from HuggingFace Hub."""
+        """Load tokenizer from the local store, downloading it from HuggingFace Hub on first use."""
+        tokenizer_path = self.store.get_path(self.model, self.revision)
+
         try:
-            # Attempt to load token from environment variable
-            hf_token = get_api_huggingface_key()
+            return Tokenizer.from_file(str(tokenizer_path))
+        except Exception as e:
+            raise ValueError(f"Failed to load tokenizer for {self.model}: {str(e)}")
 
-            # Download tokenizer.json file
-            tokenizer_path = hf_hub_download(
-                repo_id=self.model,
-                filename="tokenizer.json",
-                token=hf_token if hf_token else None
-            )
+    def _count_values(self, values: List[str]) -> List[int]:
+        """
+        Count tokens of each value, encoding the ones not seen before in a single batch.
+        Counts are memoized by content hash, so the system prompt and an unchanged
+        diff are not encoded again on every retry.
+        """
+        keys = [hashlib.sha1(value.encode("utf-8")).hexdigest() for value in values]
 
-            # Load tokenizer from file
-            return Tokenizer.from_file(tokenizer_path)
+        with self._token_counts_lock:
+            known = {key: self._token_counts[key] for key in keys if key in self._token_counts}
 
-        except Exception as e:
-            # Fallback: try without authentication
-            try:
-                tokenizer_path = hf_hub_download(
-                    repo_id=self.model,
-                    filename="tokenizer.json"
-                )
-                return Tokenizer.from_file(tokenizer_path)
-            except Exception as fallback_e:
-                raise ValueError(
-                    f"Failed to load tokenizer for {self.model}: {str(e)} | Fallback error: {str(fallback_e)}")
+        missing = {key: value for key, value in zip(keys, values) if key not in known}
+        if missing:
+            encodings = self.tokenizer.encode_batch(list(missing.values()), add_special_tokens=False)
+            known.update((key, len(encoding.ids)) for key, encoding in zip(missing, encodings))
+
+        with self._token_counts_lock:
+            for key in keys:
+                self._token_counts[key] = known[key]
+                self._token_counts.move_to_end(key)
+
+            while len(self._token_counts) > self.cache_size:
+                self._token_counts.popitem(last=False)
+
+        return [known[key] for key in keys]
 
     def count_message_tokens(self, message: Dict[str, str]) -> int:
         """
         Count tokens in a single message.
         """
-        num_tokens = self.tokens_per_message
-        for _, value in message.items():
-            value_str = str(value)
-            encoding = self.tokenizer.encode(value_str, add_special_tokens=False)
-            num_tokens += len(encoding.ids)
-        return num_tokens
+        values = [str(value) for value in message.values()]
+        return self.tokens_per_message + sum(self._count_values(values))
 
     def count_tokens(self, messages: List[Dict[str, str]]) -> int:
         """
         Count total tokens in a list of messages.
         """
         try:
-            num_tokens = 0
-            for message in messages:
-                num_tokens += self.count_message_tokens(message)
+            values = [str(value) for message in messages for value in message.values()]
+            num_tokens = self.tokens_per_message * len(messages) + sum(self._count_values(values))
             # Add 3 tokens for the assistant's reply format (as per OpenAI API)
             num_tokens += 3
             return num_tokens
         except Exception as e:
             raise ValueError(f"Error counting tokens: {str(e)}")
 
-    def adjust_max_tokens(self, user_message: List[Dict[str, str]], max_tokens: int) -> int:
+    def adjust_max_tokens(self,
+                          user_message: List[Dict[str, str]],
+                          max_tokens: int,
+                          message_tokens: Optional[int] = None) -> int:
         """
         Calculate remaining tokens based on max_tokens and message tokens.
+        Pass ``message_tokens`` when the messages were already counted.
         """
         try:
-            message_tokens = self.count_tokens(user_message)
+            if message_tokens is None:
+                message_tokens = self.count_tokens(user_message)
             remaining_tokens = max_tokens - message_tokens
             if remaining_tokens < 0:
                 raise ValueError(f"Message tokens ({message_tokens}) exceed max tokens ({max_tokens})")
@@ -0,0 +1,135 @@
+"""
+Zero-dependency token estimator for models without a local tokenizer.
+
+The estimate is a linear combination of cheap character-class statistics of
+the UTF-8 bytes (word runs, letters, digits, punctuation, line breaks,
+indentation and non-ASCII bytes). Per-model-family coefficients are fitted
+with ``calibrate`` against the real tokenizers and shipped in
+``token_estimator.json``. Counting only uses ``bytes.translate`` and
+``bytes.count``, so megabyte-sized diffs are estimated in milliseconds.
+"""
+
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+COEFFICIENTS_FILE = Path(__file__).with_name("token_estimator.json")
+DEFAULT_FAMILY = "default"
+
+FEATURES = ["word_runs", "letters", "digits", "punctuation", "newlines", "indents", "non_ascii_bytes"]
+
+_NON_ASCII = bytes(range(128, 256))
+_LETTERS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_DIGITS = b"0123456789"
+_BLANKS = b" \t\r\n"
+# Map every byte to its class so that runs can be counted with ``bytes.count``
+_WORD_CLASSES = bytes(ord("a") if chr(byte).isascii() and chr(byte).isalpha() else ord(" ")
+                      for byte in range(256))
+_LINE_CLASSES = bytes(byte if byte in b"\n " else ord(" ") if byte == ord("\t") else ord("x")
+                      for byte in range(256))
+
+
+@lru_cache(maxsize=1)
+def load_families() -> Dict[str, Dict]:
+    """Model families with the substrings matching their model names and their coefficients."""
+    with COEFFICIENTS_FILE.open("r") as f:
+        return json.load(f)["families"]
+
+
+def coefficients_for(model: Optional[str]) -> Dict[str, float]:
+    """Coefficients of the first family matching ``model``, the default ones otherwise."""
+    families = load_families()
+    name = (model or "").lower()
+    for family in families.values():
+        if any(pattern in name for pattern in family.get("match", [])):
+            return family["coefficients"]
+    return families[DEFAULT_FAMILY]["coefficients"]
+
+
+def count_runs(classes: bytes, member: bytes, other: bytes) -> int:
+    """Number of runs of ``member`` bytes in ``classes``."""
+    return classes.count(other + member) + classes.startswith(member)
+
+
+def text_features(text: str) -> Dict[str, int]:
+    """Character-class statistics of ``text`` used by the estimate."""
+    data = text.encode("utf-8", errors="replace")
+    ascii_data = data.translate(None, _NON_ASCII)
+
+    letters = len(ascii_data) - len(ascii_data.translate(None, _LETTERS))
+    digits = len(ascii_data) - len(ascii_data.translate(None, _DIGITS))
+    blanks = len(ascii_data) - len(ascii_data.translate(None, _BLANKS))
+
+    return {
+        "word_runs": count_runs(ascii_data.translate(_WORD_CLASSES), b"a", b" "),
+        "letters": letters,
+        "digits": digits,
+        "punctuation": len(ascii_data) - letters - digits - blanks,
+        "newlines": ascii_data.count(b"\n"),
+        "indents": ascii_data.translate(_LINE_CLASSES).count(b"\n "),
+        "non_ascii_bytes": len(data) - len(ascii_data),
+    }
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimated number of tokens of ``text`` for ``model``."""
+    if not text:
+        return 0
+
+    coefficients = coefficients_for(model)
+    features = text_features(text)
+    return math.ceil(sum(coefficients.get(name, 0.0) * value for name, value in features.items()))
+
+
+def calibrate(texts: Iterable[str], count_tokens: Callable[[str], int]) -> Dict[str, float]:
+    """
+    Fit the coefficients (least squares, clamped at zero) so that the estimate
+    matches ``count_tokens``, typically the ``encode`` of a real tokenizer, on
+    a sample of representative texts (diffs, commit logs, prompts).
+    The relative error is minimized, so the largest texts do not outweigh the others.
+    The result goes in ``token_estimator.json`` under the model family.
+    """
+    rows: List[List[float]] = []
+    targets: List[float] = []
+    for text in texts:
+        tokens = count_tokens(text)
+        if tokens <= 0:
+            continue
+        features = text_features(text)
+        rows.append([features[name] / tokens for name in FEATURES])
+        targets.append(1.0)
+
+    size = len(FEATURES)
+    # Normal equations with a small ridge term, so unused features stay at zero
+    matrix = [[sum(row[i] * row[j] for row in rows) + (1e-6 if i == j else 0.0) for j in range(size)]
+              for i in range(size)]
+    vector = [sum(row[i] * target for row, target in zip(rows, targets)) for i in range(size)]
+
+    solution = _solve(matrix, vector)
+    return {name: round(max(value, 0.0), 4) for name, value in zip(FEATURES, solution)}
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Gaussian elimination with partial pivoting."""
+    size = len(vector)
+    augmented = [row[:] + [value] for row, value in zip(matrix, vector)]
+
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(augmented[row][column]))
+        augmented[column], augmented[pivot] = augmented[pivot], augmented[column]
+        if augmented[column][column] == 0:
+            continue
+        for row in range(column + 1, size):
+            factor = augmented[row][column] / augmented[column][column]
+            for k in range(column, size + 1):
+                augmented[row][k] -= factor * augmented[column][k]
+
+    solution = [0.0] * size
+    for row in reversed(range(size)):
+        if augmented[row][row] == 0:
+            continue
+        known = sum(augmented[row][k] * solution[k] for k in range(row + 1, size))
+        solution[row] = (augmented[row][size] - known) / augmented[row][row]
+    return solution
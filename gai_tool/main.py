@@ -1,10 +1,42 @@
 from gai_tool.src import DisplayChoices, Commits, Prompts, Merge_requests, ConfigManager, get_app_name, get_attr_or_default, get_current_branch, push_changes, get_package_version, attr_is_defined, GROQ_MODELS, HUGGING_FACE_MODELS, DEFAULT_CONFIG, OLLAMA_MODELS, GEMINI_MODELS, get_ticket_identifier
-from gai_tool.api import GroqClient, Gitlab_api, Github_api, HuggingClient, OllamaClient, GeminiClient
+from gai_tool.api import (
+    GroqClient, Gitlab_api, Github_api, HuggingClient, OllamaClient, GeminiClient, BaseAIClient, HedgedClient,
+    LatencyTracker, FallbackClient, CircuitBreaker, ProviderRouter, RouteCandidate, ModelCascade
+)
+from gai_tool.api.provider_router import is_configured
+from gai_tool.api.token_estimator import estimate_tokens
+from gai_tool.src.myconfig import Models
+from gai_tool.src.commits import DEFAULT_FETCH_MAX_AGE
+from gai_tool.src.commit_summaries import CommitSummaryCache, format_summaries, summarize_commits
+from gai_tool.src.branch_sync import DEFAULT_BULK_WORKERS, list_local_branches, select_branches, sync_branches
+from gai_tool.src.context_assembler import assemble_context
+from gai_tool.src.watermark import add_watermark, merge_delta, read_watermark
 from gai_tool.src.utils import create_system_message, create_user_message
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 import argparse
 import logging
 
 
+AUTO_INTERFACES = ["huggingface", "groq", "google", "ollama"]
+PLATFORMS = ["github", "gitlab"]
+# Tokens of commits, diffstat and hunks given to the merge request prompts
+DEFAULT_CONTEXT_BUDGET = 6000
+# Tokens of staged diff above which Python files are described by their structural changes
+DEFAULT_COMMIT_CONTEXT_BUDGET = 8000
+
+
+class PlatformRequests(NamedTuple):
+    """
+    Merge request operations of a git platform, GitHub pull requests or GitLab merge requests.
+    """
+    name: str
+    find: Callable[[str], Any]
+    list_open: Callable[[], Dict[Tuple[str, str], Any]]
+    upsert: Callable[[str, str, str, str, Any], None]
+    get_text: Callable[[Any], Tuple[str, str]]
+
+
 # Suppress transformers logging as we don't need it
 logging.getLogger("transformers").setLevel(logging.ERROR)
 
@@ -19,7 +51,7 @@ class Main:
         self.ConfigManager = ConfigManager(get_app_name())
         self.load_config()
 
-        self.Commits = Commits()
+        self.Commits = Commits(fetch_max_age=self.fetch_max_age)
         self.Prompt = Prompts()
         self.DisplayChoices = DisplayChoices()
 
@@ -29,12 +61,19 @@ class Main:
             return
 
         self.ai_client = self.init_ai_client()
+        # Used for prompts whose answer must parse as a list of choices
+        self.choices_ai_client = partial(
+            self.client.get_valid_chat_completion,
+            validator=self.DisplayChoices.parse_response)
 
         # Main commands
         if self.args.command == 'merge':
             if self.args.push:
                 push_changes(self.remote_repo)
-            self.do_merge_request()
+            if self.args.all_branches or self.args.branches:
+                self.do_bulk_merge()
+            else:
+                self.do_merge_request()
         elif self.args.command == 'commit':
             self.do_commit()
         elif self.args.command == 'init':
@@ -52,6 +91,35 @@ class Main:
         # API interface
         self.interface = get_attr_or_default(self.args, 'interface', self.ConfigManager.get_config('interface'))
 
+        # Hedged requests
+        self.hedge_interface = get_attr_or_default(
+            self.args, 'hedge', self.ConfigManager.get_config('hedge_interface'))
+        self.hedge_delay = self.ConfigManager.get_config('hedge_delay', 'p90')
+
+        # Providers to fall back to when the interface fails, e.g. [groq, google, ollama]
+        self.fallback_chain = self.ConfigManager.get_config('fallback_chain', [])
+
+        # Start with the smallest model fitting the prompt, escalate on unusable answers
+        self.cascade = get_attr_or_default(self.args, 'cascade', self.ConfigManager.get_config('cascade', False))
+
+        # Describe merge requests from a summary of each commit's diff, not only the subjects
+        self.summarize_commits = get_attr_or_default(
+            self.args, 'summarize_commits', self.ConfigManager.get_config('summarize_commits', False))
+
+        # Token budget of the merge request context, 0 only sends the commit subjects
+        self.context_budget = self.ConfigManager.get_config('context_budget', DEFAULT_CONTEXT_BUDGET)
+        # Token budget of the staged diff of commit messages, 0 always sends the raw hunks
+        self.commit_context_budget = self.ConfigManager.get_config(
+            'commit_context_budget', DEFAULT_COMMIT_CONTEXT_BUDGET)
+
+        # Skip fetching the target branch when it was fetched less than this many seconds ago
+        self.fetch_max_age = self.ConfigManager.get_config('fetch_max_age', DEFAULT_FETCH_MAX_AGE)
+        # Fetch while the merge request is looked up on the platform
+        self.background_fetch = self.ConfigManager.get_config('background_fetch', False)
+
+        # Branches handled concurrently by merge --all-branches/--branches
+        self.bulk_workers = self.ConfigManager.get_config('bulk_workers', DEFAULT_BULK_WORKERS)
+
     def parse_arguments(self):
         parser = argparse.ArgumentParser(description="Git-AI (gai): Automate your git messages")
 
@@ -79,6 +147,15 @@ class Main:
 
         merge_parser.add_argument('--target-branch', '-tb', type=str,
                                   help='Specify the target branch for merge requests')
+
+        merge_parser.add_argument('--all-branches', action='store_true',
+                                  help='Create or update a merge request for every local branch ahead of the target')
+
+        merge_parser.add_argument('--branches', nargs='+', metavar='BRANCH',
+                                  help='Create or update merge requests for these branches (names or globs)')
+
+        merge_parser.add_argument('--summarize-commits', action='store_true', default=None,
+                                  help='Summarize the diff of each commit (cached) to describe the merge request')
         # Commit
         commit_parser = subparsers.add_parser('commit', help='Execute an automated commit')
 
@@ -98,54 +175,153 @@ class Main:
             #                help='Specify the target branch for merge requests')
             p.add_argument('--interface', '-i', type=str,
                            help='Specify the client api to use (e.g., groq, huggingface)')
+            p.add_argument('--hedge', type=str,
+                           help='Also send slow requests to this client api and keep the first valid answer')
+            p.add_argument('--cascade', action='store_true', default=None,
+                           help='Use the smallest model fitting the prompt, escalate to bigger ones when needed')
 
         return parser.parse_args()
 
     def init_ai_client(self):
         print(f"Using {self.interface} as ai interface")
-        match self.interface:
+        # Shared by the router and the hedged client, each saving its own view would overwrite the other
+        self.latency_tracker = LatencyTracker()
+        client = self.build_provider_chain()
+
+        if self.hedge_interface and self.hedge_interface != self.interface:
+            print(f"Hedging requests with {self.hedge_interface}")
+            backup = self.build_client(self.hedge_interface)
+
+            client = HedgedClient(
+                primary=client,
+                backup=backup,
+                primary_name=f"{self.interface}:{client.model}",
+                backup_name=f"{self.hedge_interface}:{backup.model}",
+                hedge_delay=self.hedge_delay,
+                latency_tracker=self.latency_tracker
+            )
+
+        # Set as default if not already set
+        if self.ConfigManager.get_config('interface') != self.interface:
+            self.ConfigManager.update_config('interface', self.interface)
+
+        self.client = client
+        return client.get_chat_completion
+
+    def build_provider_chain(self) -> BaseAIClient:
+        if self.interface == "auto":
+            return self.build_router()
+
+        chain = [self.interface] + [i for i in self.fallback_chain if i != self.interface]
+        if len(chain) == 1:
+            return self.build_client(self.interface)
+
+        print(f"Falling back to: {' -> '.join(chain[1:])}")
+        return FallbackClient(
+            providers=[(interface, partial(self.build_client, interface)) for interface in chain],
+            circuit_breaker=CircuitBreaker()
+        )
+
+    def build_router(self) -> ProviderRouter:
+        # Route between the fallback chain if configured, otherwise every interface with credentials
+        interfaces = self.fallback_chain or AUTO_INTERFACES
+
+        return ProviderRouter(
+            candidates=[
+                RouteCandidate(
+                    interface=interface,
+                    model=self.get_model(interface).model_name,
+                    factory=partial(self.build_client, interface))
+                for interface in interfaces if is_configured(interface)
+            ],
+            latency_tracker=self.latency_tracker
+        )
+
+    def get_models(self, interface: str) -> List[Models]:
+        match interface:
             case "huggingface":
-                model = HUGGING_FACE_MODELS[0]
+                return HUGGING_FACE_MODELS
+            case "groq":
+                return GROQ_MODELS
+            case "google":
+                return GEMINI_MODELS
+            # Default to ollama
+            case _:
+                return OLLAMA_MODELS
+
+    def get_model(self, interface: str) -> Models:
+        match interface:
+            case "huggingface" | "groq" | "google":
+                return self.get_models(interface)[0]
+            # Default to ollama
+            case _:
+                return OLLAMA_MODELS[4]
+
+    def build_client(self, interface: str) -> BaseAIClient:
+        models = self.get_models(interface)
+        if self.cascade and len(models) > 1:
+            return ModelCascade(
+                models=models,
+                factory=partial(self.build_model_client, interface)
+            )
+
+        return self.build_model_client(interface, self.get_model(interface))
 
+    def build_model_client(self, interface: str, model: Models) -> BaseAIClient:
+        match interface:
+            case "huggingface":
                 client = HuggingClient(
                     model=model.model_name,
                     temperature=self.temperature,
-                    max_tokens=model.max_tokens
+                    max_tokens=model.max_tokens,
+                    context_window=model.context_window
                 )
 
             case "groq":
-                model = GROQ_MODELS[0]
-
                 client = GroqClient(
                     model=model.model_name,
                     temperature=self.temperature,
-                    max_tokens=model.max_tokens
+                    max_tokens=model.max_tokens,
+                    context_window=model.context_window
                 )
 
             case "google":
-                model = GEMINI_MODELS[0]
-
                 client = GeminiClient(
                     model=model.model_name,
                     temperature=self.temperature,
-                    max_output_tokens=model.max_tokens
+                    max_output_tokens=model.max_tokens,
+                    context_window=model.context_window
                 )
 
             # Default to ollama
             case _:
-                model = OLLAMA_MODELS[4]
-
                 client = OllamaClient(
                     model=model.model_name,
                     temperature=self.temperature,
-                    max_tokens=model.max_tokens
+                    max_tokens=model.max_tokens,
+                    context_window=model.context_window
                 )
 
-        # Set as default if not already set
-        if self.ConfigManager.get_config('interface') != self.interface:
-            self.ConfigManager.update_config('interface', self.interface)
-
-        return client.get_chat_completion
+        return client
+
+    def get_platform_requests(self, platform: str) -> PlatformRequests:
+        # Lazy initialization of the API clients, only the platform of the remote is needed
+        if platform == "gitlab":
+            client = Gitlab_api()
+            return PlatformRequests(
+                name="GitLab merge request",
+                find=client.get_existing_merge_request,
+                list_open=client.get_open_merge_requests_by_branch,
+                upsert=client.upsert_merge_request,
+                get_text=client.get_title_and_description)
+
+        client = Github_api()
+        return PlatformRequests(
+            name="GitHub pull request",
+            find=client.get_existing_pr,
+            list_open=client.get_open_prs_by_branch,
+            upsert=client.upsert_pull_request,
+            get_text=client.get_title_and_body)
 
     def do_merge_request(self):
         mr = Merge_requests().get_instance()
@@ -155,24 +331,58 @@ class Main:
         system_prompt = self.Prompt.build_merge_title_system_prompt()
         system_description_prompt = self.Prompt.build_merge_description_system_prompt()
 
+        if platform not in PLATFORMS:
+            raise ValueError(
+                "Platform not supported. Only github and gitlab are supported.")
+
+        # The fetch may run while the merge request is looked up
+        try:
+            fetch = self.Commits.fetch(self.remote_repo, self.target_branch, background=self.background_fetch)
+        except Exception as e:
+            print(f"Error fetching commits: {e}")
+            return
+
+        try:
+            requests = self.get_platform_requests(platform)
+            existing = requests.find(current_branch)
+        except Exception as e:
+            self.Commits.cancel_fetch(fetch)
+            print(f"Failed to look up the merge request: {e}")
+            print("Please check your GitHub/GitLab token and repository access.")
+            return
+
         # Get description
         try:
+            self.Commits.wait_for_fetch(fetch)
             commits = self.Commits.get_commits(
                 remote_repo=self.remote_repo,
                 target_branch=self.target_branch,
-                source_branch=current_branch)
+                source_branch=current_branch,
+                fetch=False)
         except Exception as e:
             print(f"Error fetching commits: {e}")
             return
 
-        all_commits = self.Commits.format_commits(commits)
+        # Only describe the commits pushed since the last run
+        try:
+            if self.update_description(requests, existing, current_branch) is not None:
+                return
+        except Exception as e:
+            print(f"Failed to update {requests.name}: {e}")
+            return
+
+        try:
+            all_commits = self.describe_commits(commits, current_branch)
+        except Exception as e:
+            print(f"Error summarizing commits: {e}")
+            return
 
         # Get title
         try:
             selected_title = self.DisplayChoices.render_choices_with_try_again(
                 user_msg=all_commits,
                 sys_prompt=system_prompt,
-                ai_client=self.ai_client)
+                ai_client=self.choices_ai_client)
 
             # Get description
             mr_description = self.ai_client(
@@ -194,41 +404,173 @@ class Main:
         print(f"From {current_branch} to {self.target_branch}")
         print(f"Title: {selected_title}")
 
-        match platform:
-            case "gitlab":
-                # Lazy initialization of GitLab API client
-                try:
-                    gitlab_client = Gitlab_api()
-                    gitlab_client.create_merge_request(
-                        title=selected_title,
-                        description=mr_description,
-                        target_branch=self.target_branch)
-                except Exception as e:
-                    print(f"Failed to create GitLab merge request: {e}")
-                    print("Please check your GITLAB_PRIVATE_TOKEN and project access.")
-                    return
-
-            case "github":
-                # Lazy initialization of GitHub API client
-                try:
-                    github_client = Github_api()
-                    github_client.create_pull_request(
-                        title=selected_title,
-                        body=mr_description,
-                        target_branch=self.target_branch)
-                except Exception as e:
-                    print(f"Failed to create GitHub pull request: {e}")
-                    print("Please check your GitHub token and repository access.")
-                    return
-            case _:
-                raise ValueError(
-                    "Platform not supported. Only github and gitlab are supported.")
+        try:
+            requests.upsert(
+                selected_title,
+                add_watermark(mr_description, self.Commits.get_head_sha(current_branch)),
+                current_branch,
+                self.target_branch,
+                existing)
+        except Exception as e:
+            print(f"Failed to create {requests.name}: {e}")
+            print("Please check your GitHub/GitLab token and repository access.")
+
+    def update_description(self, requests: PlatformRequests, existing, source_branch: str) -> Optional[str]:
+        """
+        Append a description of the commits pushed since the existing merge
+        request was last described, keeping its title and description.
+        Returns the title, or None when the merge request has to be described
+        from scratch: it does not exist, has no watermark, or its branch was rewritten.
+        """
+        if existing is None:
+            return None
+
+        title, description = requests.get_text(existing)
+        last_head = read_watermark(description)
+        if last_head is None or not self.Commits.is_ancestor(last_head, source_branch):
+            return None
+
+        new_commits = self.Commits.get_commits_since(last_head, source_branch)
+        if not new_commits:
+            print(f"The {requests.name} of {source_branch} is up to date.")
+            return title
+
+        print(f"Describing the commits pushed to {source_branch} since {last_head[:7]}...")
+        delta = self.ai_client(
+            user_message=[
+                create_system_message(self.Prompt.build_merge_delta_system_prompt()),
+                create_user_message(self.describe_commits(new_commits, source_branch, since=last_head))
+            ]
+        )
+
+        requests.upsert(
+            title,
+            merge_delta(description, delta, self.Commits.get_head_sha(source_branch)),
+            source_branch,
+            self.target_branch,
+            existing)
+        return title
+
+    def describe_commits(self, commits: str, source_branch: str, since: Optional[str] = None) -> str:
+        """
+        Commits of source_branch (after the commit since, if given) as given to
+        the merge request prompts. By default the commit messages, diffstat and
+        best ranked hunks fitting context_budget tokens; with summarize_commits
+        a summary of each commit's diff, cached by SHA so that only new commits
+        are summarized.
+        """
+        if not self.summarize_commits:
+            if self.context_budget and since is None:
+                return assemble_context(
+                    messages=self.Commits.get_commit_messages(
+                        self.remote_repo, self.target_branch, source_branch),
+                    diffstat=self.Commits.get_branch_diff(
+                        self.remote_repo, self.target_branch, source_branch, stat=True),
+                    diff=self.Commits.get_branch_diff(
+                        self.remote_repo, self.target_branch, source_branch),
+                    budget=self.context_budget,
+                    count_tokens=partial(estimate_tokens, model=getattr(self.client, "model", None)))
+            return self.Commits.format_commits(commits)
+
+        summary_prompt = self.Prompt.build_commit_summary_system_prompt()
+        shas = self.Commits.get_commit_shas(
+            remote_repo=self.remote_repo,
+            target_branch=self.target_branch,
+            source_branch=source_branch,
+            since=since)
+
+        summaries = summarize_commits(
+            shas,
+            get_diff=self.Commits.get_commit_diff,
+            summarize=lambda diff: self.ai_client(
+                user_message=[
+                    create_system_message(summary_prompt),
+                    create_user_message(diff)
+                ]
+            ),
+            cache=CommitSummaryCache(summary_prompt))
+        return format_summaries(summaries)
+
+    def do_bulk_merge(self):
+        mr = Merge_requests().get_instance()
+        platform = mr.get_remote_platform()
+
+        if platform not in PLATFORMS:
+            raise ValueError(
+                "Platform not supported. Only github and gitlab are supported.")
+
+        try:
+            requests = self.get_platform_requests(platform)
+            # Fetch once, the log ranges of every branch are then computed locally
+            self.Commits.fetch(self.remote_repo, self.target_branch)
+            branches = select_branches(
+                list_local_branches(),
+                None if self.args.all_branches else self.args.branches,
+                self.target_branch)
+            # List the open merge requests once instead of looking them up per branch
+            open_requests = requests.list_open()
+        except Exception as e:
+            print(f"Failed to prepare the merge requests: {e}")
+            return
+
+        system_prompt = self.Prompt.build_merge_title_system_prompt()
+        system_description_prompt = self.Prompt.build_merge_description_system_prompt()
+
+        def sync_branch(branch: str):
+            commits = self.Commits.get_commits(
+                remote_repo=self.remote_repo,
+                target_branch=self.target_branch,
+                source_branch=branch,
+                fetch=False)
+            if not commits:
+                return None
+
+            # A request of the branch into another target is not the one to update
+            existing = open_requests.get((branch, self.target_branch))
+            title = self.update_description(requests, existing, branch)
+            if title is not None:
+                return title
+
+            all_commits = self.describe_commits(commits, branch)
+
+            # No one to pick a title interactively, keep the first suggestion
+            titles = self.client.get_valid_chat_completion(
+                user_message=[
+                    create_system_message(system_prompt),
+                    create_user_message(all_commits)
+                ],
+                validator=self.DisplayChoices.parse_response)
+            title = self.DisplayChoices.parse_response(titles)[0]
+
+            description = self.ai_client(
+                user_message=[
+                    create_system_message(system_description_prompt),
+                    create_user_message(all_commits)
+                ]
+            )
+
+            ticket_id = get_ticket_identifier(branch, self.ai_client)
+            if ticket_id:
+                title = f"{ticket_id} - {title}"
+
+            requests.upsert(
+                title,
+                add_watermark(description, self.Commits.get_head_sha(branch)),
+                branch,
+                self.target_branch,
+                existing)
+            return title
+
+        print(f"Syncing merge requests of {len(branches)} branches into {self.target_branch}...")
+        sync_branches(branches, sync_branch, max_workers=self.bulk_workers)
 
     def do_commit(self):
         if self.args.all:
             self.Commits.stage_changes()
 
-        git_diffs = self.Commits.get_diffs()
+        git_diffs = self.Commits.get_diffs(
+            token_budget=self.commit_context_budget,
+            count_tokens=partial(estimate_tokens, model=getattr(self.client, "model", None)))
 
         system_prompt = self.Prompt.build_commit_message_system_prompt()
 
@@ -236,7 +578,7 @@ class Main:
             selected_commit = self.DisplayChoices.render_choices_with_try_again(
                 user_msg=git_diffs,
                 sys_prompt=system_prompt,
-                ai_client=self.ai_client
+                ai_client=self.choices_ai_client
             )
         except Exception as e:
             print(f"Exiting... {e}")
@@ -0,0 +1,67 @@
+import fnmatch
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from colorama import Fore, Style
+
+DEFAULT_BULK_WORKERS = 4
+
+
+def list_local_branches() -> List[str]:
+    """
+    Get the names of the local branches.
+    """
+    result = subprocess.run(
+        ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return [branch for branch in result.stdout.splitlines() if branch]
+
+
+def select_branches(branches: List[str], patterns: Optional[List[str]], target_branch: str) -> List[str]:
+    """
+    Keep the branches matching any of the names or globs in patterns (every
+    branch when None), in their original order. The target branch is never
+    selected, a merge request into itself makes no sense.
+    """
+    return [
+        branch for branch in branches
+        if branch != target_branch
+        and (patterns is None or any(fnmatch.fnmatchcase(branch, pattern) for pattern in patterns))
+    ]
+
+
+def sync_branches(branches: List[str],
+                  sync_branch: Callable[[str], Optional[str]],
+                  max_workers: int = DEFAULT_BULK_WORKERS) -> Dict[str, str]:
+    """
+    Run sync_branch for every branch in a bounded worker pool.
+
+    sync_branch returns the title of the merge request it created or updated,
+    or None when the branch had nothing to merge. A failing branch does not
+    stop the others, its error is reported in the summary instead.
+    Returns the outcome of each branch, in the order of branches.
+    """
+    def run(branch: str) -> str:
+        try:
+            title = sync_branch(branch)
+        except Exception as e:
+            return f"failed: {e}"
+        return f"synced: {title}" if title is not None else "skipped: no new commits"
+
+    if not branches:
+        print("No branches to sync.")
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(branches)))) as executor:
+        outcomes = dict(zip(branches, executor.map(run, branches)))
+
+    print(f"\n{Fore.CYAN}Synced {len(branches)} branches:{Style.RESET_ALL}")
+    for branch, outcome in outcomes.items():
+        color = Fore.RED if outcome.startswith("failed") else Fore.GREEN
+        print(f"{color}{branch}: {outcome}{Style.RESET_ALL}")
+
+    return outcomes
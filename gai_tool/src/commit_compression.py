@@ -0,0 +1,132 @@
+"""
+Compression of commit lists for the merge request prompts.
+
+Long branches carry a lot of noise: SHAs, ``fixup!``/``squash!`` commits,
+merges of the target branch, changes reverted later on the same branch and
+repeated subjects. They are folded away without losing what the branch
+changes, and conventional commits sharing a scope are grouped under it.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+SHA_PATTERN = re.compile(r"^[0-9a-f]{7,40}\s+(?=\S)")
+FIXUP_PATTERN = re.compile(r"^(?:fixup|squash|amend)! ")
+REVERT_PATTERN = re.compile(r'^Revert "(.*)"$')
+# Merges bringing the target branch in, they change nothing of the branch itself
+MERGE_PATTERN = re.compile(r"^Merge (?:remote-tracking )?branch '[^']+'(?: of \S+)?(?: into \S+)?$")
+CONVENTIONAL_PATTERN = re.compile(r"^(?P<type>\w+)\((?P<scope>[^)]+)\)(?P<breaking>!?): (?P<description>.+)$")
+# Scopes with fewer commits stay in the main list
+MIN_GROUP_SIZE = 2
+
+
+def strip_sha(line: str) -> str:
+    """Subject of a ``git log --oneline`` line."""
+    return SHA_PATTERN.sub("", line.strip(), count=1)
+
+
+def fixup_target(subject: str) -> Optional[str]:
+    """Subject a fixup!/squash!/amend! commit applies to, None for other commits."""
+    if not FIXUP_PATTERN.match(subject):
+        return None
+    while FIXUP_PATTERN.match(subject):
+        subject = FIXUP_PATTERN.sub("", subject, count=1)
+    return subject
+
+
+def normalize(subject: str) -> str:
+    """Key of near-identical subjects: case, spacing and trailing punctuation do not matter."""
+    return " ".join(subject.lower().split()).rstrip(".!;:")
+
+
+def compress_messages(messages: List[Tuple[str, str]]) -> List[Tuple[str, str, int]]:
+    """
+    Compress (subject, body) commit messages, in git log order, into
+    (subject, body, count) entries:
+
+    - merges of other branches are dropped;
+    - fixup!/squash!/amend! commits are folded into the commit they fix,
+      or stand for it when it is not part of the list;
+    - a commit and its revert cancel each other;
+    - near-identical subjects are kept once, with the number of commits.
+    """
+    subjects = [subject for subject, _ in messages]
+    keys = {normalize(subject) for subject in subjects}
+
+    entries: List[Optional[Tuple[str, str]]] = []
+    for subject, body in messages:
+        target = fixup_target(subject)
+        if MERGE_PATTERN.match(subject):
+            continue
+        if target is None:
+            entries.append((subject, body))
+        elif normalize(target) not in keys:
+            # The fixed commit is already on the target branch, describe the fix as it
+            keys.add(normalize(target))
+            entries.append((target, body))
+
+    # Newest first, so that "Revert "Revert "X""" cancels "Revert "X"" and keeps X
+    for index, entry in enumerate(entries):
+        if entry is None:
+            continue
+        match = REVERT_PATTERN.match(entry[0])
+        if not match:
+            continue
+        reverted = normalize(match.group(1))
+        for other in range(index + 1, len(entries)):
+            if entries[other] is not None and normalize(entries[other][0]) == reverted:
+                entries[index] = entries[other] = None
+                break
+
+    compressed: Dict[str, List] = OrderedDict()
+    for entry in entries:
+        if entry is None:
+            continue
+        subject, body = entry
+        key = normalize(subject)
+        if key in compressed:
+            compressed[key][2] += 1
+        else:
+            compressed[key] = [subject, body, 1]
+
+    return [(subject, body, count) for subject, body, count in compressed.values()]
+
+
+def format_subject(subject: str, count: int) -> str:
+    return f"{subject} (x{count})" if count > 1 else subject
+
+
+def group_by_scope(subjects: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Split subjects into the ones without a shared conventional-commit scope
+    and, per scope, the ones sharing it, with the scope dropped from them
+    (``feat(api): add X`` becomes ``feat: add X`` under ``api``).
+    """
+    scopes: Dict[str, List[Tuple[int, str]]] = OrderedDict()
+    for index, subject in enumerate(subjects):
+        match = CONVENTIONAL_PATTERN.match(subject)
+        if match:
+            short = f"{match.group('type')}{match.group('breaking')}: {match.group('description')}"
+            scopes.setdefault(match.group("scope"), []).append((index, short))
+
+    grouped = {scope: items for scope, items in scopes.items() if len(items) >= MIN_GROUP_SIZE}
+    grouped_indexes = {index for items in grouped.values() for index, _ in items}
+
+    ungrouped = [subject for index, subject in enumerate(subjects) if index not in grouped_indexes]
+    return ungrouped, {scope: [short for _, short in items] for scope, items in grouped.items()}
+
+
+def compress_commit_list(log: str) -> str:
+    """
+    Compressed ``git log --oneline`` output, rendered as the commit list of
+    the merge request prompts.
+    """
+    messages = [(strip_sha(line), "") for line in log.split("\n")]
+    subjects = [format_subject(subject, count) for subject, _, count in compress_messages(messages)]
+    ungrouped, groups = group_by_scope(subjects)
+
+    lines = ["Changes:"] + [f"- {subject}" for subject in ungrouped]
+    for scope, items in groups.items():
+        lines += ["", f"{scope}:"] + [f"- {subject}" for subject in items]
+    return "\n".join(lines)
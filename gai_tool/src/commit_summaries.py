@@ -0,0 +1,77 @@
+"""
+Summaries of single commits, cached by commit SHA.
+
+A commit never changes once created, so its summary stays valid for as long as
+the prompt producing it does. Summaries are stored per prompt version (a hash
+of the summary prompt) and per SHA under the cache folder, so re-running
+``gai merge`` after pushing new commits only summarizes the new ones.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from gai_tool.src.utils import get_cache_dir
+
+SUMMARIES_FOLDER = "commit_summaries"
+
+
+def prompt_version(prompt: str) -> str:
+    """Short hash of a prompt, summaries made with another prompt are not reused."""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+class CommitSummaryCache:
+    """
+    Commit summaries stored as one text file per SHA, in a folder per prompt version.
+    """
+
+    def __init__(self, prompt: str, root: Optional[Path] = None):
+        self.folder = (root or get_cache_dir() / SUMMARIES_FOLDER) / prompt_version(prompt)
+
+    def get(self, sha: str) -> Optional[str]:
+        try:
+            return (self.folder / f"{sha}.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, sha: str, summary: str) -> None:
+        """Write the summary atomically so concurrent runs never see a partial file."""
+        path = self.folder / f"{sha}.txt"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(summary, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            # The cache is only an optimization, never fail the command because of it
+            tmp_path.unlink(missing_ok=True)
+
+
+def summarize_commits(shas: List[str],
+                      get_diff: Callable[[str], str],
+                      summarize: Callable[[str], str],
+                      cache: CommitSummaryCache) -> List[str]:
+    """
+    Summaries of the commits, in the order of shas. Only the commits missing
+    from the cache have their diff read and summarized.
+    """
+    summaries = []
+    new = 0
+    for sha in shas:
+        summary = cache.get(sha)
+        if summary is None:
+            summary = " ".join(summarize(get_diff(sha)).split())
+            cache.put(sha, summary)
+            new += 1
+        summaries.append(summary)
+
+    print(f"Summarized {new} new commits, reused {len(shas) - new} cached summaries.")
+    return summaries
+
+
+def format_summaries(summaries: List[str]) -> str:
+    """Commit summaries in the same shape as ``Commits.format_commits``."""
+    return "Changes:\n" + "\n".join(f"- {summary}" for summary in summaries)
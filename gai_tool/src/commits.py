@@ -1,15 +1,59 @@
 import os
+import re
 import subprocess
+import threading
+import time
+from functools import partial
+from typing import Callable, List, Optional, Tuple
 
 from colorama import Fore, Style
 
+from gai_tool.src.commit_compression import compress_commit_list
+from gai_tool.src.data_diff import reduce_data_diffs
+from gai_tool.src.git_blobs import CatFileBatch
+from gai_tool.src.hunk_dedup import dedupe_hunks
+from gai_tool.src.lockfile_diff import summarize_lockfiles
+from gai_tool.src.python_ast_diff import summarize_python_diffs
+
+# Seconds during which a fetched target branch is reused by later runs, 0 always fetches
+DEFAULT_FETCH_MAX_AGE = 60
+# Commits fetched by the first deepening of a shallow clone, doubled at each step
+INITIAL_DEEPEN = 50
+MAX_DEEPEN_STEPS = 10
+
+# Credentials of scheme URLs and the user of scp-like ones (git@host:path),
+# left out of FETCH_HEAD by git
+URL_CREDENTIALS_PATTERN = re.compile(r"^(\w[\w+.-]*://)[^/@]*@")
+SCP_USER_PATTERN = re.compile(r"^[^/@:]*@(?=[^/:]+:)")
+
+
+def normalize_remote_url(url: str) -> str:
+    """
+    Remote URL as written in FETCH_HEAD: without credentials, trailing
+    slashes and ``.git`` suffix, like git's ``transport_anonymize_url``.
+    """
+    url = URL_CREDENTIALS_PATTERN.sub(r"\1", url.strip())
+    url = SCP_USER_PATTERN.sub("", url).rstrip("/")
+    return url.removesuffix(".git").rstrip("/")
+
 
 class Commits:
-    def __init__(self):
+    def __init__(self, fetch_max_age: float = DEFAULT_FETCH_MAX_AGE):
+        self.fetch_max_age = fetch_max_age
+        # Branches may be read from several threads, only one of them deepens the clone
+        self._deepen_lock = threading.Lock()
+        # File contents read by the diff reductions, from a single git process
+        self.blobs = CatFileBatch()
         self.diff_cmd = "git --no-pager diff --cached --ignore-space-change"
         self.show_committed_cmd = "git diff --cached --name-only"
 
-    def get_diffs(self) -> str:
+    def get_diffs(self, token_budget: Optional[int] = None,
+                  count_tokens: Optional[Callable[[str], int]] = None) -> str:
+        """
+        Staged diff, reduced for the commit message prompt. When it takes more
+        than token_budget tokens, Python files are described by their
+        structural changes instead of their hunks.
+        """
         try:
             result = subprocess.run(
                 self.diff_cmd.split(),
@@ -17,11 +61,30 @@ class Commits:
                 capture_output=True,
                 text=True
             )
-            return result.stdout.strip()
+            read_old = partial(self.read_blob, "HEAD")
+            read_new = partial(self.read_blob, "")
+            diff = summarize_lockfiles(result.stdout.strip(), read_old=read_old, read_new=read_new)
+            diff = reduce_data_diffs(diff, read_old=read_old, read_new=read_new)
+            # Codemods repeat the same hunk across many files, keep it once
+            diff = dedupe_hunks(diff)
+            if token_budget and count_tokens is not None:
+                diff = summarize_python_diffs(diff, read_old=read_old, read_new=read_new,
+                                              token_budget=token_budget, count_tokens=count_tokens)
+            return diff
         except subprocess.CalledProcessError as e:
             print(f"Error running git diff: {e}")
             return ""
 
+    def read_blob(self, revision: str, path: str) -> Optional[str]:
+        """
+        Get the content of path at revision, or in the index when revision is
+        empty. Returns None when the file does not exist there.
+        """
+        content = self.blobs.read(f"{revision}:{path}")
+        if content is None:
+            return None
+        return content.decode("utf-8", errors="replace")
+
     def commit_changes(self, commit_message: str):
         print(f"Committing changes with message: {commit_message}")
 
@@ -36,18 +99,181 @@ class Commits:
         os.system("git add .")
 
     def format_commits(self, result: str) -> str:
-        commits = result.split('\n')
-        formatted_commits = [f"- {commit}" for commit in commits]
+        """
+        Format git log --oneline output as the commit list of the merge request
+        prompts, compressed: no SHAs, fixups folded, reverted commits dropped,
+        repeated subjects counted and conventional commits grouped by scope.
+        """
+        return compress_commit_list(result)
+
+    def fetch(self,
+              remote_repo: str,
+              target_branch: Optional[str] = None,
+              background: bool = False) -> Optional[subprocess.Popen]:
+        """
+        Fetch the target branch only, or every branch when none is given.
+
+        The fetch is skipped when the target branch was fetched or updated less
+        than fetch_max_age seconds ago. With background=True the fetch is
+        started and its process returned, pass it to wait_for_fetch before
+        reading the remote branch.
+        """
+        remote = remote_repo or "origin"
+
+        if target_branch is None:
+            command = ["git", "fetch", remote]
+        else:
+            if self.is_fetch_fresh(remote, target_branch):
+                print(f"Skipping fetch, {remote}/{target_branch} is up to date.")
+                return None
+            command = ["git", "fetch", remote,
+                       f"+refs/heads/{target_branch}:refs/remotes/{remote}/{target_branch}"]
 
-        return "Changes:\n" + "\n".join(formatted_commits)
+        print("Fetching latest commits from remote...")
+        if background:
+            return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
-    def get_commits(self, remote_repo: str, target_branch: str, source_branch: str) -> str:
+        subprocess.run(command, check=True, capture_output=True)
+        return None
+
+    def wait_for_fetch(self, process: Optional[subprocess.Popen]) -> None:
+        """
+        Wait for a fetch started in the background, raising if it failed.
+        """
+        if process is None:
+            return
+
+        stdout, stderr = process.communicate()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args, stdout, stderr)
+
+    def cancel_fetch(self, process: Optional[subprocess.Popen]) -> None:
+        """
+        Stop a fetch started in the background whose result is not needed.
+        """
+        if process is None:
+            return
+
+        process.kill()
+        process.communicate()
+
+    def is_fetch_fresh(self, remote: str, target_branch: str) -> bool:
+        """
+        Check whether FETCH_HEAD (when it holds the target branch of remote)
+        or the remote-tracking ref was written less than fetch_max_age seconds
+        ago.
+        """
+        if self.fetch_max_age <= 0:
+            return False
+
+        result = subprocess.run(
+            ["git", "rev-parse",
+             "--git-path", "FETCH_HEAD",
+             "--git-path", f"refs/remotes/{remote}/{target_branch}"],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return False
+
+        fetch_head, tracking_ref = result.stdout.splitlines()
+        oldest = time.time() - self.fetch_max_age
+        try:
+            if os.path.getmtime(fetch_head) > oldest and self.fetch_head_has(fetch_head, remote, target_branch):
+                return True
+        except OSError:
+            pass
+
+        try:
+            # Packed refs have no file of their own, they are never considered fresh
+            return os.path.getmtime(tracking_ref) > oldest
+        except OSError:
+            return False
+
+    def fetch_head_has(self, fetch_head: str, remote: str, target_branch: str) -> bool:
+        """
+        Check whether FETCH_HEAD holds target_branch fetched from the URL of
+        remote, not from another remote with a branch of the same name.
+        """
+        result = subprocess.run(
+            ["git", "remote", "get-url", remote],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return False
+
+        url = normalize_remote_url(result.stdout)
+        with open(fetch_head, "r") as f:
+            for line in f:
+                _, _, note = line.rstrip("\n").rpartition("\t")
+                if note.startswith(f"branch '{target_branch}' of ") and \
+                        normalize_remote_url(note.split(" of ", 1)[1]) == url:
+                    return True
+        return False
+
+    def is_shallow(self) -> bool:
+        result = subprocess.run(
+            ["git", "rev-parse", "--is-shallow-repository"],
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip() == "true"
+
+    def has_merge_base(self, base: str, source_branch: str) -> bool:
+        result = subprocess.run(
+            ["git", "merge-base", base, source_branch],
+            capture_output=True
+        )
+        return result.returncode == 0
+
+    def deepen_to_merge_base(self, remote: str, target_branch: str, source_branch: str) -> bool:
+        """
+        Deepen a shallow clone until the remote target branch and source_branch
+        share a merge base, otherwise the log range would run down to the
+        shallow boundary. Each step fetches twice as many commits as the
+        previous one, and at most MAX_DEEPEN_STEPS steps are taken: the whole
+        history of a huge repository is never fetched (no --unshallow).
+        Returns whether a merge base was found.
+        """
+        base = f"{remote}/{target_branch}"
+        with self._deepen_lock:
+            depth = INITIAL_DEEPEN
+            for _ in range(MAX_DEEPEN_STEPS):
+                if self.has_merge_base(base, source_branch):
+                    return True
+                if not self.is_shallow():
+                    # The whole history is there, the branches are unrelated
+                    return False
+
+                print(f"Shallow clone, fetching {depth} more commits to find the merge base...")
+                subprocess.run(
+                    ["git", "fetch", f"--deepen={depth}", remote,
+                     f"+refs/heads/{target_branch}:refs/remotes/{remote}/{target_branch}"],
+                    check=True,
+                    capture_output=True
+                )
+                depth *= 2
+
+            found = self.has_merge_base(base, source_branch)
+            if not found:
+                print(f"{Fore.YELLOW}No merge base between {base} and {source_branch} "
+                      f"within the fetched history, the commit list may be incomplete.{Style.RESET_ALL}")
+            return found
+
+    def get_commits(self, remote_repo: str, target_branch: str, source_branch: str, fetch: bool = True) -> str:
+        """
+        Get the one line log of the commits of source_branch missing from the remote target_branch.
+        Pass fetch=False when the remote was already fetched, e.g. once for many branches.
+        """
         try:
             remote = remote_repo or "origin"
 
-            print("Fetching latest commits from remote...")
-            subprocess.run(["git", "fetch", remote],
-                           check=True, capture_output=True)
+            if fetch:
+                self.fetch(remote, target_branch)
+
+            if self.is_shallow():
+                self.deepen_to_merge_base(remote, target_branch, source_branch)
 
             result = subprocess.run(
                 ["git", "log", "--oneline",
@@ -65,3 +291,103 @@ class Commits:
 
         except subprocess.CalledProcessError as e:
             raise e
+
+    def get_commit_shas(self, remote_repo: str, target_branch: str, source_branch: str,
+                        since: Optional[str] = None) -> List[str]:
+        """
+        Get the SHAs of the commits of source_branch missing from the remote
+        target_branch, or only the ones after the commit since, oldest first.
+        The remote is expected to be fetched already.
+        """
+        remote = remote_repo or "origin"
+        base = since or f"{remote}/{target_branch}"
+
+        result = subprocess.run(
+            ["git", "rev-list", "--reverse", f"{base}..{source_branch}"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.split()
+
+    def get_commit_diff(self, sha: str) -> str:
+        """
+        Get the message, diffstat and diff of a single commit.
+        """
+        result = subprocess.run(
+            ["git", "--no-pager", "show", "--no-color", "--ignore-space-change",
+             "--format=%s%n%n%b", "--stat", "--patch", sha],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+
+    def get_commits_since(self, since: str, source_branch: str) -> str:
+        """
+        Get the one line log of the commits of source_branch after the commit since.
+        """
+        result = subprocess.run(
+            ["git", "log", "--oneline", f"{since}..{source_branch}"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+
+    def get_head_sha(self, branch: str) -> str:
+        result = subprocess.run(
+            ["git", "rev-parse", branch],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+
+    def is_ancestor(self, sha: str, branch: str) -> bool:
+        """
+        Check that the commit sha is part of the history of branch,
+        it is not after a rebase or a force push.
+        """
+        result = subprocess.run(
+            ["git", "merge-base", "--is-ancestor", sha, branch],
+            capture_output=True
+        )
+        return result.returncode == 0
+
+    def get_commit_messages(self, remote_repo: str, target_branch: str, source_branch: str) -> List[Tuple[str, str]]:
+        """
+        Get the (subject, body) of the commits of source_branch missing from
+        the remote target_branch, newest first like git log.
+        """
+        remote = remote_repo or "origin"
+
+        result = subprocess.run(
+            ["git", "log", "--format=%s%x1f%b%x1e", f"{remote}/{target_branch}..{source_branch}"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        messages = []
+        for record in result.stdout.split("\x1e"):
+            if record.strip():
+                subject, _, body = record.strip("\n").partition("\x1f")
+                messages.append((subject, body.strip()))
+        return messages
+
+    def get_branch_diff(self, remote_repo: str, target_branch: str, source_branch: str, stat: bool = False) -> str:
+        """
+        Get the diff (or with stat=True the diffstat) of source_branch since it
+        forked from the remote target_branch.
+        """
+        remote = remote_repo or "origin"
+
+        result = subprocess.run(
+            ["git", "--no-pager", "diff", "--no-color", "--ignore-space-change",
+             *(["--stat=120"] if stat else []),
+             f"{remote}/{target_branch}...{source_branch}"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip() if stat else dedupe_hunks(result.stdout.strip())
@@ -0,0 +1,135 @@
+"""
+Budgeted context for the merge request prompts.
+
+Candidate facts are gathered from the branch: commit subjects and bodies, the
+diffstat and the diff hunks. Each one is scored, and the best ones are packed
+into a token budget, so that the prompt stays bounded however long the branch
+is. Kept facts are rendered in their original order, grouped by kind.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from gai_tool.src.commit_compression import compress_messages, format_subject
+from gai_tool.src.diffs import changed_lines, parse_diff
+
+SUBJECT_SCORE = 10.0
+STAT_SUMMARY_SCORE = 9.0
+STAT_FILE_SCORE = 6.0
+BODY_SCORE = 5.0
+# Hunks score between these, by number of changed lines
+HUNK_MIN_SCORE = 1.0
+HUNK_MAX_SCORE = 4.0
+HUNK_FULL_SCORE_LINES = 20
+# Hunks adding or changing definitions say more about a change than their bodies
+DEFINITION_BONUS = 1.0
+DEFINITION_PATTERN = re.compile(r"^[+-]\s*(?:async\s+)?(?:def|class|function|func|fn|interface|type|struct)\b",
+                                re.MULTILINE)
+# Changes in these files are mostly mechanical, their hunks are ranked last
+LOW_SIGNAL_FILE_PATTERN = re.compile(r"(\.lock|-lock\.json|\.sum|\.min\.\w+|\.snap|\.svg)$")
+TEST_FILE_PATTERN = re.compile(r"(^|/)(tests?|__tests__|spec)/|(_test|\.test|\.spec)\.\w+$|(^|/)test_[^/]*$")
+
+
+@dataclass
+class Fact:
+    kind: str
+    text: str
+    score: float
+    order: int
+    tokens: int = 0
+    # Order of the fact this one details, only kept along with it
+    parent: Optional[int] = None
+
+
+def split_hunks(diff: str) -> List[Tuple[str, str]]:
+    """(path, hunk) pairs of a unified diff, each hunk starting at its ``@@`` line."""
+    return [(file_diff.path, hunk) for file_diff in parse_diff(diff) for hunk in file_diff.hunks]
+
+
+def score_hunk(path: str, hunk: str) -> float:
+    changed = len(changed_lines(hunk))
+    score = HUNK_MIN_SCORE + (HUNK_MAX_SCORE - HUNK_MIN_SCORE) * min(1.0, changed / HUNK_FULL_SCORE_LINES)
+    if DEFINITION_PATTERN.search(hunk):
+        score += DEFINITION_BONUS
+    if LOW_SIGNAL_FILE_PATTERN.search(path):
+        score *= 0.1
+    elif TEST_FILE_PATTERN.search(path):
+        score *= 0.5
+    return score
+
+
+def gather_facts(messages: List[Tuple[str, str]], diffstat: str, diff: str) -> List[Fact]:
+    """
+    Candidate facts of a branch, from its (subject, body) commit messages
+    (compressed first), diffstat and diff.
+    """
+    facts: List[Fact] = []
+
+    for subject, body, count in compress_messages(messages):
+        subject_order = len(facts)
+        facts.append(Fact("commit", f"- {format_subject(subject, count)}", SUBJECT_SCORE, subject_order))
+        body_lines = [line for line in body.splitlines() if line.strip()]
+        if body_lines:
+            facts.append(Fact("commit", "\n".join(f"  {line.strip()}" for line in body_lines),
+                              BODY_SCORE, len(facts), parent=subject_order))
+
+    stat_lines = [line for line in diffstat.splitlines() if line.strip()]
+    for index, line in enumerate(stat_lines):
+        summary = index == len(stat_lines) - 1
+        facts.append(Fact("stat", line, STAT_SUMMARY_SCORE if summary else STAT_FILE_SCORE, len(facts)))
+
+    for path, hunk in split_hunks(diff):
+        facts.append(Fact("hunk", f"--- {path}\n{hunk}", score_hunk(path, hunk), len(facts)))
+
+    return facts
+
+
+def pack_facts(facts: List[Fact], budget: int, count_tokens: Callable[[str], int]) -> List[Fact]:
+    """
+    Greedily keep the highest scored facts that still fit in budget tokens,
+    returned in their original order.
+    """
+    remaining = budget
+    kept = []
+    kept_orders = set()
+    for fact in sorted(facts, key=lambda fact: (-fact.score, fact.order)):
+        if fact.parent is not None and fact.parent not in kept_orders:
+            continue
+        # One more token for the line break joining the facts
+        fact.tokens = count_tokens(fact.text) + 1
+        if fact.tokens <= remaining:
+            kept.append(fact)
+            kept_orders.add(fact.order)
+            remaining -= fact.tokens
+    return sorted(kept, key=lambda fact: fact.order)
+
+
+def render_facts(kept: List[Fact], facts: List[Fact]) -> str:
+    """Kept facts grouped in sections, with a note of what was left out."""
+    def section(kind: str, title: str, omitted_label: str) -> str:
+        lines = [fact.text for fact in kept if fact.kind == kind]
+        omitted = sum(1 for fact in facts if fact.kind == kind) - len(lines)
+        if omitted:
+            lines.append(f"[... {omitted} {omitted_label} left out ...]")
+        return f"{title}:\n" + "\n".join(lines) if lines else ""
+
+    sections = [
+        section("commit", "Changes", "commit subjects and bodies"),
+        section("stat", "Files changed", "diffstat lines"),
+        section("hunk", "Selected diff hunks", "hunks"),
+    ]
+    return "\n\n".join(part for part in sections if part)
+
+
+def assemble_context(messages: List[Tuple[str, str]],
+                     diffstat: str,
+                     diff: str,
+                     budget: int,
+                     count_tokens: Callable[[str], int]) -> str:
+    """
+    Context of a branch for the merge request prompts, within budget tokens
+    (the section titles and left-out notes come on top of it).
+    """
+    facts = gather_facts(messages, diffstat, diff)
+    return render_facts(pack_facts(facts, budget, count_tokens), facts)
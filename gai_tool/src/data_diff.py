@@ -0,0 +1,185 @@
+"""
+Reduction of notebook and data-file diffs.
+
+Notebooks are JSON documents whose diffs mostly consist of outputs (base64
+images included), execution counts and metadata. They are diffed at the
+level of the cell sources instead. Large CSV, JSON and YAML files are
+summarized by the change of their shape: row counts and columns, or keys.
+"""
+
+import csv
+import difflib
+import io
+import json
+from pathlib import PurePosixPath
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from gai_tool.src.diffs import FileDiff, changed_lines, parse_diff, render_diff
+
+NOTEBOOK_SUFFIXES = {".ipynb"}
+DATA_SUFFIXES = {".csv", ".tsv", ".json", ".yaml", ".yml"}
+# Data files with smaller diffs are shown as they are
+MIN_DATA_DIFF_LINES = 200
+# Keys listed per changed mapping, the others are only counted
+MAX_LISTED_KEYS = 20
+
+
+def is_notebook(path: str) -> bool:
+    return PurePosixPath(path).suffix in NOTEBOOK_SUFFIXES
+
+
+def is_data_file(path: str) -> bool:
+    return PurePosixPath(path).suffix in DATA_SUFFIXES
+
+
+def notebook_cells(text: Optional[str]) -> List[str]:
+    """Sources of the cells of a notebook, prefixed with their type, outputs and metadata left out."""
+    if text is None:
+        return []
+    cells = []
+    for cell in json.loads(text).get("cells", []):
+        source = cell.get("source", "")
+        if isinstance(source, list):
+            source = "".join(source)
+        cells.append(f"# [{cell.get('cell_type', 'code')} cell]\n{source.rstrip()}")
+    return cells
+
+
+def diff_notebook(old_text: Optional[str], new_text: Optional[str]) -> Optional[List[str]]:
+    """Hunks of a diff of the notebook cell sources, None when a version cannot be parsed."""
+    try:
+        old_lines = "\n".join(notebook_cells(old_text)).splitlines()
+        new_lines = "\n".join(notebook_cells(new_text)).splitlines()
+    except (ValueError, AttributeError):
+        return None
+
+    diff = list(difflib.unified_diff(old_lines, new_lines, lineterm="", n=2))
+    if not diff:
+        return ["[notebook outputs or metadata changed, cell sources unchanged]"]
+
+    hunks = []
+    for line in diff[2:]:
+        if line.startswith("@@"):
+            hunks.append(line)
+        else:
+            hunks[-1] += f"\n{line}"
+    return hunks
+
+
+def describe_table(text: Optional[str], delimiter: str) -> Optional[Dict]:
+    if text is None:
+        return None
+    rows = list(csv.reader(io.StringIO(text), delimiter=delimiter))
+    return {"columns": rows[0] if rows else [], "rows": max(len(rows) - 1, 0)}
+
+
+def summarize_table(old: Optional[Dict], new: Optional[Dict]) -> List[str]:
+    old = old or {"columns": [], "rows": 0}
+    new = new or {"columns": [], "rows": 0}
+    lines = [f"rows: {old['rows']} -> {new['rows']} ({new['rows'] - old['rows']:+d})"]
+
+    added = [column for column in new["columns"] if column not in old["columns"]]
+    removed = [column for column in old["columns"] if column not in new["columns"]]
+    if added:
+        lines.append(f"added columns: {', '.join(added)}")
+    if removed:
+        lines.append(f"removed columns: {', '.join(removed)}")
+    return lines
+
+
+def describe_shape(value) -> str:
+    """Short description of a JSON/YAML value: type, size and keys."""
+    if isinstance(value, dict):
+        keys = list(value)
+        listed = ", ".join(str(key) for key in keys[:MAX_LISTED_KEYS])
+        more = f", ... {len(keys) - MAX_LISTED_KEYS} more" if len(keys) > MAX_LISTED_KEYS else ""
+        return f"mapping of {len(keys)} keys ({listed}{more})"
+    if isinstance(value, list):
+        return f"list of {len(value)} items"
+    return type(value).__name__
+
+
+def summarize_document(old, new, path: str = "") -> List[str]:
+    """Shape changes between two parsed JSON/YAML documents, down their common mappings."""
+    location = path or "root"
+    if isinstance(old, dict) and isinstance(new, dict):
+        lines = []
+        added = [key for key in new if key not in old]
+        removed = [key for key in old if key not in new]
+        if added:
+            lines.append(f"{location}: added keys {', '.join(str(key) for key in added[:MAX_LISTED_KEYS])}"
+                         + (f" and {len(added) - MAX_LISTED_KEYS} more" if len(added) > MAX_LISTED_KEYS else ""))
+        if removed:
+            lines.append(f"{location}: removed keys {', '.join(str(key) for key in removed[:MAX_LISTED_KEYS])}"
+                         + (f" and {len(removed) - MAX_LISTED_KEYS} more" if len(removed) > MAX_LISTED_KEYS else ""))
+        for key in old:
+            if key in new and old[key] != new[key]:
+                lines.extend(summarize_document(old[key], new[key], f"{path}.{key}" if path else str(key)))
+        return lines
+
+    if isinstance(old, list) and isinstance(new, list):
+        if len(old) != len(new):
+            return [f"{location}: {len(old)} -> {len(new)} items ({len(new) - len(old):+d})"]
+        return [f"{location}: {sum(1 for a, b in zip(old, new) if a != b)} of {len(new)} items changed"]
+
+    if type(old) is not type(new) or isinstance(old, (dict, list)):
+        return [f"{location}: {describe_shape(old)} -> {describe_shape(new)}"]
+    return [f"{location}: value changed"]
+
+
+def load_document(path: str, text: Optional[str]):
+    if text is None:
+        return None
+    if PurePosixPath(path).suffix == ".json":
+        return json.loads(text)
+
+    return yaml.safe_load(text)
+
+
+def summarize_data_file(path: str, old_text: Optional[str], new_text: Optional[str]) -> Optional[str]:
+    """Shape summary of a data file, None when a version cannot be parsed."""
+    suffix = PurePosixPath(path).suffix
+    try:
+        if suffix in (".csv", ".tsv"):
+            delimiter = "\t" if suffix == ".tsv" else ","
+            lines = summarize_table(describe_table(old_text, delimiter), describe_table(new_text, delimiter))
+        else:
+            lines = summarize_document(load_document(path, old_text), load_document(path, new_text))
+    except Exception:
+        # Parsers raise their own error types (csv.Error, yaml.YAMLError...), keep the raw diff
+        return None
+
+    if len(lines) > MAX_LISTED_KEYS:
+        lines = lines[:MAX_LISTED_KEYS] + [f"... and {len(lines) - MAX_LISTED_KEYS} more changes"]
+    return "[data file changes]\n" + "\n".join(lines or ["content changed, same shape"])
+
+
+def reduce_data_diffs(diff: str, read_old: Callable[[str], Optional[str]],
+                      read_new: Callable[[str], Optional[str]]) -> str:
+    """
+    Replace the hunks of notebooks by a diff of their cell sources, and the
+    hunks of large data files by a summary of their shape changes. read_old
+    and read_new return the content of a path before and after the change,
+    None when it does not exist.
+    """
+    files = parse_diff(diff)
+    if not any(is_notebook(file_diff.path) or is_data_file(file_diff.path) for file_diff in files):
+        return diff
+
+    reduced = []
+    for file_diff in files:
+        hunks = None
+        if file_diff.hunks and is_notebook(file_diff.path):
+            hunks = diff_notebook(read_old(file_diff.path), read_new(file_diff.path))
+        elif is_data_file(file_diff.path) and \
+                sum(len(changed_lines(hunk)) for hunk in file_diff.hunks) >= MIN_DATA_DIFF_LINES:
+            summary = summarize_data_file(file_diff.path, read_old(file_diff.path), read_new(file_diff.path))
+            hunks = [summary] if summary is not None else None
+
+        if hunks is None:
+            reduced.append(file_diff)
+        else:
+            reduced.append(FileDiff(file_diff.header.splitlines()[0], file_diff.path, hunks))
+    return render_diff(reduced)
@@ -0,0 +1,55 @@
+"""
+Minimal unified diff model shared by the diff reducers.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+FILE_HEADER_PATTERN = re.compile(r"^diff --git ", re.MULTILINE)
+HUNK_START_PATTERN = re.compile(r"^(?=@@ )", re.MULTILINE)
+NEW_PATH_PATTERN = re.compile(r"^\+\+\+ (?:b/)?(.+)$", re.MULTILINE)
+OLD_PATH_PATTERN = re.compile(r"^--- (?:a/)?(.+)$", re.MULTILINE)
+GIT_PATHS_PATTERN = re.compile(r"^diff --git a/(\S+) b/(\S+)")
+
+
+@dataclass
+class FileDiff:
+    """One file of a diff: its header lines and hunks, each hunk starting at its ``@@`` line."""
+    header: str
+    path: str
+    hunks: List[str] = field(default_factory=list)
+
+    def render(self) -> str:
+        return "\n".join([self.header, *self.hunks])
+
+
+def file_path(header: str) -> str:
+    """New path of the file, or the old one when it was deleted."""
+    match = NEW_PATH_PATTERN.search(header)
+    if match and match.group(1) != "/dev/null":
+        return match.group(1)
+    match = OLD_PATH_PATTERN.search(header)
+    if match and match.group(1) != "/dev/null":
+        return match.group(1)
+    match = GIT_PATHS_PATTERN.match(header)
+    return match.group(2) if match else ""
+
+
+def parse_diff(diff: str) -> List[FileDiff]:
+    """Split a ``git diff`` output into its files, anything before the first file is dropped."""
+    files = []
+    for chunk in FILE_HEADER_PATTERN.split(diff)[1:]:
+        header, *hunks = HUNK_START_PATTERN.split(chunk.rstrip("\n"))
+        header = f"diff --git {header.rstrip(chr(10))}"
+        files.append(FileDiff(header, file_path(header), [hunk.rstrip("\n") for hunk in hunks]))
+    return files
+
+
+def render_diff(files: List[FileDiff]) -> str:
+    return "\n".join(file_diff.render() for file_diff in files)
+
+
+def changed_lines(hunk: str) -> List[str]:
+    """Added and removed lines of a hunk, without its ``@@`` line."""
+    return [line for line in hunk.splitlines()[1:] if line[:1] in ("+", "-")]
@@ -0,0 +1,93 @@
+"""
+Blob access through one long-lived ``git cat-file --batch`` process.
+
+The diff reductions read the old and new content of every file they inspect.
+Spawning ``git show`` per file costs a process each, which adds up on commits
+touching thousands of files. Object names (``HEAD:path``, ``:path`` for the
+index, or object ids) are written to the process one per line instead, and
+the blobs streamed back from it.
+"""
+
+import atexit
+import subprocess
+import threading
+from typing import Optional
+
+
+class CatFileBatch:
+    """
+    A ``git cat-file --batch`` process, started on the first read and shared
+    by every thread: requests are queued on a lock and answered in order.
+    """
+
+    def __init__(self, cwd: Optional[str] = None):
+        self.cwd = cwd
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd
+            )
+            atexit.register(self.close)
+        return self._process
+
+    def read(self, object_name: str) -> Optional[bytes]:
+        """
+        Get the content of a blob, None when the object does not exist or is
+        not a blob (a tree, a submodule...).
+        """
+        if not object_name or "\n" in object_name:
+            # The batch protocol is line based
+            return None
+
+        with self._lock:
+            process = self._start()
+            try:
+                process.stdin.write(object_name.encode("utf-8") + b"\n")
+                process.stdin.flush()
+                header = process.stdout.readline().decode("utf-8", errors="replace").split()
+            except (BrokenPipeError, OSError):
+                self._process = None
+                return None
+
+            # "<oid> <type> <size>", or "<name> missing" / "<name> ambiguous"
+            if len(header) != 3 or not header[2].isdigit():
+                if not header:
+                    # The process exited, start another one on the next read
+                    self._process = None
+                return None
+
+            _, object_type, size = header
+            # The content is followed by a line feed
+            content = process.stdout.read(int(size) + 1)[:-1]
+            return content if object_type == "blob" else None
+
+    def close(self) -> None:
+        """
+        Stop the process, a later read starts another one.
+        """
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+
+        atexit.unregister(self.close)
+        process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
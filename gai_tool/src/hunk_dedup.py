@@ -0,0 +1,73 @@
+"""
+Deduplication of the repeated hunks of codemods and mass renames.
+
+A mechanical change applied across many files (an import rename, an API
+migration) produces the same hunk over and over. Hunks are keyed by their
+changed lines, whitespace aside, and a hunk found in several files is kept
+once, followed by the list of the other files it was applied in.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from gai_tool.src.diffs import FileDiff, changed_lines, parse_diff, render_diff
+
+# Files listed after a representative hunk, the others are only counted
+MAX_LISTED_FILES = 10
+
+
+def hunk_key(hunk: str) -> Tuple[str, ...]:
+    """Changed lines of a hunk, whitespace aside: line numbers and context do not matter."""
+    return tuple(f"{line[0]}{' '.join(line[1:].split())}" for line in changed_lines(hunk))
+
+
+def applied_note(paths: List[str]) -> str:
+    listed = ", ".join(paths[:MAX_LISTED_FILES])
+    more = f" and {len(paths) - MAX_LISTED_FILES} more" if len(paths) > MAX_LISTED_FILES else ""
+    return f"[same change applied in {len(paths)} other files: {listed}{more}]"
+
+
+def dedupe_hunks(diff: str) -> str:
+    """
+    Collapse hunks repeated across files into their first occurrence plus
+    "applied in N other files: ...". Files left without hunks are dropped,
+    their names are listed in the note. Diffs without repeats are returned as is.
+    """
+    files = parse_diff(diff)
+
+    occurrences: Dict[Tuple[str, ...], List[Tuple[int, int]]] = OrderedDict()
+    for file_index, file_diff in enumerate(files):
+        for hunk_index, hunk in enumerate(file_diff.hunks):
+            key = hunk_key(hunk)
+            if key:
+                occurrences.setdefault(key, []).append((file_index, hunk_index))
+
+    repeated = {key: places for key, places in occurrences.items()
+                if len({file_index for file_index, _ in places}) > 1}
+    if not repeated:
+        return diff
+
+    dropped = set()
+    notes: Dict[Tuple[int, int], str] = {}
+    for places in repeated.values():
+        first_file = places[0][0]
+        others = []
+        for file_index, hunk_index in places[1:]:
+            dropped.add((file_index, hunk_index))
+            path = files[file_index].path
+            if file_index != first_file and path not in others:
+                others.append(path)
+        notes[places[0]] = applied_note(others)
+
+    reduced = []
+    for file_index, file_diff in enumerate(files):
+        hunks = []
+        for hunk_index, hunk in enumerate(file_diff.hunks):
+            if (file_index, hunk_index) in dropped:
+                continue
+            note = notes.get((file_index, hunk_index))
+            hunks.append(f"{hunk}\n{note}" if note else hunk)
+        if hunks or not file_diff.hunks:
+            reduced.append(FileDiff(file_diff.header, file_diff.path, hunks))
+
+    return render_diff(reduced)
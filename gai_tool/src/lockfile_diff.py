@@ -0,0 +1,189 @@
+"""
+Semantic summaries of dependency lockfile and manifest diffs.
+
+A lockfile diff is mostly hashes and metadata; what matters is which
+packages were added, removed or moved to another version. Both versions of
+the file are parsed and compared, and the raw hunks are replaced by lines
+such as ``bumped requests 2.32.3 -> 2.32.4``.
+"""
+
+import json
+import re
+import tomllib
+from fnmatch import fnmatch
+from pathlib import PurePosixPath
+from typing import Callable, Dict, List, Optional, Set
+
+from gai_tool.src.diffs import FileDiff, parse_diff, render_diff
+
+Versions = Dict[str, Set[str]]
+
+REQUIREMENT_PATTERN = re.compile(r"""
+    ^\s*([A-Za-z0-9][A-Za-z0-9._-]*)        # name
+    (?:\[[^\]]*\])?\s*                      # extras
+    (                                       # specifiers, comma separated
+        (?:[<>=!~]=?|===)\s*[^;\#\s]+
+        (?:\s*,\s*[<>=!~]=?\s*[^;\#\s,]+)*
+    )?
+""", re.VERBOSE)
+YARN_ENTRY_PATTERN = re.compile(r'^"?((?:@[^@/"]+/)?[^@"\s]+)@')
+YARN_VERSION_PATTERN = re.compile(r'^\s+version:?\s+"?([^"\s]+)"?')
+# Lines of the summary of one file, the others are only counted
+MAX_SUMMARY_LINES = 200
+
+
+def parse_poetry_lock(text: str) -> Versions:
+    """poetry.lock and Cargo.lock both list ``[[package]]`` tables with a name and version."""
+    versions: Versions = {}
+    for package in tomllib.loads(text).get("package", []):
+        versions.setdefault(package["name"], set()).add(str(package["version"]))
+    return versions
+
+
+def parse_package_lock(text: str) -> Versions:
+    data = json.loads(text)
+    versions: Versions = {}
+    packages = data.get("packages")
+    if packages is not None:
+        # lockfileVersion 2 and 3, keyed by install path
+        for path, package in packages.items():
+            if path and "version" in package:
+                name = package.get("name") or path.rsplit("node_modules/", 1)[-1]
+                versions.setdefault(name, set()).add(package["version"])
+        return versions
+
+    # lockfileVersion 1, nested dependencies
+    def walk(dependencies: Dict) -> None:
+        for name, package in dependencies.items():
+            if "version" in package:
+                versions.setdefault(name, set()).add(package["version"])
+            walk(package.get("dependencies", {}))
+
+    walk(data.get("dependencies", {}))
+    return versions
+
+
+def parse_yarn_lock(text: str) -> Versions:
+    """Yarn classic and berry lockfiles: entry lines ``name@range:`` followed by an indented version."""
+    versions: Versions = {}
+    name = None
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        if not line[0].isspace():
+            match = YARN_ENTRY_PATTERN.match(line)
+            name = match.group(1) if match else None
+            continue
+        match = YARN_VERSION_PATTERN.match(line)
+        if name and match:
+            versions.setdefault(name, set()).add(match.group(1))
+            name = None
+    return versions
+
+
+def parse_go_sum(text: str) -> Versions:
+    versions: Versions = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            versions.setdefault(parts[0], set()).add(parts[1].removesuffix("/go.mod"))
+    return versions
+
+
+def parse_requirements(text: str) -> Versions:
+    """Requirements files, the version being the specifier (``==2.32.4``, ``>=1.0``...)."""
+    versions: Versions = {}
+    for line in text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        match = REQUIREMENT_PATTERN.match(line)
+        if match:
+            specifier = (match.group(2) or "").replace(" ", "").removeprefix("==")
+            versions.setdefault(match.group(1).lower(), set()).add(specifier or "*")
+    return versions
+
+
+LOCKFILE_PARSERS: Dict[str, Callable[[str], Versions]] = {
+    "poetry.lock": parse_poetry_lock,
+    "Cargo.lock": parse_poetry_lock,
+    "package-lock.json": parse_package_lock,
+    "yarn.lock": parse_yarn_lock,
+    "go.sum": parse_go_sum,
+    "requirements*.txt": parse_requirements,
+}
+
+
+def get_parser(path: str) -> Optional[Callable[[str], Versions]]:
+    name = PurePosixPath(path).name
+    for pattern, parser in LOCKFILE_PARSERS.items():
+        if fnmatch(name, pattern):
+            return parser
+    return None
+
+
+def format_versions(versions: Set[str]) -> str:
+    return ", ".join(sorted(versions))
+
+
+def compare_versions(old: Versions, new: Versions) -> List[str]:
+    """Added, removed and bumped packages, sorted by name."""
+    lines = []
+    for name in sorted(old.keys() | new.keys()):
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        if not before:
+            lines.append(f"added {name} {format_versions(after)}")
+        elif not after:
+            lines.append(f"removed {name} {format_versions(before)}")
+        else:
+            lines.append(f"bumped {name} {format_versions(before)} -> {format_versions(after)}")
+    return lines
+
+
+def summarize_lockfile(path: str, old_text: Optional[str], new_text: Optional[str]) -> Optional[str]:
+    """
+    Summary of the dependency changes of a lockfile, None when it is not a
+    known lockfile or cannot be parsed (its raw diff is then kept).
+    """
+    parser = get_parser(path)
+    if parser is None:
+        return None
+
+    try:
+        old = parser(old_text) if old_text is not None else {}
+        new = parser(new_text) if new_text is not None else {}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    lines = compare_versions(old, new)
+    if not lines:
+        return "[dependency file changed, no package versions changed]"
+    if len(lines) > MAX_SUMMARY_LINES:
+        lines = lines[:MAX_SUMMARY_LINES] + [f"... and {len(lines) - MAX_SUMMARY_LINES} more packages"]
+    return "[dependency changes]\n" + "\n".join(lines)
+
+
+def summarize_lockfiles(diff: str, read_old: Callable[[str], Optional[str]],
+                        read_new: Callable[[str], Optional[str]]) -> str:
+    """
+    Replace the hunks of the lockfiles and manifests of a diff by a summary of
+    their dependency changes. read_old and read_new return the content of a
+    path before and after the change, None when it does not exist.
+    """
+    files = parse_diff(diff)
+    if not any(get_parser(file_diff.path) for file_diff in files):
+        return diff
+
+    reduced = []
+    for file_diff in files:
+        summary = None
+        if file_diff.hunks and get_parser(file_diff.path):
+            summary = summarize_lockfile(file_diff.path, read_old(file_diff.path), read_new(file_diff.path))
+        if summary is None:
+            reduced.append(file_diff)
+        else:
+            header = file_diff.header.splitlines()[0]
+            reduced.append(FileDiff(header, file_diff.path, [summary]))
+    return render_diff(reduced)
@@ -1,5 +1,5 @@
 import tomllib
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 import yaml
 from dataclasses import dataclass
@@ -9,27 +9,36 @@ from dataclasses import dataclass
 class Models:
     model_name: str
     max_tokens: int
+    # Largest prompt the model handles well when cascading, None for no limit
+    max_prompt_tokens: Optional[int] = None
+    # Prompt plus answer size accepted by the model, None when unknown
+    context_window: Optional[int] = None
 
 
 GROQ_MODELS: List[Models] = [
-    Models(model_name="llama-3.3-70b-versatile", max_tokens=8000)
+    Models(model_name="llama-3.3-70b-versatile", max_tokens=8000, context_window=131072)
 ]
 
 
 HUGGING_FACE_MODELS: List[Models] = [
-    Models(model_name="Qwen/Qwen3-8B", max_tokens=32760),
+    Models(model_name="Qwen/Qwen3-8B", max_tokens=32760, context_window=32768),
 ]
 
+# Ordered from smallest to largest, the model cascade relies on it
 OLLAMA_MODELS: List[Models] = [
-    Models(model_name="deepseek-r1:1.5b", max_tokens=8000),
-    Models(model_name="deepseek-r1:7b", max_tokens=8000),
-    Models(model_name="deepseek-r1:8b", max_tokens=8000),
-    Models(model_name="deepseek-r1:14b", max_tokens=8000),
-    Models(model_name="phi4", max_tokens=8000),
+    Models(model_name="deepseek-r1:1.5b", max_tokens=8000, max_prompt_tokens=1000,
+           context_window=16384),
+    Models(model_name="deepseek-r1:7b", max_tokens=8000, max_prompt_tokens=2000,
+           context_window=16384),
+    Models(model_name="deepseek-r1:8b", max_tokens=8000, max_prompt_tokens=3000,
+           context_window=16384),
+    Models(model_name="deepseek-r1:14b", max_tokens=8000, max_prompt_tokens=6000,
+           context_window=16384),
+    Models(model_name="phi4", max_tokens=8000, context_window=16384),
 ]
 
 GEMINI_MODELS: List[Models] = [
-    Models(model_name="gemini-2.0-flash", max_tokens=8000)
+    Models(model_name="gemini-2.0-flash", max_tokens=8000, context_window=1048576)
 ]
 
 
@@ -71,6 +71,45 @@ class Prompts:
             </instructions>
           """
 
+    def build_commit_summary_system_prompt(self) -> str:
+        return """<instructions>
+            You will be provided with a single git commit: its message, diffstat and diff.
+            Your task is to summarize what the commit changes and why, so that the summaries
+            of all the commits of a branch can later be combined into a merge request description.
+
+            Formatting:
+            _MUST_ be one or two sentences, under 300 characters.
+            _MUST_ mention the main files, functions or features affected.
+            _MUST NOT_ Include any additional text, lists or markdown outside the summary.
+
+            Examples:
+            Good example: "Retry rate limited GitHub requests after Retry-After in platform_http.py."
+            Bad example: "This commit contains the following changes: - ..."
+            </instructions>
+            """
+
+    def build_merge_delta_system_prompt(self) -> str:
+        return f"""<instructions>
+            You are an expert git merge description generator.
+            You will be provided with the git commits pushed to a branch whose merge request
+            already has a description covering its earlier commits.
+            Your task is to describe only these new commits, as a follow-up to the existing description.
+
+            Requirements:
+
+            {self.rules}
+
+            Formatting:
+            _MUST_ be VERY CONCISE and to the point. Summarize the new changes in bullet points.
+            _MUST NOT_ repeat or introduce the merge request as a whole.
+            _MUST NOT_ Include any additional text or information outside the bullet points.
+
+            Examples:
+            Good example: "- Fix the retry delay of rate limited requests"
+            Bad example: "This merge request includes the following changes: ..."
+            </instructions>
+            """
+
     def build_merge_title_system_prompt(self) -> str:
         return f"""<instructions>
 
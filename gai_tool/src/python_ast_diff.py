@@ -0,0 +1,154 @@
+"""
+Structural summaries of Python source changes.
+
+Both versions of a module are parsed with ``ast`` and their definitions
+compared: functions and classes added, removed or renamed, signatures
+changed, bodies modified, and imports added or removed. On large refactors
+these few lines carry what the model needs from hunks many times their size,
+so they replace the raw hunks of Python files when the diff does not fit the
+token budget.
+"""
+
+import ast
+import hashlib
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Callable, Dict, List, Optional, Set
+
+from gai_tool.src.diffs import FileDiff, parse_diff, render_diff
+
+PYTHON_SUFFIXES = {".py", ".pyi"}
+
+
+@dataclass
+class Definition:
+    kind: str
+    signature: str
+    # Hash of the body, equal for a definition moved or renamed without changes
+    body: str
+
+
+def signature_of(node: ast.AST) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(base) for base in node.bases] + [ast.unparse(keyword) for keyword in node.keywords]
+        return f"({', '.join(bases)})" if bases else ""
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    return f"({ast.unparse(node.args)}){returns}"
+
+
+def collect_definitions(source: Optional[str]) -> Dict[str, Definition]:
+    """Functions and classes of a module by qualified name, nested ones included."""
+    definitions: Dict[str, Definition] = {}
+    if source is None:
+        return definitions
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                kind = "class" if isinstance(child, ast.ClassDef) else \
+                    "method" if prefix and isinstance(node, ast.ClassDef) else "function"
+                body = hashlib.sha1("\n".join(ast.dump(statement) for statement in child.body)
+                                    .encode("utf-8")).hexdigest()
+                name = f"{prefix}{child.name}"
+                definitions[name] = Definition(kind, signature_of(child), body)
+                visit(child, f"{name}.")
+            elif not isinstance(child, (ast.expr, ast.Lambda)):
+                # Definitions nested in if/try blocks
+                visit(child, prefix)
+
+    visit(ast.parse(source), "")
+    return definitions
+
+
+def collect_imports(source: Optional[str]) -> Set[str]:
+    imports: Set[str] = set()
+    if source is None:
+        return imports
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            imports.update(f"{module}.{alias.name}" for alias in node.names)
+    return imports
+
+
+def compare_definitions(old: Dict[str, Definition], new: Dict[str, Definition]) -> List[str]:
+    lines = []
+    removed = [name for name in old if name not in new]
+    added = [name for name in new if name not in old]
+
+    # A removed and an added definition of the same kind and body were renamed
+    for old_name in list(removed):
+        for new_name in added:
+            if old[old_name].kind == new[new_name].kind and old[old_name].body == new[new_name].body:
+                signature = "" if old[old_name].signature == new[new_name].signature else \
+                    f", signature {old[old_name].signature} -> {new[new_name].signature}"
+                lines.append(f"renamed {old[old_name].kind} {old_name} -> {new_name}{signature}")
+                removed.remove(old_name)
+                added.remove(new_name)
+                break
+
+    lines += [f"added {new[name].kind} {name}{new[name].signature}" for name in added]
+    lines += [f"removed {old[name].kind} {name}" for name in removed]
+
+    for name in old:
+        if name not in new:
+            continue
+        before, after = old[name], new[name]
+        if before.signature != after.signature:
+            lines.append(f"changed signature of {after.kind} {name}: {before.signature} -> {after.signature}")
+        elif before.body != after.body and after.kind != "class":
+            lines.append(f"modified {after.kind} {name}")
+    return lines
+
+
+def summarize_python_change(old_source: Optional[str], new_source: Optional[str]) -> Optional[str]:
+    """Structural changes of a module, None when a version cannot be parsed."""
+    try:
+        lines = compare_definitions(collect_definitions(old_source), collect_definitions(new_source))
+        old_imports, new_imports = collect_imports(old_source), collect_imports(new_source)
+    except (SyntaxError, ValueError):
+        return None
+
+    if new_imports - old_imports:
+        lines.append(f"added imports: {', '.join(sorted(new_imports - old_imports))}")
+    if old_imports - new_imports:
+        lines.append(f"removed imports: {', '.join(sorted(old_imports - new_imports))}")
+    return "[structural changes]\n" + "\n".join(lines or ["module-level code changed"])
+
+
+def is_python_file(path: str) -> bool:
+    return PurePosixPath(path).suffix in PYTHON_SUFFIXES
+
+
+def summarize_python_diffs(diff: str,
+                           read_old: Callable[[str], Optional[str]],
+                           read_new: Callable[[str], Optional[str]],
+                           token_budget: int,
+                           count_tokens: Callable[[str], int]) -> str:
+    """
+    When diff takes more than token_budget tokens, replace the hunks of its
+    Python files by their structural changes, largest files first, until it
+    fits. read_old and read_new return the content of a path before and after
+    the change, None when it does not exist.
+    """
+    total = count_tokens(diff)
+    if total <= token_budget:
+        return diff
+
+    files = parse_diff(diff)
+    sizes = {index: count_tokens(file_diff.render()) for index, file_diff in enumerate(files)
+             if file_diff.hunks and is_python_file(file_diff.path)}
+
+    for index in sorted(sizes, key=sizes.get, reverse=True):
+        if total <= token_budget:
+            break
+        file_diff = files[index]
+        summary = summarize_python_change(read_old(file_diff.path), read_new(file_diff.path))
+        if summary is None:
+            continue
+        files[index] = FileDiff(file_diff.header.splitlines()[0], file_diff.path, [summary])
+        total += count_tokens(files[index].render()) - sizes[index]
+
+    return render_diff(files)
@@ -4,10 +4,13 @@ from typing import Dict, List, Callable
 from colorama import Fore, Style
 from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
+from appdirs import user_cache_dir
 import subprocess
 
 TOOL_FOLDER = ".gai"
 RULES_FILE = "gai-rules.md"
+CACHE_DIR_ENV = "GAI_CACHE_DIR"
+CACHE_APP_NAME = "gai-tool"
 
 def read_gai_rules() -> str:
     """
@@ -19,6 +22,17 @@ def read_gai_rules() -> str:
     with rules_path.open('r') as f:
         return f.read()
 
+
+def get_cache_dir() -> Path:
+    """
+    Get the per-user cache folder of the tool, creating it if needed.
+    Can be overridden with the GAI_CACHE_DIR environment variable.
+    """
+    cache_dir = Path(os.environ.get(CACHE_DIR_ENV) or user_cache_dir(CACHE_APP_NAME))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
 def attr_is_defined(args, attr: str) -> bool:
     """
     Check if the specified attribute is defined in the given object.
@@ -0,0 +1,43 @@
+"""
+Hidden marker recording the last commit described by a merge request.
+
+The marker is an HTML comment at the end of the description, invisible once
+rendered by GitHub and GitLab. On later runs only the commits pushed after it
+are described, in a section appended to the existing description.
+"""
+
+import re
+from typing import Optional
+
+WATERMARK_PATTERN = re.compile(r"\n*<!-- gai:head=([0-9a-f]{7,40}) -->\s*")
+FOLLOW_UP_HEADING = "### Follow-up changes"
+
+
+def format_watermark(head_sha: str) -> str:
+    return f"<!-- gai:head={head_sha} -->"
+
+
+def read_watermark(description: Optional[str]) -> Optional[str]:
+    """Head SHA recorded in the description, None when it has no marker."""
+    match = WATERMARK_PATTERN.search(description or "")
+    return match.group(1) if match else None
+
+
+def strip_watermark(description: Optional[str]) -> str:
+    return WATERMARK_PATTERN.sub("", description or "").rstrip()
+
+
+def add_watermark(description: str, head_sha: str) -> str:
+    """Description ending with the marker of head_sha, replacing any previous one."""
+    return f"{strip_watermark(description)}\n\n{format_watermark(head_sha)}"
+
+
+def merge_delta(description: Optional[str], delta: str, head_sha: str) -> str:
+    """
+    Existing description with the delta of the new commits appended to its
+    follow-up section (created on the first update), and the marker moved to head_sha.
+    """
+    body = strip_watermark(description)
+    if FOLLOW_UP_HEADING not in body:
+        body = f"{body}\n\n{FOLLOW_UP_HEADING}"
+    return add_watermark(f"{body}\n\n{delta.strip()}", head_sha)
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Iterator, List
+
+import pytest
+
+from gai_tool.api.base_client import BaseAIClient
+
+# --------------------------
+# Helper Classes
+# --------------------------
+
+
+class FakeClient(BaseAIClient):
+    """
+    Minimal client used to exercise the shared async and streaming behaviour.
+    """
+
+    def __init__(self, response: str = "hello world", delay: float = 0, timeout: float = 1):
+        self.response = response
+        self.delay = delay
+        self.timeout = timeout
+        self.stream_closed = False
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self.response
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        await asyncio.sleep(self.delay)
+        return self.response
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        try:
+            for chunk in self.response.split(" "):
+                time.sleep(self.delay)
+                yield chunk
+        finally:
+            self.stream_closed = True
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        try:
+            for chunk in self.response.split(" "):
+                await asyncio.sleep(self.delay)
+                yield chunk
+        finally:
+            self.stream_closed = True
+
+
+MESSAGES = [{"role": "user", "content": "Say hi"}]
+
+# --------------------------
+# aget_chat_completion Tests
+# --------------------------
+
+
+def test_aget_chat_completion_success():
+    """
+    Test that aget_chat_completion returns the provider response.
+    """
+    client = FakeClient()
+
+    result = asyncio.run(client.aget_chat_completion(MESSAGES))
+
+    assert result == "hello world"
+
+
+def test_aget_chat_completion_invalid_messages():
+    """
+    Test that aget_chat_completion validates messages before calling the provider.
+    """
+    client = FakeClient()
+
+    with pytest.raises(ValueError, match="Message validation failed"):
+        asyncio.run(client.aget_chat_completion([{"role": "user"}]))
+
+
+def test_aget_chat_completion_timeout():
+    """
+    Test that aget_chat_completion raises TimeoutError when the provider is too slow.
+    """
+    client = FakeClient(delay=1, timeout=0.01)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.aget_chat_completion(MESSAGES))
+
+
+def test_aget_chat_completion_cancelled():
+    """
+    Test that cancelling the awaiting task propagates CancelledError.
+    """
+    client = FakeClient(delay=1)
+
+    async def run():
+        task = asyncio.create_task(client.aget_chat_completion(MESSAGES))
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
+
+# --------------------------
+# Streaming Tests
+# --------------------------
+
+
+def test_stream_chat_completion_yields_chunks():
+    """
+    Test that stream_chat_completion yields the provider chunks.
+    """
+    client = FakeClient()
+
+    assert list(client.stream_chat_completion(MESSAGES)) == ["hello", "world"]
+
+
+def test_stream_chat_completion_timeout_closes_stream():
+    """
+    Test that stream_chat_completion applies the timeout to the whole stream.
+    """
+    client = FakeClient(delay=0.02, timeout=0.01)
+
+    with pytest.raises(TimeoutError):
+        list(client.stream_chat_completion(MESSAGES))
+    assert client.stream_closed is True
+
+
+def test_astream_chat_completion_yields_chunks():
+    """
+    Test that astream_chat_completion yields the provider chunks and closes the stream.
+    """
+    client = FakeClient()
+
+    async def run():
+        return [chunk async for chunk in client.astream_chat_completion(MESSAGES)]
+
+    assert asyncio.run(run()) == ["hello", "world"]
+    assert client.stream_closed is True
+
+
+def test_astream_chat_completion_timeout_closes_stream():
+    """
+    Test that astream_chat_completion applies the timeout to the whole stream.
+    """
+    client = FakeClient(delay=1, timeout=0.01)
+
+    async def run():
+        return [chunk async for chunk in client.astream_chat_completion(MESSAGES)]
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+    assert client.stream_closed is True
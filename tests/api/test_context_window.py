@@ -0,0 +1,146 @@
+from typing import AsyncIterator, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from gai_tool.api.base_client import BaseAIClient
+from gai_tool.api.context_window import (
+    TRUNCATION_MARKER, ContextWindowExceeded, fit_to_context_window, prompt_budget)
+
+# --------------------------
+# Helper Classes
+# --------------------------
+
+
+class FakeClient(BaseAIClient):
+    """
+    Client echoing the prompt it would have sent.
+    """
+
+    def __init__(self, context_window=None, max_tokens=None):
+        self.model = "fake-model"
+        self.context_window = context_window
+        self.max_tokens = max_tokens
+        self.sent = None
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        self.sent = self.fit_context_window(user_message)
+        return "ok"
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        self.sent = user_message
+        return "ok"
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        self.sent = user_message
+        yield "ok"
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        self.sent = user_message
+        yield "ok"
+
+
+def count_characters(messages: List[Dict[str, str]]) -> int:
+    """
+    Helper token counter counting one token per character.
+    """
+    return sum(len(message["content"]) for message in messages)
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture(autouse=True)
+def mock_print():
+    """
+    Fixture to silence the truncation warnings.
+    """
+    with patch('builtins.print') as mock_print:
+        yield mock_print
+
+# --------------------------
+# prompt_budget Tests
+# --------------------------
+
+
+@pytest.mark.parametrize("context_window, max_output_tokens, expected", [
+    (None, 8000, None),
+    (131072, 8000, 123072),
+    # The answer never takes more than a quarter of the window
+    (16384, 8000, 12288),
+    (4000, None, 4000),
+])
+def test_prompt_budget(context_window, max_output_tokens, expected):
+    """
+    Test the prompt budget left once the answer is reserved.
+    """
+    assert prompt_budget(context_window, max_output_tokens) == expected
+
+# --------------------------
+# fit_to_context_window Tests
+# --------------------------
+
+
+def test_fit_keeps_prompt_within_budget(mock_print):
+    """
+    Test that a fitting prompt is returned as is, without any warning.
+    """
+    messages = [{"role": "system", "content": "rules"}, {"role": "user", "content": "diff"}]
+
+    assert fit_to_context_window(messages, "model", 100, count_characters) is messages
+    mock_print.assert_not_called()
+
+
+def test_fit_truncates_longest_message():
+    """
+    Test that the longest message is truncated until the prompt fits.
+    """
+    messages = [{"role": "system", "content": "rules"}, {"role": "user", "content": "x" * 1000}]
+
+    fitted = fit_to_context_window(messages, "model", 200, count_characters)
+
+    assert count_characters(fitted) <= 200
+    assert fitted[0] == messages[0]
+    assert fitted[1]["role"] == "user"
+    assert fitted[1]["content"].endswith(TRUNCATION_MARKER)
+    # The original messages are left untouched
+    assert messages[1]["content"] == "x" * 1000
+
+
+def test_fit_fails_fast_when_other_messages_do_not_fit():
+    """
+    Test that a prompt that cannot fit even fully truncated raises a clear error.
+    """
+    messages = [{"role": "system", "content": "r" * 500}, {"role": "user", "content": "x" * 600}]
+
+    with pytest.raises(ContextWindowExceeded, match="does not fit the 100 tokens available for model"):
+        fit_to_context_window(messages, "model", 100, count_characters)
+
+# --------------------------
+# BaseAIClient Preflight Tests
+# --------------------------
+
+
+def test_client_without_context_window_sends_prompt_unchanged():
+    """
+    Test that clients with an unknown context window do not touch the prompt.
+    """
+    client = FakeClient()
+    messages = [{"role": "user", "content": "x" * 100000}]
+
+    client.get_chat_completion(messages)
+
+    assert client.sent is messages
+
+
+def test_stream_is_truncated_before_sending():
+    """
+    Test that streamed prompts are checked against the context window too.
+    """
+    client = FakeClient(context_window=400, max_tokens=100)
+    client.count_prompt_tokens = count_characters
+    messages = [{"role": "user", "content": "x" * 1000}]
+
+    assert list(client.stream_chat_completion(messages)) == ["ok"]
+    assert count_characters(client.sent) <= 300
@@ -0,0 +1,262 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Iterator, List
+from unittest.mock import Mock
+
+import pytest
+
+from gai_tool.api.base_client import BaseAIClient
+from gai_tool.api.circuit_breaker import CircuitBreaker
+from gai_tool.api.fallback_client import FallbackClient
+from gai_tool.api.retry import RetryPolicy
+
+# --------------------------
+# Helper Classes & Functions
+# --------------------------
+
+
+class FakeClient(BaseAIClient):
+    """
+    Client returning the queued results in order, raising the exceptions among them.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self.get_chat_completion(user_message)
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        yield self.get_chat_completion(user_message)
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        yield self.get_chat_completion(user_message)
+
+
+def http_error(status_code, headers=None):
+    """
+    Helper function to create an exception carrying an HTTP response.
+    """
+    error = Exception(f"HTTP {status_code}")
+    error.response = Mock(status_code=status_code, headers=headers or {})
+    return error
+
+
+MESSAGES = [{"role": "user", "content": "Say hi"}]
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture
+def breaker(tmp_path):
+    """
+    Fixture to provide a circuit breaker persisted in a temporary folder.
+    """
+    return CircuitBreaker(path=tmp_path / "circuit_breaker.json", failure_threshold=2, cooldown=60)
+
+
+@pytest.fixture
+def mock_sleep():
+    """
+    Fixture to record backoff sleeps instead of waiting.
+    """
+    return Mock()
+
+
+def fallback(breaker, mock_sleep, **clients):
+    """
+    Helper function to build a FallbackClient over the given clients.
+    """
+    return FallbackClient(
+        providers=[(name, lambda client=client: client) for name, client in clients.items()],
+        retry_policy=RetryPolicy(max_retries=2, base_delay=0.1, max_delay=5),
+        circuit_breaker=breaker,
+        sleep=mock_sleep)
+
+# --------------------------
+# FallbackClient Tests
+# --------------------------
+
+
+def test_retries_then_succeeds(breaker, mock_sleep):
+    """
+    Test that a transient error is retried with backoff on the same provider.
+    """
+    groq = FakeClient(http_error(503), "answer")
+    client = fallback(breaker, mock_sleep, groq=groq)
+
+    assert client.get_chat_completion(MESSAGES) == "answer"
+    assert groq.calls == 2
+    mock_sleep.assert_called_once()
+
+
+def test_honors_retry_after(breaker, mock_sleep):
+    """
+    Test that the Retry-After of a 429 response is used as the backoff.
+    """
+    groq = FakeClient(http_error(429, {"retry-after": "2"}), "answer")
+    client = fallback(breaker, mock_sleep, groq=groq)
+
+    assert client.get_chat_completion(MESSAGES) == "answer"
+    mock_sleep.assert_called_once_with(2.0)
+
+
+def test_long_retry_after_falls_back(breaker, mock_sleep):
+    """
+    Test that a provider asking to wait too long is skipped and its circuit opened.
+    """
+    groq, google = FakeClient(http_error(429, {"retry-after": "600"})), FakeClient("from google")
+    client = fallback(breaker, mock_sleep, groq=groq, google=google)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("builtins.print", Mock())
+        assert client.get_chat_completion(MESSAGES) == "from google"
+
+    mock_sleep.assert_not_called()
+    assert breaker.is_open("groq")
+
+
+def test_non_retryable_error_falls_back(breaker, mock_sleep):
+    """
+    Test that configuration errors move to the next provider without retries or tripping the circuit.
+    """
+    google = FakeClient("from google")
+    client = FallbackClient(
+        providers=[("groq", Mock(side_effect=ValueError("GROQ_API_KEY is not set"))), ("google", lambda: google)],
+        circuit_breaker=breaker,
+        sleep=mock_sleep)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("builtins.print", Mock())
+        assert client.get_chat_completion(MESSAGES) == "from google"
+
+    mock_sleep.assert_not_called()
+    assert not breaker.is_open("groq")
+
+
+def test_all_providers_fail(breaker, mock_sleep):
+    """
+    Test that an error listing every provider is raised when the whole chain fails.
+    """
+    groq = FakeClient(http_error(401))
+    ollama = FakeClient(ConnectionError("refused"), ConnectionError("refused"), ConnectionError("refused"))
+    client = fallback(breaker, mock_sleep, groq=groq, ollama=ollama)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("builtins.print", Mock())
+        with pytest.raises(Exception, match="All providers failed") as exc_info:
+            client.get_chat_completion(MESSAGES)
+
+    assert "groq: HTTP 401" in str(exc_info.value)
+    assert "ollama: refused" in str(exc_info.value)
+    assert ollama.calls == 3
+
+
+def test_open_circuit_is_skipped(breaker, mock_sleep):
+    """
+    Test that a provider with an open circuit is not called at all.
+    """
+    breaker.record_failure("groq")
+    breaker.record_failure("groq")
+    groq, google = FakeClient("from groq"), FakeClient("from google")
+    client = fallback(breaker, mock_sleep, groq=groq, google=google)
+
+    assert client.get_chat_completion(MESSAGES) == "from google"
+    assert groq.calls == 0
+
+
+def test_invalid_response_falls_back(breaker, mock_sleep):
+    """
+    Test that a response rejected by the validator moves on to the next provider.
+    """
+    groq, google = FakeClient("not a list"), FakeClient('["a"]')
+    client = fallback(breaker, mock_sleep, groq=groq, google=google)
+
+    def must_be_list(response):
+        if not response.startswith("["):
+            raise ValueError("not a list")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("builtins.print", Mock())
+        assert client.get_valid_chat_completion(MESSAGES, validator=must_be_list) == '["a"]'
+
+
+def test_async_retries_then_falls_back(breaker, mock_sleep):
+    """
+    Test that the async path retries with an async backoff, then moves on to the next provider.
+    """
+    groq, google = FakeClient(http_error(503), http_error(503), http_error(503)), FakeClient("hello")
+    async_sleep = Mock(side_effect=lambda seconds: asyncio.sleep(0))
+    client = FallbackClient(
+        providers=[("groq", lambda: groq), ("google", lambda: google)],
+        retry_policy=RetryPolicy(max_retries=2, base_delay=0.1, max_delay=5),
+        circuit_breaker=breaker,
+        sleep=mock_sleep,
+        async_sleep=async_sleep)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("builtins.print", Mock())
+        assert asyncio.run(client.aget_chat_completion(MESSAGES)) == "hello"
+
+    assert async_sleep.call_count == 2
+    mock_sleep.assert_not_called()
+
+
+def test_async_completion_is_cancellable(breaker, mock_sleep):
+    """
+    Test that cancelling the async path stops the provider call instead of waiting for it.
+    """
+    class SlowClient(FakeClient):
+        async def _aget_completion(self, user_message):
+            await asyncio.sleep(5)
+            return "late"
+
+    client = fallback(breaker, mock_sleep, groq=SlowClient())
+
+    async def run():
+        task = asyncio.create_task(client.aget_chat_completion(MESSAGES))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start < 1
+
+# --------------------------
+# CircuitBreaker Tests
+# --------------------------
+
+
+def test_circuit_opens_after_threshold(breaker):
+    """
+    Test that the circuit opens after the failure threshold and closes on success.
+    """
+    breaker.record_failure("groq")
+    assert not breaker.is_open("groq")
+
+    breaker.record_failure("groq")
+    assert breaker.is_open("groq")
+
+    breaker.record_success("groq")
+    assert not breaker.is_open("groq")
+
+
+def test_circuit_state_is_persisted(breaker, tmp_path):
+    """
+    Test that an open circuit is still open for the next invocation.
+    """
+    breaker.record_failure("groq", retry_after=30)
+
+    assert CircuitBreaker(path=tmp_path / "circuit_breaker.json").is_open("groq")
@@ -1,9 +1,11 @@
+import asyncio
 import sys
 import types
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
+from gai_tool.api.base_client import DEFAULT_TIMEOUT
 from gai_tool.api.gemini_client import GeminiClient
 
 
@@ -50,6 +52,7 @@ def test_initialization_success(mock_env_api_key, mock_chat_google_generative_ai
         top_k=40,
         max_output_tokens=8000,
         callback_manager=None,
+        timeout=DEFAULT_TIMEOUT,
     )
     # The created instance should be assigned to the client
     assert client.llm is mock_chat.return_value
@@ -94,3 +97,29 @@ def test_get_chat_completion_error(mock_env_api_key, mock_chat_google_generative
 
     mock_validate_messages.assert_called_once_with(messages=messages)
     mock_llm.invoke.assert_called_once_with(messages)
+
+
+def test_aget_chat_completion_success(mock_env_api_key, mock_chat_google_generative_ai):
+    """aget_chat_completion should await the LLM natively and return the content."""
+    _, mock_llm = mock_chat_google_generative_ai
+
+    mock_llm.ainvoke = AsyncMock(return_value=Mock(content="hello async"))
+    messages = [{"role": "user", "content": "Say hi"}]
+
+    client = GeminiClient()
+    result = asyncio.run(client.aget_chat_completion(messages))
+
+    mock_llm.ainvoke.assert_awaited_once_with(messages)
+    assert result == "hello async"
+
+
+def test_stream_chat_completion(mock_env_api_key, mock_chat_google_generative_ai):
+    """stream_chat_completion should yield the content of each streamed chunk."""
+    _, mock_llm = mock_chat_google_generative_ai
+
+    mock_llm.stream.return_value = iter([Mock(content="hello "), Mock(content=""), Mock(content="world")])
+    messages = [{"role": "user", "content": "Say hi"}]
+
+    client = GeminiClient()
+
+    assert list(client.stream_chat_completion(messages)) == ["hello ", "world"]
@@ -181,10 +181,12 @@ def test_repo_property(mock_github, mock_repo, mock_merge_requests, mock_config_
 
         # Act
         repo = github_api.repo
+        repo_again = github_api.repo
 
         # Assert
-        mock_github_instance.get_repo.assert_called_once_with("owner/repo")
+        mock_github_instance.get_repo.assert_called_once_with("owner/repo", lazy=True)
         assert repo == mock_repo
+        assert repo_again is repo
 
 # --------------------------
 # get_current_branch Method Tests
@@ -253,6 +255,7 @@ def test_create_pull_request_success_new_pr(mock_github, mock_repo, mock_pull_re
             head="feature-branch",
             base="main"
         )
+        github_api.get_existing_pr.assert_called_once_with("feature-branch")
         mock_print.assert_any_call("Pull request created successfully.")
         mock_print.assert_any_call("Pull request URL: https://github.com/owner/repo/pull/1")
 
@@ -328,6 +331,65 @@ def test_create_pull_request_general_exception(mock_github, mock_repo, mock_merg
         # Assert
         mock_print.assert_any_call("Unexpected error: Unexpected error")
 
+
+def test_upsert_pull_request_for_given_branch(mock_github, mock_repo, mock_pull_request,
+                                              mock_merge_requests, mock_config_manager):
+    """
+    Test that upsert_pull_request creates the PR of the given branch without any lookup.
+    """
+    # Arrange
+    with patch.dict(os.environ, {"GITHUB_TOKEN": "fake_token"}):
+        github_api = Github_api()
+        github_api.get_current_branch = Mock()
+
+        mock_github.return_value.get_repo.return_value = mock_repo
+        mock_repo.create_pull.return_value = mock_pull_request
+
+        # Act
+        with patch('builtins.print'):
+            github_api.upsert_pull_request("Title", "Body", "feature-a", "main", None)
+
+        # Assert
+        github_api.get_current_branch.assert_not_called()
+        mock_repo.get_pulls.assert_not_called()
+        mock_repo.create_pull.assert_called_once_with(
+            title="Title", body="Body", head="feature-a", base="main")
+
+
+def test_get_open_prs_by_branch(mock_github, mock_repo, mock_merge_requests, mock_config_manager):
+    """
+    Test that the open PRs are listed once, indexed by head and base branches, leaving out forks.
+    """
+    # Arrange
+    with patch.dict(os.environ, {"GITHUB_TOKEN": "fake_token"}):
+        github_api = Github_api()
+
+        own_pr = Mock()
+        own_pr.head.ref, own_pr.head.label, own_pr.base.ref = "feature-a", "Owner:feature-a", "main"
+        release_pr = Mock()
+        release_pr.head.ref, release_pr.head.label, release_pr.base.ref = "feature-a", "owner:feature-a", "release"
+        fork_pr = Mock()
+        fork_pr.head.ref, fork_pr.head.label, fork_pr.base.ref = "feature-b", "someone:feature-b", "main"
+
+        mock_github.return_value.get_repo.return_value = mock_repo
+        mock_repo.get_pulls.return_value = [own_pr, release_pr, fork_pr]
+
+        # Act
+        result = github_api.get_open_prs_by_branch()
+
+        # Assert
+        assert result == {("feature-a", "main"): own_pr, ("feature-a", "release"): release_pr}
+        mock_repo.get_pulls.assert_called_once_with(state='open')
+
+
+def test_get_title_and_body():
+    """
+    Test that PRs without body read as an empty body.
+    """
+    pr = Mock(title="Title", body=None)
+
+    assert Github_api.get_title_and_body(pr) == ("Title", "")
+
 # --------------------------
 # get_existing_pr Method Tests
 # --------------------------
@@ -357,6 +419,32 @@ def test_get_existing_pr_success(mock_github, mock_repo, mock_pull_request, mock
         assert result == mock_pull_request
 
 
+def test_get_existing_pr_for_given_branch(mock_github, mock_repo, mock_pull_request,
+                                          mock_merge_requests, mock_config_manager):
+    """
+    Test that get_existing_pr does not look up the current branch when one is given.
+    """
+    # Arrange
+    with patch.dict(os.environ, {"GITHUB_TOKEN": "fake_token"}):
+        github_api = Github_api()
+        github_api.get_current_branch = Mock()
+
+        mock_github_instance = mock_github.return_value
+        mock_github_instance.get_repo.return_value = mock_repo
+        mock_repo.get_pulls.return_value = [mock_pull_request]
+
+        # Act
+        result = github_api.get_existing_pr("other-branch")
+
+        # Assert
+        github_api.get_current_branch.assert_not_called()
+        mock_repo.get_pulls.assert_called_once_with(
+            state='open',
+            head='owner:other-branch'
+        )
+        assert result == mock_pull_request
+
+
 def test_get_existing_pr_no_pr(mock_github, mock_repo, mock_merge_requests, mock_config_manager):
     """
     Test that get_existing_pr returns None when no PRs are found.
@@ -424,7 +512,7 @@ def test_update_pull_request_success(mock_pull_request, mock_merge_requests, moc
 
 def test_update_pull_request_github_exception(mock_pull_request, mock_merge_requests, mock_config_manager):
     """
-    Test that update_pull_request handles GithubException appropriately.
+    Test that update_pull_request raises GithubException, so that bulk syncs report it.
     """
     # Arrange
     from github import GithubException
@@ -432,29 +520,31 @@ def test_update_pull_request_github_exception(mock_pull_request, mock_merge_requ
     github_api = Github_api()
     mock_pull_request.edit.side_effect = GithubException(400, {"message": "Bad Request"})
 
-    # Act
-    with patch('builtins.print') as mock_print:
+    # Act & Assert
+    with pytest.raises(GithubException):
         github_api.update_pull_request(mock_pull_request, "Title", "Body")
 
-    # Assert
-    mock_print.assert_any_call("Failed to update pull request: 400")
-    mock_print.assert_any_call("Error message: {'message': 'Bad Request'}")
-
 
-def test_update_pull_request_general_exception(mock_pull_request, mock_merge_requests, mock_config_manager):
+def test_create_pull_request_update_failure(mock_github, mock_repo, mock_pull_request,
+                                            mock_merge_requests, mock_config_manager):
     """
-    Test that update_pull_request handles general exceptions appropriately.
+    Test that create_pull_request reports update failures of an existing PR.
     """
     # Arrange
-    github_api = Github_api()
-    mock_pull_request.edit.side_effect = Exception("Unexpected error")
+    from github import GithubException
 
-    # Act
-    with patch('builtins.print') as mock_print:
-        github_api.update_pull_request(mock_pull_request, "Title", "Body")
+    with patch.dict(os.environ, {"GITHUB_TOKEN": "fake_token"}):
+        github_api = Github_api()
+        github_api.get_current_branch = Mock(return_value="feature-branch")
+        github_api.get_existing_pr = Mock(return_value=mock_pull_request)
+        mock_pull_request.edit.side_effect = GithubException(400, {"message": "Bad Request"})
 
-    # Assert
-    mock_print.assert_any_call("Unexpected error: Unexpected error")
+        # Act
+        with patch('builtins.print') as mock_print:
+            github_api.create_pull_request("Title", "Body")
+
+        # Assert
+        mock_print.assert_any_call("Failed to update pull request: 400")
 
 # --------------------------
 # get_api_key Integration Tests
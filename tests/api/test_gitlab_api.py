@@ -1,10 +1,11 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch, MagicMock
 import os
 import subprocess
 import gitlab
 
 from gai_tool.api import Gitlab_api
+from gai_tool.api.platform_http import PlatformSession
 from tests.test_helpers import mock_subprocess_run_output
 
 
@@ -164,9 +165,41 @@ def test_initialize_gitlab_client(gitlab_api, mock_gitlab_client):
     # Assert
     mock_gitlab_client['gitlab_class'].assert_called_once_with(
         "https://gitlab.com",
-        private_token="test_token"
+        private_token="test_token",
+        session=ANY,
+        obey_rate_limit=False
     )
-    mock_gitlab_client['gitlab_instance'].projects.get.assert_called_once_with("owner/repo")
+    assert isinstance(mock_gitlab_client['gitlab_class'].call_args.kwargs['session'], PlatformSession)
+    mock_gitlab_client['gitlab_instance'].projects.get.assert_not_called()
+
+
+def test_project_is_lazy(gitlab_api, mock_gitlab_client):
+    """
+    Test that the project is only created on first use, without fetching it.
+    """
+    # Act
+    project = gitlab_api.project
+    project_again = gitlab_api.project
+
+    # Assert
+    mock_gitlab_client['gitlab_instance'].projects.get.assert_called_once_with("owner/repo", lazy=True)
+    assert project is mock_gitlab_client['project']
+    assert project_again is project
+
+
+def test_unknown_project_is_reported(gitlab_api, mock_gitlab_client):
+    """
+    Test that a 404 of the lazily created project is reported as a missing project.
+    """
+    # Arrange
+    mock_gitlab_client['mr_manager'].list.side_effect = gitlab.exceptions.GitlabListError(
+        "404 Project Not Found", response_code=404)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="GitLab project owner/repo not found"):
+        gitlab_api.get_existing_merge_request("feature-branch")
+    with pytest.raises(ValueError, match="GitLab project owner/repo not found"):
+        gitlab_api.get_open_merge_requests_by_branch()
 
 
 def test_get_api_key_success():
@@ -217,7 +250,8 @@ def test_get_existing_merge_request_found(gitlab_api, mock_gitlab_client):
     mock_gitlab_client['mr_manager'].list.assert_called_once_with(
         source_branch="feature-branch",
         state='opened',
-        all=True
+        per_page=1,
+        get_all=False
     )
 
 
@@ -236,7 +270,8 @@ def test_get_existing_merge_request_not_found(gitlab_api, mock_gitlab_client):
     mock_gitlab_client['mr_manager'].list.assert_called_once_with(
         source_branch="feature-branch",
         state='opened',
-        all=True
+        per_page=1,
+        get_all=False
     )
 
 
@@ -260,38 +295,32 @@ def test_update_merge_request_success(gitlab_api, mock_gitlab_client):
     """
     Test that update_merge_request updates an existing MR successfully.
     """
-    # Arrange
-    mock_mr = Mock()
-    mock_gitlab_client['mr_manager'].get.return_value = mock_mr
-
     # Act
     with patch('builtins.print') as mock_print:
         gitlab_api.update_merge_request(1, "New Title", "New Description")
 
     # Assert
-    mock_gitlab_client['mr_manager'].get.assert_called_once_with(1)
-    assert mock_mr.title == "New Title"
-    assert mock_mr.description == "New Description"
-    assert mock_mr.remove_source_branch is True
-    assert mock_mr.squash is True
-    mock_mr.save.assert_called_once()
+    mock_gitlab_client['mr_manager'].get.assert_not_called()
+    mock_gitlab_client['mr_manager'].update.assert_called_once_with(1, {
+        "title": "New Title",
+        "description": "New Description",
+        "remove_source_branch": True,
+        "squash": True
+    })
     mock_print.assert_called_once_with("Merge request updated successfully with internal ID: 1")
 
 
 def test_update_merge_request_failure(gitlab_api, mock_gitlab_client):
     """
-    Test that update_merge_request handles failures appropriately.
+    Test that update_merge_request raises failures, so that bulk syncs report them.
     """
     # Arrange
-    mock_gitlab_client['mr_manager'].get.side_effect = gitlab.exceptions.GitlabError("Update failed")
+    mock_gitlab_client['mr_manager'].update.side_effect = gitlab.exceptions.GitlabError("Update failed")
 
-    # Act
-    with patch('builtins.print') as mock_print:
+    # Act & Assert
+    with pytest.raises(gitlab.exceptions.GitlabError, match="Update failed"):
         gitlab_api.update_merge_request(1, "Title", "Description")
 
-    # Assert
-    mock_print.assert_called_once_with("Failed to update merge request: Update failed")
-
 
 def test_create_merge_request_new_mr(gitlab_api, mock_gitlab_client, mock_subprocess_run_success):
     """
@@ -344,10 +373,6 @@ def test_create_merge_request_existing_mr(gitlab_api, mock_gitlab_client, mock_s
     }
     mock_gitlab_client['mr_manager'].list.return_value = [mock_existing_mr]
 
-    # Mock get for update
-    mock_mr_for_update = Mock()
-    mock_gitlab_client['mr_manager'].get.return_value = mock_mr_for_update
-
     # Act
     with patch('builtins.print') as mock_print:
         gitlab_api.create_merge_request("Updated Title", "Updated Description")
@@ -357,10 +382,12 @@ def test_create_merge_request_existing_mr(gitlab_api, mock_gitlab_client, mock_s
     mock_gitlab_client['mr_manager'].create.assert_not_called()
 
     # Should call update
-    mock_gitlab_client['mr_manager'].get.assert_called_once_with(1)
-    assert mock_mr_for_update.title == "Updated Title"
-    assert mock_mr_for_update.description == "Updated Description"
-    mock_mr_for_update.save.assert_called_once()
+    mock_gitlab_client['mr_manager'].update.assert_called_once_with(1, {
+        "title": "Updated Title",
+        "description": "Updated Description",
+        "remove_source_branch": True,
+        "squash": True
+    })
 
     mock_print.assert_any_call("A merge request already exists: https://gitlab.com/owner/repo/-/merge_requests/1")
     mock_print.assert_any_call("Merge request updated successfully with internal ID: 1")
@@ -381,3 +408,66 @@ def test_create_merge_request_creation_failure(gitlab_api, mock_gitlab_client, m
 
     # Assert
     mock_print.assert_called_once_with("Failed to create merge request: Creation failed")
+
+
+def test_create_merge_request_update_failure(gitlab_api, mock_gitlab_client, mock_subprocess_run_success):
+    """
+    Test that create_merge_request reports update failures of an existing MR.
+    """
+    # Arrange
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("feature-branch\n")
+    mock_existing_mr = Mock()
+    mock_existing_mr._attrs = {'iid': 1, 'web_url': 'https://gitlab.com/owner/repo/-/merge_requests/1'}
+    mock_gitlab_client['mr_manager'].list.return_value = [mock_existing_mr]
+    mock_gitlab_client['mr_manager'].update.side_effect = gitlab.exceptions.GitlabUpdateError("Update failed")
+
+    # Act
+    with patch('builtins.print') as mock_print:
+        gitlab_api.create_merge_request("Title", "Description")
+
+    # Assert
+    mock_print.assert_any_call("Failed to update merge request: Update failed")
+
+
+def test_get_open_merge_requests_by_branch(gitlab_api, mock_gitlab_client):
+    """
+    Test that the open merge requests are listed once and indexed by source and target branches.
+    """
+    # Arrange
+    first = Mock(source_branch="feature-a", target_branch="main")
+    second = Mock(source_branch="feature-a", target_branch="release")
+    first._attrs = {'iid': 1}
+    second._attrs = {'iid': 2}
+    mock_gitlab_client['mr_manager'].list.return_value = iter([first, second])
+
+    # Act
+    result = gitlab_api.get_open_merge_requests_by_branch()
+
+    # Assert
+    assert result == {("feature-a", "main"): {'iid': 1}, ("feature-a", "release"): {'iid': 2}}
+    mock_gitlab_client['mr_manager'].list.assert_called_once_with(state='opened', iterator=True)
+
+
+def test_upsert_merge_request_for_given_branch(gitlab_api, mock_gitlab_client, mock_subprocess_run_success):
+    """
+    Test that upsert_merge_request creates the MR of the given branch without any lookup.
+    """
+    # Arrange
+    mock_gitlab_client['mr_manager'].create.return_value = Mock(iid=3, web_url="url")
+
+    # Act
+    with patch('builtins.print'):
+        gitlab_api.upsert_merge_request("Title", "Description", "feature-a", "main", None)
+
+    # Assert
+    mock_subprocess_run_success.assert_not_called()
+    mock_gitlab_client['mr_manager'].list.assert_not_called()
+    assert mock_gitlab_client['mr_manager'].create.call_args[0][0]["source_branch"] == "feature-a"
+    assert mock_gitlab_client['mr_manager'].create.call_args[0][0]["target_branch"] == "main"
+
+
+def test_get_title_and_description():
+    """
+    Test that MRs without description read as an empty description.
+    """
+    assert Gitlab_api.get_title_and_description({'title': "Title", 'description': None}) == ("Title", "")
@@ -0,0 +1,211 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterator, List
+from unittest.mock import Mock
+
+import pytest
+
+from gai_tool.api.base_client import BaseAIClient
+from gai_tool.api.hedged_client import HedgedClient, DEFAULT_HEDGE_DELAY
+
+# --------------------------
+# Helper Classes
+# --------------------------
+
+
+class FakeClient(BaseAIClient):
+    """
+    Client answering ``response`` after ``delay`` seconds, or raising ``error``.
+    """
+
+    def __init__(self, response: str = "[\"a\"]", delay: float = 0, error: Exception = None):
+        self.response = response
+        self.delay = delay
+        self.error = error
+        self.timeout = 5
+        self.calls = 0
+        self.cancelled = False
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self.response
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.response
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        yield self.response
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        yield self.response
+
+
+MESSAGES = [{"role": "user", "content": "Say hi"}]
+
+
+def hedged(primary, backup, **kwargs):
+    """
+    Helper function to build a HedgedClient with test names.
+    """
+    return HedgedClient(primary=primary, backup=backup, primary_name="ollama:phi4",
+                        backup_name="groq:llama", **kwargs)
+
+
+def must_be_list(response: str):
+    """
+    Helper validator rejecting anything that does not look like a list.
+    """
+    if not response.startswith("["):
+        raise ValueError("not a list")
+
+# --------------------------
+# resolve_hedge_delay Tests
+# --------------------------
+
+
+def test_resolve_hedge_delay_seconds():
+    """
+    Test that a numeric hedge delay is used as is.
+    """
+    client = hedged(FakeClient(), FakeClient(), hedge_delay=0.5)
+
+    assert client.resolve_hedge_delay() == 0.5
+
+
+def test_resolve_hedge_delay_percentile():
+    """
+    Test that a percentile hedge delay reads the primary latency history.
+    """
+    tracker = Mock()
+    tracker.percentile.return_value = 1.5
+    client = hedged(FakeClient(), FakeClient(), hedge_delay="p90", latency_tracker=tracker)
+
+    assert client.resolve_hedge_delay() == 1.5
+    tracker.percentile.assert_called_once_with("ollama:phi4", 0.9)
+
+
+def test_resolve_hedge_delay_without_history():
+    """
+    Test that the default delay is used when there is no latency history.
+    """
+    client = hedged(FakeClient(), FakeClient(), hedge_delay="p90")
+
+    assert client.resolve_hedge_delay() == DEFAULT_HEDGE_DELAY
+
+
+@pytest.mark.parametrize("hedge_delay", ["p", "p9x", "fast", "p101", -1])
+def test_invalid_hedge_delay(hedge_delay):
+    """
+    Test that invalid hedge delays are rejected when the client is built.
+    """
+    with pytest.raises(ValueError, match="Invalid hedge_delay"):
+        hedged(FakeClient(), FakeClient(), hedge_delay=hedge_delay)
+
+# --------------------------
+# get_valid_chat_completion Tests
+# --------------------------
+
+
+def test_fast_primary_skips_backup():
+    """
+    Test that the backup is never sent when the primary answers within the hedge delay.
+    """
+    primary, backup = FakeClient('["primary"]'), FakeClient('["backup"]')
+    client = hedged(primary, backup, hedge_delay=1)
+
+    assert client.get_valid_chat_completion(MESSAGES, validator=must_be_list) == '["primary"]'
+    assert backup.calls == 0
+
+
+def test_slow_primary_is_cancelled():
+    """
+    Test that a stalled primary is hedged and cancelled once the backup answers.
+    """
+    primary, backup = FakeClient('["primary"]', delay=5), FakeClient('["backup"]')
+    client = hedged(primary, backup, hedge_delay=0.01)
+
+    assert client.get_valid_chat_completion(MESSAGES, validator=must_be_list) == '["backup"]'
+    assert primary.cancelled is True
+
+
+def test_invalid_response_is_discarded():
+    """
+    Test that a response rejected by the validator does not win the race.
+    """
+    primary, backup = FakeClient("not a list"), FakeClient('["backup"]', delay=0.01)
+    client = hedged(primary, backup, hedge_delay=0)
+
+    assert client.get_valid_chat_completion(MESSAGES, validator=must_be_list) == '["backup"]'
+
+
+def test_primary_failure_sends_backup_immediately():
+    """
+    Test that a failing primary triggers the backup without waiting for the hedge delay.
+    """
+    primary, backup = FakeClient(error=Exception("boom")), FakeClient('["backup"]')
+    client = hedged(primary, backup, hedge_delay=60)
+
+    assert client.get_chat_completion(MESSAGES) == '["backup"]'
+
+
+def test_all_requests_fail():
+    """
+    Test that an error listing every provider is raised when all requests fail.
+    """
+    primary, backup = FakeClient(error=Exception("boom")), FakeClient(error=Exception("rate limited"))
+    client = hedged(primary, backup, hedge_delay=0)
+
+    with pytest.raises(Exception, match="All hedged requests failed") as exc_info:
+        client.get_chat_completion(MESSAGES)
+
+    assert "ollama:phi4: boom" in str(exc_info.value)
+    assert "groq:llama: rate limited" in str(exc_info.value)
+
+
+def test_latency_is_recorded():
+    """
+    Test that the winning response latency is recorded for its provider.
+    """
+    tracker = Mock()
+    client = hedged(FakeClient(), FakeClient(), hedge_delay=1, latency_tracker=tracker)
+
+    client.get_chat_completion(MESSAGES)
+
+    tracker.record.assert_called_once()
+    assert tracker.record.call_args[0][0] == "ollama:phi4"
+
+
+def test_cancelled_primary_latency_is_recorded_as_censored():
+    """
+    Test that a primary losing the race is recorded with at least the hedge delay.
+    """
+    tracker = Mock()
+    primary, backup = FakeClient('["primary"]', delay=5), FakeClient('["backup"]')
+    client = hedged(primary, backup, hedge_delay=0.05, latency_tracker=tracker)
+
+    client.get_chat_completion(MESSAGES)
+
+    recorded = {call[0][0]: call[0][1] for call in tracker.record.call_args_list}
+    assert set(recorded) == {"ollama:phi4", "groq:llama"}
+    assert 0.05 <= recorded["ollama:phi4"] < 5
+
+
+def test_failures_are_recorded():
+    """
+    Test that a failing provider is recorded as a failure, but not an invalid configuration.
+    """
+    tracker = Mock()
+    primary, backup = FakeClient(error=Exception("boom")), FakeClient(error=ValueError("API key is not set"))
+    client = hedged(primary, backup, hedge_delay=0, latency_tracker=tracker)
+
+    with pytest.raises(Exception, match="All hedged requests failed"):
+        client.get_chat_completion(MESSAGES)
+
+    tracker.record_failure.assert_called_once_with("ollama:phi4")
+    tracker.record.assert_not_called()
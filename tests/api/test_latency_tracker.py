@@ -0,0 +1,119 @@
+import pytest
+
+from gai_tool.api.latency_tracker import LatencyTracker
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture
+def latency_path(tmp_path):
+    """
+    Fixture to provide a temporary latency history file.
+    """
+    return tmp_path / "latency.json"
+
+# --------------------------
+# LatencyTracker Tests
+# --------------------------
+
+
+def test_record_persists_history(latency_path):
+    """
+    Test that recorded latencies are saved and loaded back by a new tracker.
+    """
+    tracker = LatencyTracker(path=latency_path)
+
+    tracker.record("groq:model", 1.2345)
+
+    assert LatencyTracker(path=latency_path).history["groq:model"]["samples"] == [[1.234, None]]
+
+
+def test_record_keeps_most_recent_samples(latency_path):
+    """
+    Test that only the most recent max_samples latencies are kept.
+    """
+    tracker = LatencyTracker(path=latency_path, max_samples=3)
+
+    for seconds in [1, 2, 3, 4, 5]:
+        tracker.record("groq:model", seconds)
+
+    assert tracker.history["groq:model"]["samples"] == [[3, None], [4, None], [5, None]]
+
+
+def test_percentile_needs_enough_samples(latency_path):
+    """
+    Test that percentile returns None while the history is too short.
+    """
+    tracker = LatencyTracker(path=latency_path)
+    tracker.record("groq:model", 1)
+
+    assert tracker.percentile("groq:model", 0.9) is None
+    assert tracker.percentile("unknown", 0.9) is None
+
+
+def test_percentile_success(latency_path):
+    """
+    Test that percentile returns the nearest-rank percentile of the samples.
+    """
+    tracker = LatencyTracker(path=latency_path)
+    for seconds in range(1, 11):
+        tracker.record("groq:model", seconds)
+
+    assert tracker.percentile("groq:model", 0.9) == 9
+    assert tracker.percentile("groq:model", 0.5) == 5
+
+
+def test_load_corrupted_file(latency_path):
+    """
+    Test that a corrupted history file is ignored.
+    """
+    latency_path.write_text("not json")
+
+    assert LatencyTracker(path=latency_path).history == {}
+
+# --------------------------
+# expected_latency Tests
+# --------------------------
+
+
+def test_expected_latency_without_history(latency_path):
+    """
+    Test that expected_latency returns None for unknown providers.
+    """
+    assert LatencyTracker(path=latency_path).expected_latency("groq:model", 1000) is None
+
+
+def test_expected_latency_uses_ewma(latency_path):
+    """
+    Test that the EWMA follows recent latencies when prompt sizes are unknown.
+    """
+    tracker = LatencyTracker(path=latency_path)
+    tracker.record("groq:model", 1.0)
+    tracker.record("groq:model", 2.0)
+
+    assert tracker.expected_latency("groq:model", 1000) == pytest.approx(1.3)
+
+
+def test_expected_latency_scales_with_prompt_size(latency_path):
+    """
+    Test that latency is extrapolated linearly from recorded prompt sizes.
+    """
+    tracker = LatencyTracker(path=latency_path)
+    for tokens in [1000, 2000, 3000, 4000, 5000]:
+        tracker.record("ollama:phi4", 0.5 + tokens / 1000, prompt_tokens=tokens)
+
+    assert tracker.expected_latency("ollama:phi4", 10000) == pytest.approx(10.5)
+
+
+def test_expected_latency_penalizes_failures(latency_path):
+    """
+    Test that a provider that fails often is expected to take longer.
+    """
+    tracker = LatencyTracker(path=latency_path)
+    tracker.record("groq:model", 1.0)
+    tracker.record_failure("groq:model")
+
+    assert tracker.failure_rate("groq:model") == pytest.approx(0.3)
+    assert tracker.expected_latency("groq:model", 100) == pytest.approx(1 / 0.7)
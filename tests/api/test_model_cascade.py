@@ -0,0 +1,150 @@
+from typing import AsyncIterator, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from gai_tool.api.base_client import BaseAIClient
+from gai_tool.api.model_cascade import ModelCascade
+from gai_tool.src.myconfig import Models
+
+# --------------------------
+# Helper Classes
+# --------------------------
+
+
+class FakeClient(BaseAIClient):
+    """
+    Client answering with a fixed response.
+    """
+
+    def __init__(self, response: str):
+        self.response = response
+        self.calls = 0
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        self.calls += 1
+        return self.response
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self.response
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        yield self.response
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        yield self.response
+
+
+MODELS = [
+    Models(model_name="small", max_tokens=8000, max_prompt_tokens=100),
+    Models(model_name="medium", max_tokens=8000, max_prompt_tokens=1000),
+    Models(model_name="large", max_tokens=8000),
+]
+
+MESSAGES = [{"role": "user", "content": "Say hi"}]
+
+
+def must_be_list(response: str):
+    """
+    Helper validator rejecting anything that does not look like a list.
+    """
+    if not response.startswith("["):
+        raise ValueError("not a list")
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture(autouse=True)
+def mock_print():
+    """
+    Fixture to silence the model selection messages.
+    """
+    with patch('builtins.print') as mock_print:
+        yield mock_print
+
+
+@pytest.fixture
+def clients():
+    """
+    Fixture to provide one fake client per model.
+    """
+    return {"small": FakeClient("small answer"), "medium": FakeClient('["medium"]'), "large": FakeClient('["large"]')}
+
+# --------------------------
+# ModelCascade Tests
+# --------------------------
+
+
+@pytest.mark.parametrize("prompt_tokens, expected", [(10, 0), (100, 0), (101, 1), (5000, 2)])
+def test_select_smallest_fitting_model(prompt_tokens, expected):
+    """
+    Test that the smallest model whose prompt limit covers the prompt is selected.
+    """
+    cascade = ModelCascade(MODELS, factory=lambda model: None)
+
+    assert cascade.select(prompt_tokens) == expected
+
+
+def test_get_chat_completion_uses_measured_tokens(clients):
+    """
+    Test that the model is chosen from the measured prompt tokens.
+    """
+    cascade = ModelCascade(MODELS, factory=lambda model: clients[model.model_name], token_counter=lambda m: 500)
+
+    assert cascade.get_chat_completion(MESSAGES) == '["medium"]'
+    assert clients["small"].calls == 0
+
+
+def test_get_valid_chat_completion_escalates(clients):
+    """
+    Test that an unparsable answer from a small model escalates to the next one.
+    """
+    cascade = ModelCascade(MODELS, factory=lambda model: clients[model.model_name], token_counter=lambda m: 10)
+
+    assert cascade.get_valid_chat_completion(MESSAGES, validator=must_be_list) == '["medium"]'
+    assert clients["small"].calls == 1
+    assert clients["large"].calls == 0
+
+
+def test_get_valid_chat_completion_largest_fails():
+    """
+    Test that the validation error is raised when even the largest model answer is unusable.
+    """
+    cascade = ModelCascade(MODELS[-1:], factory=lambda model: FakeClient("nope"))
+
+    with pytest.raises(ValueError, match="not a list"):
+        cascade.get_valid_chat_completion(MESSAGES, validator=must_be_list)
+
+
+def test_clients_are_built_once(clients):
+    """
+    Test that each model client is only built the first time it is used.
+    """
+    built = []
+
+    def factory(model):
+        built.append(model.model_name)
+        return clients[model.model_name]
+
+    cascade = ModelCascade(MODELS, factory=factory, token_counter=lambda m: 10)
+    cascade.get_chat_completion(MESSAGES)
+    cascade.get_chat_completion(MESSAGES)
+
+    assert built == ["small"]
+
+
+def test_select_skips_models_with_small_context_window():
+    """
+    Test that a model whose context window cannot hold the prompt is skipped.
+    """
+    models = [
+        Models(model_name="small", max_tokens=1000, max_prompt_tokens=5000, context_window=4000),
+        Models(model_name="large", max_tokens=1000, context_window=32000),
+    ]
+    cascade = ModelCascade(models, factory=lambda model: FakeClient("answer"))
+
+    # 4000 - min(1000, 4000 // 4) = 3000 prompt tokens fit the small model
+    assert cascade.select(3000) == 0
+    assert cascade.select(3001) == 1
@@ -0,0 +1,330 @@
+import json
+import os
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+from github import Github
+
+from gai_tool.api.platform_http import EtagCache, PlatformSession, use_platform_session
+from gai_tool.api.retry import RetryPolicy
+
+# --------------------------
+# Fake Platform API
+# --------------------------
+
+
+class FakeApi:
+    """
+    Scripted answers of a fake platform API, keyed by path. Each answer is a
+    (status, headers, body) tuple, the last one of a path is repeated.
+    """
+
+    def __init__(self):
+        self.answers = {}
+        self.requests = []
+
+    def answer(self, path, *answers):
+        self.answers[path] = list(answers)
+
+    def next_answer(self, path):
+        answers = self.answers.get(path, [(404, {}, {"message": "Not Found"})])
+        return answers.pop(0) if len(answers) > 1 else answers[0]
+
+
+def make_handler(api):
+    """
+    Helper building a request handler answering from ``api``.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def handle_request(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            api.requests.append((self.command, self.path, dict(self.headers)))
+
+            status, headers, body = api.next_answer(self.path)
+            etag = headers.get("ETag")
+            if etag is not None and self.headers.get("If-None-Match") == etag:
+                status, body = 304, None
+
+            payload = b"" if body is None else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PATCH = do_PUT = handle_request
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture
+def fake_api():
+    """
+    Fixture to serve a fake platform API on a local port.
+    """
+    api = FakeApi()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(api))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+
+    api.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield api
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleep():
+    """
+    Fixture to record the waits instead of sleeping.
+    """
+    return Mock()
+
+
+@pytest.fixture
+def session(tmp_path, sleep):
+    """
+    Fixture to provide a session caching in a temporary folder.
+    """
+    return PlatformSession(
+        retry_policy=RetryPolicy(max_retries=3, base_delay=1.0, max_delay=60.0),
+        etag_cache=EtagCache(tmp_path),
+        sleep=sleep,
+        clock=lambda: 1000.0)
+
+# --------------------------
+# Conditional Request Tests
+# --------------------------
+
+
+def test_get_is_revalidated_with_etag(fake_api, session):
+    """
+    Test that a repeated GET is sent with If-None-Match and served from the cache on 304.
+    """
+    fake_api.answer("/repos/owner/repo", (200, {"ETag": '"v1"'}, {"name": "repo"}))
+
+    first = session.get(f"{fake_api.url}/repos/owner/repo")
+    second = session.get(f"{fake_api.url}/repos/owner/repo")
+
+    assert first.json() == second.json() == {"name": "repo"}
+    assert second.status_code == 200
+    assert "If-None-Match" not in fake_api.requests[0][2]
+    assert fake_api.requests[1][2]["If-None-Match"] == '"v1"'
+
+
+def test_etag_cache_is_shared_between_sessions(fake_api, tmp_path, sleep):
+    """
+    Test that cached responses are reused by later runs.
+    """
+    fake_api.answer("/repos/owner/repo", (200, {"ETag": '"v1"'}, {"name": "repo"}))
+    PlatformSession(etag_cache=EtagCache(tmp_path), sleep=sleep).get(f"{fake_api.url}/repos/owner/repo")
+
+    response = PlatformSession(etag_cache=EtagCache(tmp_path), sleep=sleep).get(f"{fake_api.url}/repos/owner/repo")
+
+    assert response.json() == {"name": "repo"}
+    assert fake_api.requests[1][2]["If-None-Match"] == '"v1"'
+
+
+def test_etag_cache_is_per_token(fake_api, session):
+    """
+    Test that responses are not shared between credentials.
+    """
+    fake_api.answer("/repos/owner/repo", (200, {"ETag": '"v1"'}, {"name": "repo"}))
+
+    session.get(f"{fake_api.url}/repos/owner/repo", headers={"Authorization": "token a"})
+    session.get(f"{fake_api.url}/repos/owner/repo", headers={"Authorization": "token b"})
+
+    assert "If-None-Match" not in fake_api.requests[1][2]
+
+
+def test_etag_cache_is_per_media_type(fake_api, session):
+    """
+    Test that a response fetched with one Accept header is not served for another.
+    """
+    fake_api.answer("/repos/owner/repo/pulls/1", (200, {"ETag": '"v1"'}, {"number": 1}))
+
+    session.get(f"{fake_api.url}/repos/owner/repo/pulls/1", headers={"Accept": "application/vnd.github+json"})
+    session.get(f"{fake_api.url}/repos/owner/repo/pulls/1", headers={"Accept": "application/vnd.github.diff"})
+
+    assert "If-None-Match" not in fake_api.requests[1][2]
+
+
+def cached_response(etag, body):
+    """
+    Helper building a response to store in the cache.
+    """
+    response = Mock()
+    response.headers = {"ETag": etag, "Content-Type": "application/json", "X-GitHub-Request-Id": "1"}
+    response.content = json.dumps(body).encode("utf-8")
+    return response
+
+
+def test_etag_cache_files_are_private(tmp_path):
+    """
+    Test that cached responses are only readable by the user, without their unneeded headers.
+    """
+    cache = EtagCache(tmp_path / "http")
+    cache.put("key", cached_response('"v1"', {"name": "repo"}))
+
+    assert stat.S_IMODE(os.stat(tmp_path / "http" / "key.json").st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(tmp_path / "http").st_mode) == 0o700
+    assert EtagCache(tmp_path / "http").get("key")["headers"] == {"Content-Type": "application/json"}
+
+
+def test_etag_cache_entries_expire(tmp_path):
+    """
+    Test that entries older than max_age are dropped.
+    """
+    now = [1000.0]
+    cache = EtagCache(tmp_path, max_age=60, clock=lambda: now[0])
+    cache.put("key", cached_response('"v1"', {}))
+
+    now[0] += 61
+
+    assert cache.get("key") is None
+    assert not (tmp_path / "key.json").exists()
+
+
+def test_etag_cache_evicts_least_recently_used(tmp_path):
+    """
+    Test that the least recently used entries are evicted beyond max_entries.
+    """
+    cache = EtagCache(tmp_path, max_entries=2)
+    cache.put("a", cached_response('"a"', {}))
+    cache.put("b", cached_response('"b"', {}))
+    os.utime(tmp_path / "a.json", (1, 1))
+    os.utime(tmp_path / "b.json", (2, 2))
+    # Reading a makes b the least recently used
+    cache.get("a")
+
+    cache.put("c", cached_response('"c"', {}))
+
+    assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["a", "c"]
+
+# --------------------------
+# Rate Limit Tests
+# --------------------------
+
+
+def test_429_is_retried_after_retry_after(fake_api, session, sleep):
+    """
+    Test that a rate limited request is retried after the Retry-After delay.
+    """
+    fake_api.answer("/projects/1/merge_requests",
+                    (429, {"Retry-After": "3"}, {"message": "Too Many Requests"}),
+                    (200, {}, []))
+
+    response = session.get(f"{fake_api.url}/projects/1/merge_requests")
+
+    assert response.status_code == 200
+    sleep.assert_called_once_with(3.0)
+    assert len(fake_api.requests) == 2
+
+
+def test_exhausted_quota_waits_for_reset(fake_api, session, sleep):
+    """
+    Test that a 403 with an exhausted quota is retried once the quota resets.
+    """
+    fake_api.answer("/repos/owner/repo/pulls",
+                    (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1010"}, {"message": "rate limit"}),
+                    (200, {}, []))
+
+    response = session.post(f"{fake_api.url}/repos/owner/repo/pulls", json={})
+
+    assert response.status_code == 200
+    sleep.assert_called_once_with(10.0)
+
+
+def test_exhausted_quota_delays_next_request(fake_api, session, sleep):
+    """
+    Test that the request following an exhausted quota waits for its reset.
+    """
+    fake_api.answer("/user", (200, {"RateLimit-Remaining": "0", "RateLimit-Reset": "1005"}, {}))
+
+    session.get(f"{fake_api.url}/user")
+    sleep.assert_not_called()
+    session.get(f"{fake_api.url}/user")
+
+    sleep.assert_called_once_with(5.0)
+
+
+def test_forbidden_is_not_retried(fake_api, session, sleep):
+    """
+    Test that a plain 403 (missing permissions) is returned straight away.
+    """
+    fake_api.answer("/repos/owner/repo", (403, {}, {"message": "Forbidden"}))
+
+    response = session.get(f"{fake_api.url}/repos/owner/repo")
+
+    assert response.status_code == 403
+    sleep.assert_not_called()
+
+
+def test_long_retry_after_is_not_waited(fake_api, session, sleep):
+    """
+    Test that waits longer than the retry policy allows give up straight away.
+    """
+    fake_api.answer("/user", (429, {"Retry-After": "3600"}, {}))
+
+    response = session.get(f"{fake_api.url}/user")
+
+    assert response.status_code == 429
+    sleep.assert_not_called()
+
+
+def test_server_errors_only_retried_when_idempotent(fake_api, session, sleep):
+    """
+    Test that server errors are retried for GET but not for POST.
+    """
+    fake_api.answer("/flaky", (502, {}, {}), (200, {}, {"ok": True}))
+    assert session.get(f"{fake_api.url}/flaky").status_code == 200
+
+    fake_api.answer("/flaky", (502, {}, {}), (200, {}, {"ok": True}))
+    assert session.post(f"{fake_api.url}/flaky", json={}).status_code == 502
+
+# --------------------------
+# PyGithub Integration Tests
+# --------------------------
+
+
+def test_use_platform_session_with_pygithub(fake_api, tmp_path, sleep):
+    """
+    Test that PyGithub requests go through the platform session.
+    """
+    repo = {"name": "repo", "full_name": "owner/repo", "url": f"{fake_api.url}/repos/owner/repo"}
+    fake_api.answer("/repos/owner/repo",
+                    (429, {"Retry-After": "1"}, {"message": "Too Many Requests"}),
+                    (200, {"ETag": '"v1"'}, repo))
+
+    github = Github(base_url=fake_api.url)
+    assert use_platform_session(
+        github, lambda: PlatformSession(etag_cache=EtagCache(tmp_path), sleep=sleep)) is True
+
+    assert github.get_repo("owner/repo").full_name == "owner/repo"
+    assert github.get_repo("owner/repo").full_name == "owner/repo"
+
+    sleep.assert_called_once_with(1.0)
+    assert fake_api.requests[-1][2]["If-None-Match"] == '"v1"'
+
+
+def test_use_platform_session_unknown_client(capsys):
+    """
+    Test that clients not looking like PyGithub are left untouched, with a warning.
+    """
+    assert use_platform_session(Mock()) is False
+    assert "Unsupported PyGithub version" in capsys.readouterr().out
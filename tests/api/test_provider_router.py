@@ -0,0 +1,187 @@
+import asyncio
+import os
+from typing import AsyncIterator, Dict, Iterator, List
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from gai_tool.api.base_client import BaseAIClient, approximate_prompt_tokens
+from gai_tool.api.latency_tracker import LatencyTracker
+from gai_tool.api.provider_router import ProviderRouter, RouteCandidate, is_configured, probe_provider
+
+# --------------------------
+# Helper Classes
+# --------------------------
+
+
+class FakeClient(BaseAIClient):
+    """
+    Client returning a fixed response, or raising ``error``.
+    """
+
+    def __init__(self, response: str = "answer", error: Exception = None):
+        self.response = response
+        self.error = error
+        self.calls = 0
+
+    def get_chat_completion(self, user_message: List[Dict[str, str]]) -> str:
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.response
+
+    async def _aget_completion(self, user_message: List[Dict[str, str]]) -> str:
+        return self.get_chat_completion(user_message)
+
+    def _stream_completion(self, user_message: List[Dict[str, str]]) -> Iterator[str]:
+        yield self.response
+
+    async def _astream_completion(self, user_message: List[Dict[str, str]]) -> AsyncIterator[str]:
+        yield self.response
+
+
+MESSAGES = [{"role": "user", "content": "x" * 4000}]
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    """
+    Fixture to provide a latency tracker persisted in a temporary folder.
+    """
+    return LatencyTracker(path=tmp_path / "latency.json")
+
+
+@pytest.fixture(autouse=True)
+def mock_print():
+    """
+    Fixture to silence the routing messages.
+    """
+    with patch('builtins.print') as mock_print:
+        yield mock_print
+
+
+def candidate(interface, client):
+    """
+    Helper function to create a route candidate for a fake client.
+    """
+    return RouteCandidate(interface=interface, model="model", factory=lambda: client)
+
+# --------------------------
+# rank Method Tests
+# --------------------------
+
+
+def test_rank_prefers_lowest_expected_latency(tracker):
+    """
+    Test that the provider with the lowest recorded latency is ranked first.
+    """
+    tracker.record("groq:model", 3.0)
+    tracker.record("ollama:model", 1.0)
+    probe = Mock()
+    router = ProviderRouter([candidate("groq", FakeClient()), candidate("ollama", FakeClient())], tracker, probe=probe)
+
+    assert [c.interface for c in router.rank(1000)] == ["ollama", "groq"]
+    probe.assert_not_called()
+
+
+def test_rank_probes_providers_without_history(tracker):
+    """
+    Test that providers without history are probed once and unreachable ones are dropped.
+    """
+    probe = Mock(return_value={"google": 0.2, "ollama": None})
+    router = ProviderRouter([candidate("ollama", FakeClient()), candidate("google", FakeClient())], tracker,
+                            probe=probe)
+
+    assert [c.interface for c in router.rank(1000)] == ["google"]
+    router.rank(1000)
+    probe.assert_called_once_with(["google", "ollama"])
+
+# --------------------------
+# get_chat_completion Method Tests
+# --------------------------
+
+
+def test_get_chat_completion_records_latency(tracker):
+    """
+    Test that the routed call is recorded with the prompt size.
+    """
+    router = ProviderRouter([candidate("groq", FakeClient())], tracker, probe=Mock(return_value={"groq": 0.1}))
+
+    assert router.get_chat_completion(MESSAGES) == "answer"
+    assert tracker.history["groq:model"]["samples"][0][1] == approximate_prompt_tokens(MESSAGES)
+
+
+def test_get_chat_completion_falls_back_on_failure(tracker):
+    """
+    Test that a failing provider is recorded as such and the next best one is used.
+    """
+    tracker.record("groq:model", 1.0)
+    tracker.record("ollama:model", 2.0)
+    groq, ollama = FakeClient(error=ConnectionError("down")), FakeClient("from ollama")
+    router = ProviderRouter([candidate("groq", groq), candidate("ollama", ollama)], tracker, probe=Mock())
+
+    assert router.get_chat_completion(MESSAGES) == "from ollama"
+    assert tracker.failure_rate("groq:model") > 0
+
+
+def test_get_chat_completion_nothing_reachable(tracker):
+    """
+    Test that a clear error is raised when no provider is reachable.
+    """
+    router = ProviderRouter([candidate("ollama", FakeClient())], tracker, probe=Mock(return_value={"ollama": None}))
+
+    with pytest.raises(Exception, match="No AI interface is reachable"):
+        router.get_chat_completion(MESSAGES)
+
+
+def test_aget_chat_completion_falls_back_natively(tracker):
+    """
+    Test that the async path awaits the providers in order, without a blocking call.
+    """
+    tracker.record("groq:model", 1.0)
+    tracker.record("ollama:model", 2.0)
+    groq, ollama = FakeClient(error=ConnectionError("down")), FakeClient("from ollama")
+    router = ProviderRouter([candidate("groq", groq), candidate("ollama", ollama)], tracker, probe=Mock())
+    router.get_chat_completion = Mock(side_effect=AssertionError("blocking path used"))
+
+    assert asyncio.run(router.aget_chat_completion(MESSAGES)) == "from ollama"
+    assert tracker.failure_rate("groq:model") > 0
+    assert len(tracker.history["ollama:model"]["samples"]) == 2
+
+# --------------------------
+# Helper Function Tests
+# --------------------------
+
+
+def test_is_configured():
+    """
+    Test that interfaces are only routed to when their credentials are set.
+    """
+    with patch.dict(os.environ, {"GOOGLE_API_KEY": "key"}, clear=True):
+        assert is_configured("google")
+        assert is_configured("ollama")
+        assert not is_configured("groq")
+
+
+def test_probe_provider_unreachable():
+    """
+    Test that connection errors make the probe return None.
+    """
+    with patch('gai_tool.api.provider_router.requests.request', side_effect=requests.ConnectionError):
+        assert probe_provider("ollama") is None
+
+
+def test_probe_provider_success():
+    """
+    Test that the Ollama probe lists the local models.
+    """
+    with patch('gai_tool.api.provider_router.requests.request') as mock_request, \
+            patch.dict(os.environ, {}, clear=True):
+        assert probe_provider("ollama") >= 0
+
+    mock_request.assert_called_once_with("GET", "http://localhost:11434/api/tags", timeout=2.0)
@@ -0,0 +1,92 @@
+from email.utils import formatdate
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from gai_tool.api.retry import RetryPolicy, get_retry_after, get_status_code, is_retryable, parse_retry_after
+
+# --------------------------
+# Helper Functions
+# --------------------------
+
+
+def http_error(status_code, headers=None):
+    """
+    Helper function to create an exception carrying an HTTP response.
+    """
+    error = Exception(f"HTTP {status_code}")
+    error.response = Mock(status_code=status_code, headers=headers or {})
+    return error
+
+# --------------------------
+# RetryPolicy Tests
+# --------------------------
+
+
+def test_backoff_is_bounded():
+    """
+    Test that the jittered backoff never exceeds the exponential bound or max_delay.
+    """
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(4, 2 ** attempt)
+
+# --------------------------
+# Retry-After Tests
+# --------------------------
+
+
+def test_parse_retry_after_seconds():
+    """
+    Test that a Retry-After given in seconds is parsed.
+    """
+    assert parse_retry_after("7") == 7.0
+
+
+def test_parse_retry_after_http_date():
+    """
+    Test that a Retry-After given as an HTTP date is converted to seconds from now.
+    """
+    assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_parse_retry_after_invalid(value):
+    """
+    Test that missing or invalid Retry-After values are ignored.
+    """
+    assert parse_retry_after(value) is None
+
+
+def test_get_retry_after_from_wrapped_error():
+    """
+    Test that Retry-After is found on an error wrapped by a generic exception.
+    """
+    try:
+        try:
+            raise http_error(429, {"retry-after": "3"})
+        except Exception as e:
+            raise Exception("Error while communicating with Gemini") from e
+    except Exception as wrapped:
+        assert get_retry_after(wrapped) == 3.0
+        assert get_status_code(wrapped) == 429
+
+# --------------------------
+# is_retryable Tests
+# --------------------------
+
+
+@pytest.mark.parametrize("error, expected", [
+    (http_error(429), True),
+    (http_error(503), True),
+    (http_error(401), False),
+    (ConnectionError("refused"), True),
+    (ValueError("GROQ_API_KEY is not set"), False),
+])
+def test_is_retryable(error, expected):
+    """
+    Test which errors are worth retrying.
+    """
+    assert is_retryable(error) is expected
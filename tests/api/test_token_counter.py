@@ -1,14 +1,46 @@
+import os
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from typing import List, Dict
 
-from gai_tool.api.token_counter_lite import TokenCounterLite
+from gai_tool.api.token_counter_lite import TokenCounterLite, TokenizerStore
 
 # --------------------------
 # Fixtures
 # --------------------------
 
 
+@pytest.fixture(autouse=True)
+def mock_cache_dir(tmp_path):
+    """
+    Fixture to keep the tokenizer store in a temporary cache folder.
+    """
+    with patch.dict(os.environ, {"GAI_CACHE_DIR": str(tmp_path / "cache")}):
+        yield tmp_path / "cache"
+
+
+@pytest.fixture
+def mock_try_to_load_from_cache_fixture():
+    """
+    Fixture to mock the Hugging Face cache lookup, which finds nothing by default.
+    """
+    with patch('gai_tool.api.token_counter_lite.try_to_load_from_cache', return_value=None) as mock_lookup:
+        yield mock_lookup
+
+
+@pytest.fixture
+def tokenizer_file(tmp_path):
+    """
+    Fixture to provide a downloaded tokenizer.json file.
+    """
+    path = tmp_path / "downloaded" / "tokenizer.json"
+    path.parent.mkdir()
+    path.write_text('{"fake": "tokenizer"}')
+    return path
+
+
 @pytest.fixture
 def mock_get_api_huggingface_key_fixture():
     """
@@ -50,18 +82,21 @@ def token_counter_instance(mock_get_api_huggingface_key_fixture, mock_hf_hub_dow
 
 def mock_tokenizer_encode(return_values):
     """
-    Helper function to create a mock tokenizer with predefined encode return values.
+    Helper function to create a mock tokenizer with predefined encode_batch return values.
 
     Parameters:
-    - return_values: A list where each element is the return value for a subsequent call to encode.
+    - return_values: A list where each element is the token ids of a value in the batch.
 
     Returns:
-    - A MagicMock object with the encode method configured.
+    - A MagicMock object with the encode_batch method configured.
     """
     mock = MagicMock()
-    mock_encoding = MagicMock()
-    mock_encoding.ids = return_values
-    mock.encode.return_value = mock_encoding
+    encodings = []
+    for ids in return_values:
+        mock_encoding = MagicMock()
+        mock_encoding.ids = ids
+        encodings.append(mock_encoding)
+    mock.encode_batch.return_value = encodings
     return mock
 
 # --------------------------
@@ -83,7 +118,7 @@ def test_count_message_tokens(mock_get_api_huggingface_key_fixture, mock_hf_hub_
     mock_encoding1.ids = [1, 2, 3]  # 3 tokens for "user"
     mock_encoding2 = MagicMock()
     mock_encoding2.ids = [4, 5, 6]  # 3 tokens for "Hello"
-    mock_tokenizer.encode.side_effect = [mock_encoding1, mock_encoding2]
+    mock_tokenizer.encode_batch.return_value = [mock_encoding1, mock_encoding2]
 
     mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
 
@@ -100,9 +135,7 @@ def test_count_message_tokens(mock_get_api_huggingface_key_fixture, mock_hf_hub_
     # content: 3 tokens
     # total = 3 + 3 + 3 = 9
     assert num_tokens == 9
-    assert mock_tokenizer.encode.call_count == 2
-    mock_tokenizer.encode.assert_any_call("user", add_special_tokens=False)
-    mock_tokenizer.encode.assert_any_call("Hello", add_special_tokens=False)
+    mock_tokenizer.encode_batch.assert_called_once_with(["user", "Hello"], add_special_tokens=False)
 
 
 def test_count_tokens(mock_get_api_huggingface_key_fixture, mock_hf_hub_download_fixture, mock_tokenizer_from_file_fixture):
@@ -123,7 +156,7 @@ def test_count_tokens(mock_get_api_huggingface_key_fixture, mock_hf_hub_download
     mock_encoding3.ids = [6, 7]        # "user"
     mock_encoding4 = MagicMock()
     mock_encoding4.ids = [8, 9, 10]    # "Can you help me count tokens?"
-    mock_tokenizer.encode.side_effect = [mock_encoding1, mock_encoding2, mock_encoding3, mock_encoding4]
+    mock_tokenizer.encode_batch.return_value = [mock_encoding1, mock_encoding2, mock_encoding3, mock_encoding4]
 
     mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
 
@@ -151,11 +184,46 @@ def test_count_tokens(mock_get_api_huggingface_key_fixture, mock_hf_hub_download
     # Assistant reply format: 3
     # Total: 8 + 8 + 3 = 19
     assert total_tokens == 19
-    assert mock_tokenizer.encode.call_count == 4
-    mock_tokenizer.encode.assert_any_call("system", add_special_tokens=False)
-    mock_tokenizer.encode.assert_any_call("You are a helpful assistant.", add_special_tokens=False)
-    mock_tokenizer.encode.assert_any_call("user", add_special_tokens=False)
-    mock_tokenizer.encode.assert_any_call("Can you help me count tokens?", add_special_tokens=False)
+    mock_tokenizer.encode_batch.assert_called_once_with(
+        ["system", "You are a helpful assistant.", "user", "Can you help me count tokens?"],
+        add_special_tokens=False)
+
+
+def test_count_tokens_memoized(mock_get_api_huggingface_key_fixture,
+                               mock_hf_hub_download_fixture,
+                               mock_tokenizer_from_file_fixture):
+    """
+    Test that repeated values are only encoded once, within and across calls.
+    """
+    # Arrange
+    mock_get_api_huggingface_key_fixture.return_value = 'fake_token'
+    mock_hf_hub_download_fixture.return_value = '/fake/path/tokenizer.json'
+
+    mock_tokenizer = MagicMock()
+    mock_encoding1 = MagicMock()
+    mock_encoding1.ids = [1]           # "user"
+    mock_encoding2 = MagicMock()
+    mock_encoding2.ids = [2, 3]        # "Hello"
+    mock_encoding3 = MagicMock()
+    mock_encoding3.ids = [4, 5, 6]     # "World"
+    mock_tokenizer.encode_batch.side_effect = [[mock_encoding1, mock_encoding2], [mock_encoding3]]
+
+    mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
+
+    tc = TokenCounterLite(model='test-model')
+
+    # Act
+    first = tc.count_tokens([{"role": "user", "content": "Hello"}, {"role": "user", "content": "Hello"}])
+    second = tc.count_tokens([{"role": "user", "content": "World"}])
+
+    # Assert
+    # 2 * (3 + 1 + 2) + 3 = 15
+    assert first == 15
+    # 3 + 1 + 3 + 3 = 10
+    assert second == 10
+    assert mock_tokenizer.encode_batch.call_count == 2
+    mock_tokenizer.encode_batch.assert_any_call(["user", "Hello"], add_special_tokens=False)
+    mock_tokenizer.encode_batch.assert_any_call(["World"], add_special_tokens=False)
 
 
 def test_adjust_max_tokens_positive(mock_get_api_huggingface_key_fixture, mock_hf_hub_download_fixture, mock_tokenizer_from_file_fixture):
@@ -172,7 +240,7 @@ def test_adjust_max_tokens_positive(mock_get_api_huggingface_key_fixture, mock_h
     mock_encoding1.ids = [1, 2, 3]  # 3 tokens for "user"
     mock_encoding2 = MagicMock()
     mock_encoding2.ids = [4, 5, 6]  # 3 tokens for "Hello"
-    mock_tokenizer.encode.side_effect = [mock_encoding1, mock_encoding2]
+    mock_tokenizer.encode_batch.return_value = [mock_encoding1, mock_encoding2]
 
     mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
 
@@ -211,7 +279,7 @@ def test_adjust_max_tokens_exceed(mock_get_api_huggingface_key_fixture, mock_hf_
     mock_encoding1.ids = [1, 2, 3, 4]  # 4 tokens for "user"
     mock_encoding2 = MagicMock()
     mock_encoding2.ids = [5, 6, 7, 8]  # 4 tokens for "Hello"
-    mock_tokenizer.encode.side_effect = [mock_encoding1, mock_encoding2]
+    mock_tokenizer.encode_batch.return_value = [mock_encoding1, mock_encoding2]
 
     mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
 
@@ -239,7 +307,7 @@ def test_count_tokens_error_handling(mock_get_api_huggingface_key_fixture, mock_
     mock_hf_hub_download_fixture.return_value = '/fake/path/tokenizer.json'
 
     mock_tokenizer = MagicMock()
-    mock_tokenizer.encode.side_effect = Exception("Unexpected error")
+    mock_tokenizer.encode_batch.side_effect = Exception("Unexpected error")
     mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
 
     tc = TokenCounterLite(model='test-model')
@@ -253,3 +321,139 @@ def test_count_tokens_error_handling(mock_get_api_huggingface_key_fixture, mock_
         tc.count_tokens(messages)
 
     assert "Error counting tokens: Unexpected error" in str(exc_info.value)
+
+# --------------------------
+# TokenizerStore Tests
+# --------------------------
+
+
+def test_store_downloads_once(mock_get_api_huggingface_key_fixture, mock_hf_hub_download_fixture,
+                              mock_try_to_load_from_cache_fixture, tokenizer_file, mock_cache_dir):
+    """
+    Test that the first use downloads the tokenizer and later uses read it from disk.
+    """
+    # Arrange
+    mock_hf_hub_download_fixture.return_value = str(tokenizer_file)
+    store = TokenizerStore()
+
+    # Act
+    first_path = store.get_path("org/model")
+    second_path = store.get_path("org/model")
+
+    # Assert
+    assert first_path == second_path == mock_cache_dir / "tokenizers" / "org--model" / "main" / "tokenizer.json"
+    assert first_path.read_text() == '{"fake": "tokenizer"}'
+    mock_hf_hub_download_fixture.assert_called_once()
+
+
+def test_store_reuses_hugging_face_cache(mock_hf_hub_download_fixture, mock_try_to_load_from_cache_fixture,
+                                         tokenizer_file):
+    """
+    Test that a tokenizer already in the Hugging Face cache is used without a network call.
+    """
+    # Arrange
+    mock_try_to_load_from_cache_fixture.return_value = str(tokenizer_file)
+
+    # Act
+    path = TokenizerStore().get_path("org/model", revision="abc123")
+
+    # Assert
+    assert path.read_text() == '{"fake": "tokenizer"}'
+    assert path.parent.name == "abc123"
+    mock_hf_hub_download_fixture.assert_not_called()
+
+
+def test_store_offline_without_local_copy(mock_hf_hub_download_fixture, mock_try_to_load_from_cache_fixture):
+    """
+    Test that HF_HUB_OFFLINE prevents any download.
+    """
+    with patch.dict(os.environ, {"HF_HUB_OFFLINE": "1"}):
+        with pytest.raises(ValueError, match="not available offline"):
+            TokenizerStore().get_path("org/model")
+
+    mock_hf_hub_download_fixture.assert_not_called()
+
+
+def test_store_refreshes_stale_copy_in_background(mock_try_to_load_from_cache_fixture, tmp_path):
+    """
+    Test that a stale stored tokenizer is returned right away and refreshed in the background.
+    """
+    # Arrange
+    store = TokenizerStore(refresh_after=60)
+    stored_path = store.path_for("org/model", "main")
+    stored_path.parent.mkdir(parents=True)
+    stored_path.write_text("old")
+    os.utime(stored_path, (time.time() - 120, time.time() - 120))
+
+    with patch.object(store, 'refresh_in_background') as mock_refresh:
+        # Act
+        path = store.get_path("org/model")
+
+    # Assert
+    assert path == stored_path
+    mock_refresh.assert_called_once_with("org/model", "main")
+
+
+def test_store_refresh_replaces_copy(mock_get_api_huggingface_key_fixture, mock_hf_hub_download_fixture,
+                                     tokenizer_file):
+    """
+    Test that the background refresh replaces the stored tokenizer.
+    """
+    # Arrange
+    mock_hf_hub_download_fixture.return_value = str(tokenizer_file)
+    store = TokenizerStore()
+    stored_path = store.path_for("org/model", "main")
+    stored_path.parent.mkdir(parents=True)
+    stored_path.write_text("old")
+
+    # Act
+    store.refresh_in_background("org/model").join()
+
+    # Assert
+    assert stored_path.read_text() == '{"fake": "tokenizer"}'
+
+
+# --------------------------
+# Background Loading Tests
+# --------------------------
+
+
+def test_tokenizer_loads_in_background(mock_tokenizer_from_file_fixture):
+    """
+    Test that construction does not wait for the tokenizer and first use does.
+    """
+    # Arrange
+    release = threading.Event()
+    store = MagicMock()
+
+    def slow_get_path(model, revision):
+        release.wait(timeout=5)
+        return "/fake/path/tokenizer.json"
+
+    store.get_path.side_effect = slow_get_path
+    mock_tokenizer = MagicMock()
+    mock_tokenizer_from_file_fixture.return_value = mock_tokenizer
+
+    # Act
+    tc = TokenCounterLite(model='test-model', store=store)
+
+    # Assert
+    assert not tc._tokenizer_future.done()
+    release.set()
+    assert tc.tokenizer is mock_tokenizer
+
+
+def test_tokenizer_load_failure_raised_on_use(mock_tokenizer_from_file_fixture):
+    """
+    Test that a tokenizer loading error is raised when the tokenizer is first needed.
+    """
+    # Arrange
+    store = MagicMock()
+    store.get_path.return_value = "/fake/path/tokenizer.json"
+    mock_tokenizer_from_file_fixture.side_effect = Exception("corrupted")
+
+    tc = TokenCounterLite(model='test-model', store=store)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Failed to load tokenizer for test-model: corrupted"):
+        _ = tc.tokenizer
@@ -0,0 +1,171 @@
+import time
+from pathlib import Path
+
+import pytest
+import requests
+from tokenizers import Tokenizer
+
+import gai_tool
+from gai_tool.api.token_counter_lite import TokenizerStore
+from gai_tool.api.token_estimator import (
+    FEATURES, calibrate, coefficients_for, estimate_tokens, load_families, text_features)
+
+DIFF = """diff --git a/gai_tool/api/groq_api.py b/gai_tool/api/groq_api.py
+@@ -12,7 +12,8 @@ class GroqClient(BaseAIClient):
+-                 timeout: float = DEFAULT_TIMEOUT) -> str:
++                 timeout: float = DEFAULT_TIMEOUT,
++                 context_window: Optional[int] = None) -> str:
+"""
+
+# --------------------------
+# text_features Tests
+# --------------------------
+
+
+def test_text_features():
+    """
+    Test the character-class statistics of a short text.
+    """
+    features = text_features("def f(x):\n    return 42\n\tcafé")
+
+    assert features == {
+        "word_runs": 5,
+        "letters": 14,
+        "digits": 2,
+        "punctuation": 3,
+        "newlines": 2,
+        "indents": 2,
+        "non_ascii_bytes": 2,
+    }
+
+
+def test_text_features_names_match_coefficients():
+    """
+    Test that every shipped family has a coefficient for each feature.
+    """
+    for family in load_families().values():
+        assert set(family["coefficients"]) == set(FEATURES)
+
+# --------------------------
+# estimate_tokens Tests
+# --------------------------
+
+
+@pytest.mark.parametrize("model, family", [
+    ("llama-3.3-70b-versatile", "llama3"),
+    ("Qwen/Qwen3-8B", "qwen"),
+    ("deepseek-r1:8b", "llama3"),
+    ("deepseek-r1:14b", "qwen"),
+    ("phi4", "phi"),
+    ("gemini-2.0-flash", "gemini"),
+    ("unknown-model", "default"),
+    (None, "default"),
+])
+def test_coefficients_for(model, family):
+    """
+    Test that models are matched to their tokenizer family.
+    """
+    assert coefficients_for(model) == load_families()[family]["coefficients"]
+
+
+def test_estimate_tokens_empty():
+    """
+    Test that an empty text has no tokens.
+    """
+    assert estimate_tokens("", "phi4") == 0
+
+
+def test_estimate_tokens_code_ratio():
+    """
+    Test that code is estimated at a plausible number of characters per token.
+    """
+    tokens = estimate_tokens(DIFF, "llama-3.3-70b-versatile")
+
+    assert 2.5 <= len(DIFF) / tokens <= 4.5
+
+
+def test_estimate_tokens_large_diff_is_fast():
+    """
+    Test that a megabyte-sized diff is estimated quickly.
+    """
+    text = DIFF * (1024 * 1024 // len(DIFF))
+
+    start = time.perf_counter()
+    estimate_tokens(text, "llama-3.3-70b-versatile")
+
+    assert time.perf_counter() - start < 0.5
+
+# --------------------------
+# calibrate Tests
+# --------------------------
+
+
+def test_calibrate_recovers_coefficients():
+    """
+    Test that calibrating against a counter recovers its per-feature weights.
+    """
+    weights = {"word_runs": 1.0, "letters": 0.1, "digits": 0.5, "punctuation": 0.8,
+               "newlines": 0.5, "indents": 1.0, "non_ascii_bytes": 0.5}
+
+    def count_tokens(text):
+        return sum(weights[name] * value for name, value in text_features(text).items())
+
+    texts = [DIFF, "hello world", "12345 678", "é ü ñ", "a, b; c.", "x\n  y\n\tz", "camelCaseIdentifier",
+             "numbers 1 2 3\n    indented(1, 2)"]
+
+    coefficients = calibrate(texts, count_tokens)
+
+    assert coefficients == pytest.approx(weights, abs=1e-3)
+
+# --------------------------
+# Real Tokenizer Tests
+# --------------------------
+
+
+QWEN_MODEL = "Qwen/Qwen3-8B"
+
+
+@pytest.fixture(scope="module")
+def qwen_tokenizer():
+    """
+    Fixture to provide the real Qwen tokenizer, skipping the tests when it cannot be downloaded.
+    """
+    store = TokenizerStore()
+    if not store.path_for(QWEN_MODEL, "main").exists():
+        try:
+            # The Hub client retries for half a minute when offline, fail fast instead
+            requests.head("https://huggingface.co", timeout=2)
+        except requests.RequestException:
+            pytest.skip("Hugging Face Hub is not reachable to download the Qwen tokenizer")
+
+    try:
+        return Tokenizer.from_file(str(store.get_path(QWEN_MODEL)))
+    except Exception as e:
+        pytest.skip(f"Qwen tokenizer not available: {e}")
+
+
+def new_file_diffs():
+    """
+    Helper building the diff adding each module of the package, as a sample of real code.
+    """
+    diffs = []
+    for path in sorted(Path(gai_tool.__file__).parent.rglob("*.py")):
+        lines = path.read_text(encoding="utf-8").splitlines()
+        if lines:
+            added = "".join(f"+{line}\n" for line in lines)
+            diffs.append(f"diff --git a/{path.name} b/{path.name}\nnew file mode 100644\n--- /dev/null\n"
+                         f"+++ b/{path.name}\n@@ -0,0 +1,{len(lines)} @@\n{added}")
+    return diffs
+
+
+def test_estimate_tokens_error_against_real_tokenizer(qwen_tokenizer):
+    """
+    Test that the calibrated estimate stays close to the real token count of code diffs.
+    """
+    diffs = new_file_diffs()
+    estimated = [estimate_tokens(diff, QWEN_MODEL) for diff in diffs]
+    actual = [len(encoding.ids) for encoding in qwen_tokenizer.encode_batch(diffs, add_special_tokens=False)]
+
+    assert abs(sum(estimated) / sum(actual) - 1) <= 0.1
+    for diff, estimate, count in zip(diffs, estimated, actual):
+        assert abs(estimate - count) <= 0.25 * count, diff.splitlines()[0]
@@ -0,0 +1,136 @@
+import threading
+from unittest.mock import patch, Mock
+
+import pytest
+
+from gai_tool.src.branch_sync import list_local_branches, select_branches, sync_branches
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture
+def branches():
+    """
+    Fixture to provide local branch names, target branch included.
+    """
+    return ["main", "feature/login", "feature/signup", "hotfix-1", "docs"]
+
+# --------------------------
+# list_local_branches Tests
+# --------------------------
+
+
+def test_list_local_branches():
+    """
+    Test that the local branches are read from git for-each-ref.
+    """
+    # Arrange
+    with patch('gai_tool.src.branch_sync.subprocess.run') as mock_run:
+        mock_run.return_value = Mock(stdout="main\nfeature/login\n")
+
+        # Act
+        result = list_local_branches()
+
+    # Assert
+    assert result == ["main", "feature/login"]
+    mock_run.assert_called_once_with(
+        ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+# --------------------------
+# select_branches Tests
+# --------------------------
+
+
+def test_select_all_branches_but_target(branches):
+    """
+    Test that every branch but the target is selected without patterns.
+    """
+    assert select_branches(branches, None, "main") == ["feature/login", "feature/signup", "hotfix-1", "docs"]
+
+
+def test_select_branches_by_name_and_glob(branches):
+    """
+    Test that names and globs are both matched, keeping the branch order.
+    """
+    assert select_branches(branches, ["hotfix-1", "feature/*"], "main") == [
+        "feature/login", "feature/signup", "hotfix-1"]
+
+
+def test_select_branches_never_selects_target(branches):
+    """
+    Test that the target branch is left out even when it matches.
+    """
+    assert select_branches(branches, ["*"], "docs") == ["main", "feature/login", "feature/signup", "hotfix-1"]
+
+# --------------------------
+# sync_branches Tests
+# --------------------------
+
+
+def test_sync_branches_reports_each_outcome():
+    """
+    Test that synced, skipped and failed branches are all reported, in order.
+    """
+    # Arrange
+    def sync_branch(branch):
+        if branch == "empty":
+            return None
+        if branch == "broken":
+            raise RuntimeError("rate limited")
+        return f"Title of {branch}"
+
+    # Act
+    with patch('builtins.print'):
+        outcomes = sync_branches(["feature", "empty", "broken"], sync_branch, max_workers=2)
+
+    # Assert
+    assert list(outcomes) == ["feature", "empty", "broken"]
+    assert outcomes["feature"] == "synced: Title of feature"
+    assert outcomes["empty"] == "skipped: no new commits"
+    assert outcomes["broken"] == "failed: rate limited"
+
+
+def test_sync_branches_runs_concurrently():
+    """
+    Test that branches are handled in parallel, up to max_workers at once.
+    """
+    # Arrange
+    barrier = threading.Barrier(2, timeout=5)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def sync_branch(branch):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        # Only passes once two branches run at the same time
+        barrier.wait()
+        with lock:
+            running[0] -= 1
+        return branch
+
+    # Act
+    with patch('builtins.print'):
+        outcomes = sync_branches(["a", "b", "c", "d"], sync_branch, max_workers=2)
+
+    # Assert
+    assert all(outcome.startswith("synced") for outcome in outcomes.values())
+    assert peak[0] == 2
+
+
+def test_sync_branches_without_branches():
+    """
+    Test that nothing is run when no branch is selected.
+    """
+    sync_branch = Mock()
+
+    with patch('builtins.print'):
+        assert sync_branches([], sync_branch) == {}
+
+    sync_branch.assert_not_called()
@@ -0,0 +1,96 @@
+from gai_tool.src.commit_compression import compress_commit_list, compress_messages, group_by_scope, strip_sha
+
+# --------------------------
+# strip_sha Tests
+# --------------------------
+
+
+def test_strip_sha():
+    """
+    Test that abbreviated and full SHAs are dropped, and other first words kept.
+    """
+    assert strip_sha("a1b2c3d Fix parser") == "Fix parser"
+    assert strip_sha("0123456789abcdef0123456789abcdef01234567 Fix parser") == "Fix parser"
+    assert strip_sha("commit1") == "commit1"
+    assert strip_sha("added tests") == "added tests"
+
+# --------------------------
+# compress_messages Tests
+# --------------------------
+
+
+def subjects(messages):
+    """
+    Helper compressing subjects without bodies.
+    """
+    return [(subject, count) for subject, _, count in compress_messages([(subject, "") for subject in messages])]
+
+
+def test_fixups_are_folded_into_their_target():
+    """
+    Test that fixup!/squash! commits disappear when their target is listed.
+    """
+    assert subjects(["fixup! Add parser", "squash! fixup! Add parser", "Add parser"]) == [("Add parser", 1)]
+
+
+def test_fixups_of_missing_target_stand_for_it():
+    """
+    Test that fixups of commits outside the list are described as their target, once.
+    """
+    assert subjects(["fixup! Add parser", "fixup! Add parser", "Add tests"]) == [
+        ("Add parser", 1), ("Add tests", 1)]
+
+
+def test_reverts_cancel_their_commit():
+    """
+    Test that a commit and its revert are both dropped, and reapplied commits kept.
+    """
+    assert subjects(['Revert "Add parser"', "Add parser", "Add tests"]) == [("Add tests", 1)]
+    assert subjects(['Revert "Revert "Add parser""', 'Revert "Add parser"', "Add parser"]) == [("Add parser", 1)]
+
+
+def test_merges_are_dropped():
+    """
+    Test that merges of other branches are dropped.
+    """
+    assert subjects(["Merge branch 'main' into feature", "Merge remote-tracking branch 'origin/main'",
+                     "Add tests"]) == [("Add tests", 1)]
+
+
+def test_near_identical_subjects_are_counted():
+    """
+    Test that subjects differing in case, spacing or final dot are kept once.
+    """
+    assert subjects(["Update README.", "update  readme", "Fix typo"]) == [("Update README.", 2), ("Fix typo", 1)]
+
+# --------------------------
+# Grouping Tests
+# --------------------------
+
+
+def test_group_by_scope():
+    """
+    Test that scopes with several commits are grouped, and single ones left inline.
+    """
+    ungrouped, groups = group_by_scope(["feat(api): add retries", "fix(cli): typo", "fix(api): timeout", "Docs"])
+
+    assert ungrouped == ["fix(cli): typo", "Docs"]
+    assert groups == {"api": ["feat: add retries", "fix: timeout"]}
+
+
+def test_compress_commit_list():
+    """
+    Test the whole compression of git log --oneline output.
+    """
+    log = "\n".join([
+        'a1b2c3d Revert "feat(api): add pagination"',
+        "b1b2c3d fixup! feat(api): add retries",
+        "c1b2c3d feat(api): add retries",
+        "d1b2c3d feat(api): add pagination",
+        "e1b2c3d feat(api)!: drop v1 endpoints",
+        "f1b2c3d Update README",
+        "0a1b2c3 Update README",
+    ])
+
+    assert compress_commit_list(log) == (
+        "Changes:\n- Update README (x2)\n\napi:\n- feat: add retries\n- feat!: drop v1 endpoints")
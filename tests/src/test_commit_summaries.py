@@ -0,0 +1,89 @@
+from unittest.mock import patch, Mock
+
+import pytest
+
+from gai_tool.src.commit_summaries import CommitSummaryCache, format_summaries, summarize_commits
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Fixture to provide a summary cache in a temporary folder.
+    """
+    return CommitSummaryCache("summary prompt", root=tmp_path)
+
+
+@pytest.fixture
+def summarize():
+    """
+    Fixture to mock the AI client summarizing a diff.
+    """
+    return Mock(side_effect=lambda diff: f"Summary of {diff}")
+
+# --------------------------
+# CommitSummaryCache Tests
+# --------------------------
+
+
+def test_cache_roundtrip(cache):
+    """
+    Test that a stored summary is read back by SHA.
+    """
+    cache.put("abc123", "Fix the parser")
+
+    assert cache.get("abc123") == "Fix the parser"
+    assert cache.get("def456") is None
+
+
+def test_cache_is_per_prompt_version(cache, tmp_path):
+    """
+    Test that summaries made with another prompt are not reused.
+    """
+    cache.put("abc123", "Fix the parser")
+
+    assert CommitSummaryCache("summary prompt", root=tmp_path).get("abc123") == "Fix the parser"
+    assert CommitSummaryCache("new summary prompt", root=tmp_path).get("abc123") is None
+
+# --------------------------
+# summarize_commits Tests
+# --------------------------
+
+
+def test_summarize_commits_only_new_ones(cache, summarize):
+    """
+    Test that cached commits are neither read nor summarized again.
+    """
+    # Arrange
+    cache.put("sha1", "Cached summary")
+    get_diff = Mock(side_effect=lambda sha: f"diff {sha}")
+
+    # Act
+    with patch('builtins.print') as mock_print:
+        summaries = summarize_commits(["sha1", "sha2", "sha3"], get_diff, summarize, cache)
+
+    # Assert
+    assert summaries == ["Cached summary", "Summary of diff sha2", "Summary of diff sha3"]
+    assert [call.args[0] for call in get_diff.call_args_list] == ["sha2", "sha3"]
+    assert cache.get("sha3") == "Summary of diff sha3"
+    mock_print.assert_called_once_with("Summarized 2 new commits, reused 1 cached summaries.")
+
+
+def test_summarize_commits_single_line(cache):
+    """
+    Test that summaries are kept on a single line, to fit the commit list.
+    """
+    with patch('builtins.print'):
+        summaries = summarize_commits(["sha1"], Mock(), Mock(return_value="Fix it.\n\nAlso tests."), cache)
+
+    assert summaries == ["Fix it. Also tests."]
+
+
+def test_format_summaries():
+    """
+    Test that summaries are listed like formatted commits.
+    """
+    assert format_summaries(["Fix it", "Add tests"]) == "Changes:\n- Fix it\n- Add tests"
@@ -1,3 +1,4 @@
+import os
 import pytest
 import subprocess
 from unittest.mock import patch, Mock
@@ -33,9 +34,9 @@ def mock_subprocess_run_failure():
 @pytest.fixture
 def commit_instance():
     """
-    Fixture to provide a fresh instance of Commit for tests.
+    Fixture to provide a fresh instance of Commit for tests, always fetching.
     """
-    return Commits()
+    return Commits(fetch_max_age=0)
 
 # --------------------------
 # Helper Functions
@@ -70,15 +71,17 @@ def test_format_commits(commit_instance):
 def test_get_commits_success(mock_subprocess_run_success, commit_instance):
     # Mock the fetch command
     mock_fetch = mock_subprocess_run_output("", 0)
+    # Mock the shallow check
+    mock_shallow = mock_subprocess_run_output("false\n", 0)
     # Mock the log command
     mock_log = mock_subprocess_run_output("commit1\ncommit2", 0)
-    mock_subprocess_run_success.side_effect = [mock_fetch, mock_log]
+    mock_subprocess_run_success.side_effect = [mock_fetch, mock_shallow, mock_log]
 
     commits = commit_instance.get_commits("origin", "main", "feature-branch")
     assert commits == "commit1\ncommit2", "Should return the fetched commits"
 
     mock_subprocess_run_success.assert_any_call(
-        ["git", "fetch", "origin"],
+        ["git", "fetch", "origin", "+refs/heads/main:refs/remotes/origin/main"],
         check=True,
         capture_output=True
     )
@@ -91,6 +94,24 @@ def test_get_commits_success(mock_subprocess_run_success, commit_instance):
     )
 
 
+def test_get_commits_without_fetch(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.side_effect = [
+        mock_subprocess_run_output("false\n", 0),
+        mock_subprocess_run_output("commit1", 0)
+    ]
+
+    commits = commit_instance.get_commits("origin", "main", "feature-branch", fetch=False)
+    assert commits == "commit1"
+
+    assert mock_subprocess_run_success.call_count == 2
+    mock_subprocess_run_success.assert_called_with(
+        ["git", "log", "--oneline", "origin/main..feature-branch"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
 def test_get_commits_fetch_failure(mock_subprocess_run_failure, commit_instance):
     with pytest.raises(subprocess.CalledProcessError):
         commit_instance.get_commits("origin", "main", "feature-branch")
@@ -102,6 +123,7 @@ def test_get_commits_log_failure(mock_subprocess_run_success, commit_instance):
     # Mock the log command to fail
     mock_subprocess_run_success.side_effect = [
         mock_fetch,
+        mock_subprocess_run_output("false\n", 0),
         subprocess.CalledProcessError(
             1,
             ["git", "log", "--oneline", "origin/main..feature-branch"],
@@ -117,7 +139,7 @@ def test_get_commits_log_failure(mock_subprocess_run_success, commit_instance):
 
     # Verify fetch command was called
     mock_subprocess_run_success.assert_any_call(
-        ["git", "fetch", "origin"],
+        ["git", "fetch", "origin", "+refs/heads/main:refs/remotes/origin/main"],
         check=True,
         capture_output=True
     )
@@ -128,3 +150,261 @@ def test_get_commits_log_failure(mock_subprocess_run_success, commit_instance):
         text=True,
         check=True
     )
+
+# --------------------------
+# Single Commit Tests
+# --------------------------
+
+
+def test_get_commit_shas(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("sha1\nsha2\n", 0)
+
+    shas = commit_instance.get_commit_shas("origin", "main", "feature-branch")
+    assert shas == ["sha1", "sha2"], "Should return the SHAs oldest first"
+
+    mock_subprocess_run_success.assert_called_once_with(
+        ["git", "rev-list", "--reverse", "origin/main..feature-branch"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def test_get_commit_diff(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("Fix it\n\n file | 1 +\n", 0)
+
+    assert commit_instance.get_commit_diff("sha1") == "Fix it\n\n file | 1 +"
+    assert mock_subprocess_run_success.call_args[0][0][-1] == "sha1"
+
+
+def test_get_commit_shas_since(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("sha2\n", 0)
+
+    assert commit_instance.get_commit_shas("origin", "main", "feature-branch", since="sha1") == ["sha2"]
+    assert mock_subprocess_run_success.call_args[0][0] == ["git", "rev-list", "--reverse", "sha1..feature-branch"]
+
+# --------------------------
+# Incremental Update Tests
+# --------------------------
+
+
+def test_get_commits_since(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("abc Add tests\n", 0)
+
+    assert commit_instance.get_commits_since("sha1", "feature-branch") == "abc Add tests"
+    assert mock_subprocess_run_success.call_args[0][0] == ["git", "log", "--oneline", "sha1..feature-branch"]
+
+
+def test_get_head_sha(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("sha1\n", 0)
+
+    assert commit_instance.get_head_sha("feature-branch") == "sha1"
+
+
+def test_is_ancestor(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("", 0)
+    assert commit_instance.is_ancestor("sha1", "feature-branch") is True
+
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output("", 1)
+    assert commit_instance.is_ancestor("sha1", "feature-branch") is False
+
+    mock_subprocess_run_success.assert_called_with(
+        ["git", "merge-base", "--is-ancestor", "sha1", "feature-branch"],
+        capture_output=True
+    )
+
+# --------------------------
+# fetch Method Tests
+# --------------------------
+
+
+def test_fetch_all_branches(mock_subprocess_run_success, commit_instance):
+    commit_instance.fetch("origin")
+
+    mock_subprocess_run_success.assert_called_once_with(
+        ["git", "fetch", "origin"],
+        check=True,
+        capture_output=True
+    )
+
+
+def test_fetch_skipped_when_fresh(tmp_path, mock_subprocess_run_success):
+    fetch_head = tmp_path / "FETCH_HEAD"
+    fetch_head.write_text("sha1\t\tbranch 'main' of https://github.com/owner/repo\n")
+    mock_subprocess_run_success.side_effect = [
+        mock_subprocess_run_output(f"{fetch_head}\n{tmp_path / 'refs/remotes/origin/main'}\n", 0),
+        mock_subprocess_run_output("https://token@github.com/owner/repo.git\n", 0),
+    ]
+
+    Commits(fetch_max_age=60).fetch("origin", "main")
+
+    # Only the freshness check ran
+    assert mock_subprocess_run_success.call_count == 2
+    assert mock_subprocess_run_success.call_args[0][0] == ["git", "remote", "get-url", "origin"]
+
+
+def test_fetch_when_fetch_head_holds_other_remote(tmp_path, mock_subprocess_run_success):
+    fetch_head = tmp_path / "FETCH_HEAD"
+    fetch_head.write_text("sha1\t\tbranch 'main' of github.com:upstream/repo\n")
+    mock_subprocess_run_success.side_effect = [
+        mock_subprocess_run_output(f"{fetch_head}\n{tmp_path / 'refs/remotes/origin/main'}\n", 0),
+        mock_subprocess_run_output("git@github.com:owner/repo.git\n", 0),
+    ]
+
+    assert Commits(fetch_max_age=60).is_fetch_fresh("origin", "main") is False
+
+
+def test_fetch_skipped_when_fresh_over_scp_url(tmp_path, mock_subprocess_run_success):
+    fetch_head = tmp_path / "FETCH_HEAD"
+    fetch_head.write_text("sha1\t\tbranch 'main' of github.com:owner/repo\n")
+    mock_subprocess_run_success.side_effect = [
+        mock_subprocess_run_output(f"{fetch_head}\n{tmp_path / 'refs/remotes/origin/main'}\n", 0),
+        mock_subprocess_run_output("git@github.com:owner/repo.git\n", 0),
+    ]
+
+    assert Commits(fetch_max_age=60).is_fetch_fresh("origin", "main") is True
+
+
+def test_fetch_when_fetch_head_is_stale(tmp_path, mock_subprocess_run_success):
+    fetch_head = tmp_path / "FETCH_HEAD"
+    fetch_head.write_text("sha1\t\tbranch 'main' of github.com:owner/repo\n")
+    os.utime(fetch_head, (0, 0))
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output(
+        f"{fetch_head}\n{tmp_path / 'refs/remotes/origin/main'}\n", 0)
+
+    Commits(fetch_max_age=60).fetch("origin", "main")
+
+    mock_subprocess_run_success.assert_called_with(
+        ["git", "fetch", "origin", "+refs/heads/main:refs/remotes/origin/main"],
+        check=True,
+        capture_output=True
+    )
+
+
+def test_fetch_when_fetch_head_holds_other_branch(tmp_path, mock_subprocess_run_success):
+    fetch_head = tmp_path / "FETCH_HEAD"
+    fetch_head.write_text("sha1\t\tbranch 'develop' of github.com:owner/repo\n")
+    mock_subprocess_run_success.side_effect = [
+        mock_subprocess_run_output(f"{fetch_head}\n{tmp_path / 'refs/remotes/origin/main'}\n", 0),
+        mock_subprocess_run_output("github.com:owner/repo\n", 0),
+    ]
+
+    assert Commits(fetch_max_age=60).is_fetch_fresh("origin", "main") is False
+
+
+def test_fetch_in_background(commit_instance):
+    with patch('gai_tool.src.commits.subprocess.Popen') as mock_popen:
+        process = mock_popen.return_value
+        process.communicate.return_value = (b"", b"")
+        process.returncode = 0
+
+        assert commit_instance.fetch("origin", "main", background=True) is process
+        commit_instance.wait_for_fetch(process)
+
+    assert mock_popen.call_args[0][0] == ["git", "fetch", "origin", "+refs/heads/main:refs/remotes/origin/main"]
+
+
+def test_wait_for_failed_background_fetch(commit_instance):
+    process = Mock(returncode=128, args=["git", "fetch"])
+    process.communicate.return_value = (b"", b"fatal: couldn't find remote ref main")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        commit_instance.wait_for_fetch(process)
+
+
+def test_cancel_background_fetch(commit_instance):
+    process = Mock()
+    process.communicate.return_value = (b"", b"")
+
+    commit_instance.cancel_fetch(process)
+
+    process.kill.assert_called_once()
+    process.communicate.assert_called_once()
+
+# --------------------------
+# Shallow Clone Tests
+# --------------------------
+
+
+def git_answers(shallow, merge_base_after):
+    """
+    Helper answering git commands of a shallow clone whose merge base appears
+    after merge_base_after deepening fetches.
+    """
+    deepened = []
+
+    def run(command, **kwargs):
+        if command[:2] == ["git", "fetch"]:
+            deepened.append(command[2])
+            return mock_subprocess_run_output("", 0)
+        if command[:2] == ["git", "merge-base"]:
+            return mock_subprocess_run_output("", 0 if len(deepened) >= merge_base_after else 1)
+        if command[:3] == ["git", "rev-parse", "--is-shallow-repository"]:
+            return mock_subprocess_run_output("true\n" if shallow else "false\n", 0)
+        return mock_subprocess_run_output("commit1", 0)
+
+    return run, deepened
+
+
+def test_deepen_doubles_until_merge_base(mock_subprocess_run_success, commit_instance):
+    run, deepened = git_answers(shallow=True, merge_base_after=3)
+    mock_subprocess_run_success.side_effect = run
+
+    with patch('builtins.print'):
+        assert commit_instance.deepen_to_merge_base("origin", "main", "feature-branch") is True
+
+    assert deepened == ["--deepen=50", "--deepen=100", "--deepen=200"]
+
+
+def test_deepen_stops_when_history_is_complete(mock_subprocess_run_success, commit_instance):
+    run, deepened = git_answers(shallow=False, merge_base_after=99)
+    mock_subprocess_run_success.side_effect = run
+
+    assert commit_instance.deepen_to_merge_base("origin", "main", "feature-branch") is False
+    assert deepened == []
+
+
+def test_deepen_gives_up_after_max_steps(mock_subprocess_run_success, commit_instance):
+    run, deepened = git_answers(shallow=True, merge_base_after=99)
+    mock_subprocess_run_success.side_effect = run
+
+    with patch('builtins.print') as mock_print:
+        assert commit_instance.deepen_to_merge_base("origin", "main", "feature-branch") is False
+
+    assert len(deepened) == 10
+    assert not any("--unshallow" in call.args[0] for call in mock_subprocess_run_success.call_args_list)
+    assert "No merge base" in mock_print.call_args[0][0]
+
+
+def test_get_commits_on_shallow_clone(mock_subprocess_run_success, commit_instance):
+    run, deepened = git_answers(shallow=True, merge_base_after=1)
+    mock_subprocess_run_success.side_effect = run
+
+    with patch('builtins.print'):
+        assert commit_instance.get_commits("origin", "main", "feature-branch", fetch=False) == "commit1"
+
+    assert deepened == ["--deepen=50"]
+
+# --------------------------
+# Branch Context Tests
+# --------------------------
+
+
+def test_get_commit_messages(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output(
+        "Add parser\x1fWith tests\n\x1e\nFix typo\x1f\x1e\n", 0)
+
+    messages = commit_instance.get_commit_messages("origin", "main", "feature-branch")
+
+    assert messages == [("Add parser", "With tests"), ("Fix typo", "")]
+    assert mock_subprocess_run_success.call_args[0][0][-1] == "origin/main..feature-branch"
+
+
+def test_get_branch_diff(mock_subprocess_run_success, commit_instance):
+    mock_subprocess_run_success.return_value = mock_subprocess_run_output(" 1 file changed\n", 0)
+
+    assert commit_instance.get_branch_diff("origin", "main", "feature-branch", stat=True) == "1 file changed"
+
+    command = mock_subprocess_run_success.call_args[0][0]
+    assert "--stat=120" in command
+    assert command[-1] == "origin/main...feature-branch"
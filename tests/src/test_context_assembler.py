@@ -0,0 +1,109 @@
+from gai_tool.src.context_assembler import assemble_context, gather_facts, pack_facts, score_hunk, split_hunks
+
+DIFF = """diff --git a/app/parser.py b/app/parser.py
+index 1111111..2222222 100644
+--- a/app/parser.py
++++ b/app/parser.py
+@@ -1,3 +1,4 @@
++def parse_header(line):
++    return line.split(":", 1)
+ import re
+@@ -20,2 +21,2 @@ def parse(text):
+-    return text
++    return text.strip()
+diff --git a/poetry.lock b/poetry.lock
+index 3333333..4444444 100644
+--- a/poetry.lock
++++ b/poetry.lock
+@@ -5,2 +5,2 @@
+-version = "2.32.3"
++version = "2.32.4"
+"""
+
+DIFFSTAT = """ app/parser.py | 4 +++-
+ poetry.lock   | 2 +-
+ 2 files changed, 4 insertions(+), 2 deletions(-)"""
+
+
+def count_words(text):
+    """
+    Helper counting one token per word, easy to reason about in tests.
+    """
+    return len(text.split())
+
+# --------------------------
+# Hunk Tests
+# --------------------------
+
+
+def test_split_hunks():
+    """
+    Test that each hunk is split out with the path of its file.
+    """
+    hunks = split_hunks(DIFF)
+
+    assert [path for path, _ in hunks] == ["app/parser.py", "app/parser.py", "poetry.lock"]
+    assert hunks[1][1].startswith("@@ -20,2 +21,2 @@")
+
+
+def test_score_hunk_ranks_definitions_over_lockfiles():
+    """
+    Test that hunks changing definitions outrank lockfile hunks of the same size.
+    """
+    hunks = split_hunks(DIFF)
+
+    assert score_hunk(*hunks[0]) > score_hunk(*hunks[1]) > score_hunk(*hunks[2])
+
+# --------------------------
+# Packing Tests
+# --------------------------
+
+
+def test_pack_facts_within_budget():
+    """
+    Test that the kept facts fit the budget and come back in their original order.
+    """
+    facts = gather_facts([("Add header parsing", "Needed by the importer."), ("Fix parse", "")], DIFFSTAT, DIFF)
+
+    kept = pack_facts(facts, 40, count_words)
+
+    assert sum(fact.tokens for fact in kept) <= 40
+    assert [fact.order for fact in kept] == sorted(fact.order for fact in kept)
+    assert kept[0].text == "- Add header parsing"
+
+
+def test_pack_facts_keeps_bodies_with_their_subject():
+    """
+    Test that a commit body is never kept without its subject.
+    """
+    facts = gather_facts([("A subject far too long to fit the tiny budget", "Short")], "", "")
+
+    assert pack_facts(facts, 3, count_words) == []
+
+# --------------------------
+# assemble_context Tests
+# --------------------------
+
+
+def test_assemble_context_with_large_budget():
+    """
+    Test that everything is kept when it fits.
+    """
+    context = assemble_context([("Add header parsing", "")], DIFFSTAT, DIFF, 10_000, count_words)
+
+    assert context.startswith("Changes:\n- Add header parsing\n\nFiles changed:\n app/parser.py")
+    assert "Selected diff hunks:\n--- app/parser.py\n@@ -1,3 +1,4 @@" in context
+    assert "left out" not in context
+
+
+def test_assemble_context_many_commits_stay_bounded():
+    """
+    Test that thousands of commits are cut down to the budget, noting what was left out.
+    """
+    messages = [(f"Commit number {index}", "") for index in range(2000)]
+
+    context = assemble_context(messages, DIFFSTAT, DIFF, 500, count_words)
+
+    assert count_words(context) < 600
+    assert "commit subjects and bodies left out ...]" in context
+    assert "Files changed:\n[... 3 diffstat lines left out ...]" in context
@@ -0,0 +1,123 @@
+import json
+
+from gai_tool.src.data_diff import (MIN_DATA_DIFF_LINES, diff_notebook, reduce_data_diffs, summarize_data_file,
+                                    summarize_document)
+
+
+def notebook(*cells):
+    """
+    Helper building a notebook whose code cells carry a large output.
+    """
+    return json.dumps({
+        "cells": [{
+            "cell_type": "code",
+            "execution_count": index,
+            "source": source.splitlines(keepends=True),
+            "outputs": [{"data": {"image/png": "iVBORw0KGgo" * 1000}}],
+            "metadata": {},
+        } for index, source in enumerate(cells)],
+        "metadata": {"kernelspec": {"name": "python3"}},
+    })
+
+
+def file_diff(path, changed):
+    """
+    Helper building the diff of one file with the given number of changed lines.
+    """
+    lines = "\n".join(f"+row {index}" for index in range(changed))
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1 +1,{changed} @@\n{lines}"
+
+# --------------------------
+# Notebook Tests
+# --------------------------
+
+
+def test_diff_notebook_compares_cell_sources_only():
+    """
+    Test that only the cell sources are diffed, outputs and execution counts left out.
+    """
+    old = notebook("import pandas as pd", "df = pd.read_csv('a.csv')")
+    new = notebook("import pandas as pd", "df = pd.read_csv('b.csv')\ndf.head()")
+
+    hunks = diff_notebook(old, new)
+
+    text = "\n".join(hunks)
+    assert "-df = pd.read_csv('a.csv')" in text
+    assert "+df = pd.read_csv('b.csv')" in text
+    assert "+df.head()" in text
+    assert "iVBOR" not in text and "execution_count" not in text
+
+
+def test_diff_notebook_outputs_only():
+    """
+    Test that re-running a notebook is reported as such.
+    """
+    old = notebook("print(1)")
+    new = json.dumps({**json.loads(old), "metadata": {"kernelspec": {"name": "python3.12"}}})
+
+    assert diff_notebook(old, new) == ["[notebook outputs or metadata changed, cell sources unchanged]"]
+
+
+def test_diff_notebook_unparsable():
+    """
+    Test that the raw diff is kept for invalid notebooks.
+    """
+    assert diff_notebook("{", notebook("print(1)")) is None
+
+# --------------------------
+# Data File Tests
+# --------------------------
+
+
+def test_summarize_csv():
+    """
+    Test that tables are summarized by row count and columns.
+    """
+    old = "id,name,email\n1,a,a@x\n2,b,b@x\n"
+    new = "id,name,phone\n1,a,1\n2,b,2\n3,c,3\n"
+
+    assert summarize_data_file("users.csv", old, new) == (
+        "[data file changes]\nrows: 2 -> 3 (+1)\nadded columns: phone\nremoved columns: email")
+
+
+def test_summarize_document():
+    """
+    Test that documents are summarized by key and list size changes, down their mappings.
+    """
+    old = {"version": 1, "items": [1, 2], "settings": {"a": 1, "b": 2}}
+    new = {"version": 2, "items": [1, 2, 3], "settings": {"a": 1, "c": 3}, "extra": True}
+
+    assert summarize_document(old, new) == [
+        "root: added keys extra",
+        "version: value changed",
+        "items: 2 -> 3 items (+1)",
+        "settings: added keys c",
+        "settings: removed keys b",
+    ]
+
+
+def test_summarize_yaml():
+    """
+    Test that YAML files are parsed like JSON ones.
+    """
+    summary = summarize_data_file("data.yaml", "items: [1, 2]\n", "items: [1]\n")
+
+    assert summary == "[data file changes]\nitems: 2 -> 1 items (-1)"
+
+
+def test_reduce_data_diffs_only_large_data_files():
+    """
+    Test that small data diffs are kept, large ones summarized and other files untouched.
+    """
+    small = file_diff("small.csv", 3)
+    large = file_diff("large.csv", MIN_DATA_DIFF_LINES)
+    code = file_diff("app.py", MIN_DATA_DIFF_LINES)
+    contents = {"large.csv": ("id\n1\n", "id\n" + "1\n" * MIN_DATA_DIFF_LINES)}
+
+    reduced = reduce_data_diffs(
+        "\n".join([small, large, code]),
+        read_old=lambda path: contents.get(path, (None, None))[0],
+        read_new=lambda path: contents.get(path, (None, None))[1])
+
+    assert small in reduced and code in reduced
+    assert f"diff --git a/large.csv b/large.csv\n[data file changes]\nrows: 1 -> {MIN_DATA_DIFF_LINES}" in reduced
@@ -0,0 +1,99 @@
+import io
+import pytest
+from unittest.mock import patch, Mock
+
+from gai_tool.src.git_blobs import CatFileBatch
+
+# --------------------------
+# Fixtures
+# --------------------------
+
+
+def mock_process(output):
+    """
+    Helper building a running cat-file process answering with output.
+    """
+    process = Mock()
+    process.stdin = io.BytesIO()
+    process.stdin.close = Mock()
+    process.stdout = io.BytesIO(output)
+    process.poll.return_value = None
+    return process
+
+
+@pytest.fixture
+def mock_popen():
+    """
+    Fixture to mock subprocess.Popen in the git_blobs module.
+    """
+    with patch('gai_tool.src.git_blobs.subprocess.Popen') as popen:
+        yield popen
+
+# --------------------------
+# Read Tests
+# --------------------------
+
+
+def test_read_streams_blobs_from_one_process(mock_popen):
+    """
+    Test that successive reads are answered by a single process, in order.
+    """
+    process = mock_process(b"1111 blob 7\nold.py\n\n2222 blob 3\nnew\n")
+    mock_popen.return_value = process
+    blobs = CatFileBatch()
+
+    assert blobs.read("HEAD:a.py") == b"old.py\n"
+    assert blobs.read(":a.py") == b"new"
+
+    mock_popen.assert_called_once()
+    assert mock_popen.call_args[0][0] == ["git", "cat-file", "--batch"]
+    assert process.stdin.getvalue() == b"HEAD:a.py\n:a.py\n"
+
+
+def test_read_missing_and_non_blob_objects(mock_popen):
+    """
+    Test that missing objects and trees are read as None, and the stream stays in sync.
+    """
+    mock_popen.return_value = mock_process(b"HEAD:gone.py missing\n3333 tree 4\ntree\n4444 blob 2\nok\n")
+    blobs = CatFileBatch()
+
+    assert blobs.read("HEAD:gone.py") is None
+    assert blobs.read("HEAD:src") is None
+    assert blobs.read("HEAD:a.py") == b"ok"
+
+
+def test_read_rejects_names_with_line_breaks(mock_popen):
+    """
+    Test that names breaking the line based protocol are not sent.
+    """
+    blobs = CatFileBatch()
+
+    assert blobs.read("HEAD:a\nb") is None
+    mock_popen.assert_not_called()
+
+
+def test_read_restarts_exited_process(mock_popen):
+    """
+    Test that a process which exited is replaced on the next read.
+    """
+    dead = mock_process(b"")
+    mock_popen.side_effect = [dead, mock_process(b"5555 blob 2\nok\n")]
+    blobs = CatFileBatch()
+
+    assert blobs.read("HEAD:a.py") is None
+    assert blobs.read("HEAD:a.py") == b"ok"
+    assert mock_popen.call_count == 2
+
+
+def test_close_stops_process(mock_popen):
+    """
+    Test that close ends the process by closing its input.
+    """
+    process = mock_process(b"1111 blob 2\nok\n")
+    mock_popen.return_value = process
+
+    with CatFileBatch() as blobs:
+        blobs.read("HEAD:a.py")
+
+    process.stdin.close.assert_called_once()
+    process.wait.assert_called_once()
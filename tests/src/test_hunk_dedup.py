@@ -0,0 +1,74 @@
+from gai_tool.src.hunk_dedup import MAX_LISTED_FILES, dedupe_hunks, hunk_key
+
+
+def file_diff(path, hunk):
+    """
+    Helper building the diff of one file with a single hunk.
+    """
+    return (f"diff --git a/{path} b/{path}\n"
+            f"index 1111111..2222222 100644\n"
+            f"--- a/{path}\n"
+            f"+++ b/{path}\n"
+            f"{hunk}")
+
+
+RENAME = "@@ -1,3 +1,3 @@\n import os\n-from app.old import client\n+from app.new import client\n import re"
+RENAME_ELSEWHERE = ("@@ -10,3 +10,3 @@\n import sys\n-from  app.old import client\n+from app.new import client\n"
+                    " import json")
+FIX = "@@ -5,2 +5,2 @@\n-    return None\n+    return {}"
+
+# --------------------------
+# hunk_key Tests
+# --------------------------
+
+
+def test_hunk_key_ignores_position_context_and_spacing():
+    """
+    Test that the same change at other lines, with other context, has the same key.
+    """
+    assert hunk_key(RENAME) == hunk_key(RENAME_ELSEWHERE)
+    assert hunk_key(RENAME) != hunk_key(FIX)
+
+# --------------------------
+# dedupe_hunks Tests
+# --------------------------
+
+
+def test_dedupe_hunks_collapses_repeats():
+    """
+    Test that a hunk repeated across files is kept once, with the list of the other files.
+    """
+    diff = "\n".join([
+        file_diff("a.py", RENAME),
+        file_diff("b.py", RENAME_ELSEWHERE),
+        file_diff("c.py", RENAME + "\n" + FIX),
+    ])
+
+    reduced = dedupe_hunks(diff)
+
+    assert reduced.count("+from app.new import client") == 1
+    assert "[same change applied in 2 other files: b.py, c.py]" in reduced
+    # b.py had nothing else, c.py keeps its own hunk
+    assert "b/b.py" not in reduced
+    assert "+++ b/c.py\n" + FIX in reduced
+
+
+def test_dedupe_hunks_without_repeats():
+    """
+    Test that diffs without repeated hunks are returned untouched.
+    """
+    diff = "\n".join([file_diff("a.py", RENAME), file_diff("b.py", FIX)])
+
+    assert dedupe_hunks(diff) == diff
+
+
+def test_dedupe_hunks_lists_a_bounded_number_of_files():
+    """
+    Test that only the first files are named for mass changes.
+    """
+    diff = "\n".join(file_diff(f"module_{index}.py", RENAME) for index in range(300))
+
+    reduced = dedupe_hunks(diff)
+
+    assert f"and {299 - MAX_LISTED_FILES} more]" in reduced
+    assert len(reduced) < 1000
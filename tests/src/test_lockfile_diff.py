@@ -0,0 +1,169 @@
+import json
+
+import pytest
+
+from gai_tool.src.lockfile_diff import (compare_versions, get_parser, parse_go_sum, parse_package_lock,
+                                        parse_poetry_lock, parse_requirements, parse_yarn_lock,
+                                        summarize_lockfile, summarize_lockfiles)
+
+POETRY_OLD = """
+[[package]]
+name = "requests"
+version = "2.32.3"
+
+[[package]]
+name = "idna"
+version = "3.7"
+"""
+
+POETRY_NEW = """
+[[package]]
+name = "requests"
+version = "2.32.4"
+
+[[package]]
+name = "urllib3"
+version = "2.2.2"
+"""
+
+# --------------------------
+# Parser Tests
+# --------------------------
+
+
+@pytest.mark.parametrize("path, parser", [
+    ("poetry.lock", parse_poetry_lock),
+    ("rust/Cargo.lock", parse_poetry_lock),
+    ("web/package-lock.json", parse_package_lock),
+    ("yarn.lock", parse_yarn_lock),
+    ("go.sum", parse_go_sum),
+    ("requirements-dev.txt", parse_requirements),
+    ("app.py", None),
+])
+def test_get_parser(path, parser):
+    """
+    Test that lockfiles are recognized by name, in any folder.
+    """
+    assert get_parser(path) is parser
+
+
+def test_parse_poetry_lock():
+    """
+    Test that [[package]] tables are read.
+    """
+    assert parse_poetry_lock(POETRY_OLD) == {"requests": {"2.32.3"}, "idna": {"3.7"}}
+
+
+def test_parse_package_lock_v3_and_v1():
+    """
+    Test that both the packages map and the legacy dependencies tree are read.
+    """
+    v3 = {"lockfileVersion": 3, "packages": {
+        "": {"name": "app", "version": "1.0.0"},
+        "node_modules/lodash": {"version": "4.17.21"},
+        "node_modules/a/node_modules/@babel/core": {"version": "7.24.0"},
+    }}
+    v1 = {"lockfileVersion": 1, "dependencies": {
+        "lodash": {"version": "4.17.20", "dependencies": {"left-pad": {"version": "1.3.0"}}},
+    }}
+
+    assert parse_package_lock(json.dumps(v3)) == {"lodash": {"4.17.21"}, "@babel/core": {"7.24.0"}}
+    assert parse_package_lock(json.dumps(v1)) == {"lodash": {"4.17.20"}, "left-pad": {"1.3.0"}}
+
+
+def test_parse_yarn_lock_classic_and_berry():
+    """
+    Test that yarn v1 and berry entries, scoped packages included, are read.
+    """
+    classic = '''# yarn lockfile v1
+
+"@babel/core@^7.0.0", "@babel/core@^7.1.0":
+  version "7.24.0"
+  resolved "https://registry.yarnpkg.com/@babel/core/-/core-7.24.0.tgz"
+
+lodash@^4.17.0:
+  version "4.17.21"
+'''
+    berry = '''"lodash@npm:^4.17.0":
+  version: 4.17.21
+  resolution: "lodash@npm:4.17.21"
+'''
+
+    assert parse_yarn_lock(classic) == {"@babel/core": {"7.24.0"}, "lodash": {"4.17.21"}}
+    assert parse_yarn_lock(berry) == {"lodash": {"4.17.21"}}
+
+
+def test_parse_go_sum():
+    """
+    Test that go.mod hash lines count as the same version.
+    """
+    text = ("golang.org/x/net v0.25.0 h1:abc=\n"
+            "golang.org/x/net v0.25.0/go.mod h1:def=\n")
+
+    assert parse_go_sum(text) == {"golang.org/x/net": {"v0.25.0"}}
+
+
+def test_parse_requirements():
+    """
+    Test that pins, ranges, extras and comments are handled.
+    """
+    text = "# pinned\nrequests==2.32.4\nDjango>=4.2,<5  # lts\nuvicorn[standard]\n-r base.txt\n"
+
+    assert parse_requirements(text) == {"requests": {"2.32.4"}, "django": {">=4.2,<5"}, "uvicorn": {"*"}}
+
+# --------------------------
+# Summary Tests
+# --------------------------
+
+
+def test_compare_versions():
+    """
+    Test that bumps, additions and removals are listed by name.
+    """
+    old = parse_poetry_lock(POETRY_OLD)
+    new = parse_poetry_lock(POETRY_NEW)
+
+    assert compare_versions(old, new) == [
+        "removed idna 3.7",
+        "bumped requests 2.32.3 -> 2.32.4",
+        "added urllib3 2.2.2",
+    ]
+
+
+def test_summarize_new_lockfile():
+    """
+    Test that a lockfile without previous version lists every package as added.
+    """
+    assert summarize_lockfile("poetry.lock", None, POETRY_OLD) == (
+        "[dependency changes]\nadded idna 3.7\nadded requests 2.32.3")
+
+
+def test_summarize_unparsable_lockfile():
+    """
+    Test that the raw diff is kept when the lockfile cannot be parsed.
+    """
+    assert summarize_lockfile("package-lock.json", "{", "{}") is None
+
+
+def test_summarize_lockfiles_in_diff():
+    """
+    Test that lockfile hunks are replaced and other files left untouched.
+    """
+    app_diff = ("diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n"
+                "@@ -1 +1 @@\n-import requests\n+import httpx")
+    lock_diff = ("diff --git a/poetry.lock b/poetry.lock\nindex 1111111..2222222 100644\n"
+                 "--- a/poetry.lock\n+++ b/poetry.lock\n"
+                 "@@ -1,3 +1,3 @@\n-version = \"2.32.3\"\n+version = \"2.32.4\"")
+    contents = {"old": {"poetry.lock": POETRY_OLD}, "new": {"poetry.lock": POETRY_NEW}}
+
+    reduced = summarize_lockfiles(
+        f"{app_diff}\n{lock_diff}",
+        read_old=lambda path: contents["old"].get(path),
+        read_new=lambda path: contents["new"].get(path))
+
+    assert reduced == (f"{app_diff}\n"
+                       "diff --git a/poetry.lock b/poetry.lock\n"
+                       "[dependency changes]\n"
+                       "removed idna 3.7\n"
+                       "bumped requests 2.32.3 -> 2.32.4\n"
+                       "added urllib3 2.2.2")
@@ -0,0 +1,134 @@
+from gai_tool.src.python_ast_diff import summarize_python_change, summarize_python_diffs
+
+OLD_MODULE = '''
+import os
+
+
+def parse(line):
+    return line.split(",")
+
+
+def load(path):
+    with open(path) as f:
+        return [parse(line) for line in f]
+
+
+class Reader:
+    def read(self, path):
+        return load(path)
+'''
+
+NEW_MODULE = '''
+import os
+from pathlib import Path
+
+
+def parse_row(line):
+    return line.split(",")
+
+
+def load(path, encoding="utf-8"):
+    with open(path, encoding=encoding) as f:
+        return [parse_row(line) for line in f]
+
+
+class Reader:
+    def read(self, path):
+        return load(Path(path))
+
+    def close(self):
+        pass
+'''
+
+
+def file_diff(path, changed):
+    """
+    Helper building the diff of one file with the given number of changed lines.
+    """
+    lines = "\n".join(f"+line {index}" for index in range(changed))
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1 +1,{changed} @@\n{lines}"
+
+
+def count_words(text):
+    """
+    Helper counting tokens as words.
+    """
+    return len(text.split())
+
+# --------------------------
+# Structural Change Tests
+# --------------------------
+
+
+def test_summarize_python_change():
+    """
+    Test that renames, signature changes, modified bodies, additions and imports are listed.
+    """
+    summary = summarize_python_change(OLD_MODULE, NEW_MODULE)
+
+    assert summary.splitlines() == [
+        "[structural changes]",
+        "renamed function parse -> parse_row",
+        "added method Reader.close(self)",
+        "changed signature of function load: (path) -> (path, encoding='utf-8')",
+        "modified method Reader.read",
+        "added imports: pathlib.Path",
+    ]
+
+
+def test_summarize_python_change_new_and_deleted_files():
+    """
+    Test that every definition of a new module is added, and of a deleted one removed.
+    """
+    assert "added class Reader" in summarize_python_change(None, NEW_MODULE)
+    assert "removed function load" in summarize_python_change(OLD_MODULE, None)
+
+
+def test_summarize_python_change_unparsable():
+    """
+    Test that a module with a syntax error is not summarized.
+    """
+    assert summarize_python_change(OLD_MODULE, "def broken(:\n") is None
+
+
+def test_summarize_python_change_module_code_only():
+    """
+    Test that changes outside definitions are still reported.
+    """
+    assert summarize_python_change("DEBUG = False\n", "DEBUG = True\n") == \
+        "[structural changes]\nmodule-level code changed"
+
+# --------------------------
+# Budget Tests
+# --------------------------
+
+
+def test_summarize_python_diffs_within_budget():
+    """
+    Test that a diff fitting the budget is kept as it is.
+    """
+    diff = file_diff("app.py", 10)
+
+    assert summarize_python_diffs(diff, lambda path: OLD_MODULE, lambda path: NEW_MODULE,
+                                  token_budget=1000, count_tokens=count_words) == diff
+
+
+def test_summarize_python_diffs_largest_python_files_first():
+    """
+    Test that only the largest Python files are summarized, until the diff fits the budget.
+    """
+    diff = "\n".join([file_diff("small.py", 20), file_diff("large.py", 400), file_diff("notes.md", 300)])
+    read = []
+
+    def read_old(path):
+        read.append(path)
+        return OLD_MODULE
+
+    result = summarize_python_diffs(diff, read_old, lambda path: NEW_MODULE,
+                                    token_budget=700, count_tokens=count_words)
+
+    assert read == ["large.py"]
+    assert "diff --git a/large.py b/large.py\n[structural changes]" in result
+    assert "+line 399" not in result
+    assert "+line 19\ndiff --git a/large.py" in result
+    assert "+line 299" in result
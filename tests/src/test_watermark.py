@@ -0,0 +1,63 @@
+from gai_tool.src.watermark import FOLLOW_UP_HEADING, add_watermark, merge_delta, read_watermark, strip_watermark
+
+HEAD = "0123456789abcdef0123456789abcdef01234567"
+NEXT = "89abcdef0123456789abcdef0123456789abcdef"
+
+# --------------------------
+# Watermark Tests
+# --------------------------
+
+
+def test_add_and_read_watermark():
+    """
+    Test that the head SHA is read back from a watermarked description.
+    """
+    description = add_watermark("- Fix the parser", HEAD)
+
+    assert description == f"- Fix the parser\n\n<!-- gai:head={HEAD} -->"
+    assert read_watermark(description) == HEAD
+
+
+def test_read_watermark_without_marker():
+    """
+    Test that descriptions without marker, or without description at all, have no head.
+    """
+    assert read_watermark("- Fix the parser") is None
+    assert read_watermark(None) is None
+
+
+def test_add_watermark_replaces_previous_one():
+    """
+    Test that a description only ever holds one marker.
+    """
+    description = add_watermark(add_watermark("- Fix the parser", HEAD), NEXT)
+
+    assert read_watermark(description) == NEXT
+    assert HEAD not in description
+    assert strip_watermark(description) == "- Fix the parser"
+
+# --------------------------
+# merge_delta Tests
+# --------------------------
+
+
+def test_merge_delta_appends_follow_up_section():
+    """
+    Test that the delta is appended under a follow-up heading, keeping the existing text.
+    """
+    description = merge_delta(add_watermark("- Fix the parser", HEAD), "- Add tests\n", NEXT)
+
+    assert description == (
+        f"- Fix the parser\n\n{FOLLOW_UP_HEADING}\n\n- Add tests\n\n<!-- gai:head={NEXT} -->")
+
+
+def test_merge_delta_reuses_follow_up_section():
+    """
+    Test that later deltas go in the same follow-up section.
+    """
+    description = merge_delta(add_watermark("- Fix the parser", HEAD), "- Add tests", NEXT)
+    description = merge_delta(description, "- Update docs", HEAD)
+
+    assert description.count(FOLLOW_UP_HEADING) == 1
+    assert strip_watermark(description).endswith("- Add tests\n\n- Update docs")
+    assert read_watermark(description) == HEAD